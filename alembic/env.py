@@ -27,6 +27,17 @@ from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (
 # noinspection PyUnresolvedReferences
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorCliente
 
+# noinspection PyUnresolvedReferences
+from contas_a_pagar_e_receber.models.quantidade_contas_por_mes_model import (
+    QuantidadeContasPorMes,
+)
+
+# noinspection PyUnresolvedReferences
+from contas_a_pagar_e_receber.models.resumo_mensal_model import ResumoMensal
+
+# noinspection PyUnresolvedReferences
+from contas_a_pagar_e_receber.models.resumo_diario_model import ResumoDiario
+
 from shared.database import Base
 
 target_metadata = Base.metadata
@@ -0,0 +1,40 @@
+"""Cria índices trigram da busca
+
+Revision ID: 3f1c7e9a2b64
+Revises: e598d19b65a1
+Create Date: 2026-10-18 20:55:12.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c7e9a2b64'
+down_revision: Union[str, None] = 'e598d19b65a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm só existe no Postgres; nos outros bancos a busca usa LIKE sem índice
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY não trava as escritas enquanto o índice é construído, mas
+    # não pode rodar dentro da transação da migração
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contas_a_pagar_e_receber_descricao_trgm', 'contas_a_pagar_e_receber', ['descricao'], unique=False, postgresql_using='gin', postgresql_ops={'descricao': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_fornecedor_cliente_nome_trgm', 'fornecedor_cliente', ['nome'], unique=False, postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_fornecedor_cliente_nome_trgm', table_name='fornecedor_cliente', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_contas_a_pagar_e_receber_descricao_trgm', table_name='contas_a_pagar_e_receber', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,169 @@
+"""Suíte de benchmarks das rotas de contas e fornecedores.
+
+Carrega um conjunto sintético e mede latência (p50/p90/p95/p99) e vazão de
+cada rota em três cenários:
+
+- ``unitario``: uma requisição por vez;
+- ``concorrente``: várias requisições em voo com httpx assíncrono;
+- ``grande``: só as rotas de leitura, sobre um conjunto bem maior.
+
+Por padrão a aplicação roda no mesmo processo (ASGITransport). Com
+``--base-url`` as requisições vão para um servidor já em execução, que deve
+usar o mesmo banco de ``--url``. O resultado vai para JSON e pode ser
+comparado entre commits com ``python -m benchmarks.compara``:
+
+    python -m benchmarks --url sqlite:///./benchmark.db --saida atual.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from benchmarks.cenarios import ROTAS, Contexto  # noqa: E402
+from benchmarks.dados import carrega_dados  # noqa: E402
+from benchmarks.executor import mede_rota  # noqa: E402
+from shared.cache import cache  # noqa: E402
+
+CENARIOS = ("unitario", "concorrente", "grande")
+
+
+def commit_atual() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cria_client(engine, base_url: str | None) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+
+    from main import app
+    from shared.dependencies import get_db
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60
+    )
+
+
+async def executa_cenario(client, rotas, contexto, args, concorrencia: int) -> dict:
+    resultados = {}
+    for rota in rotas:
+        resultados[rota.nome] = await mede_rota(
+            client,
+            rota,
+            contexto,
+            args.requisicoes,
+            concorrencia=concorrencia,
+            aquecimento=args.aquecimento,
+        )
+        print(f"  {rota.nome:<28} {resultados[rota.nome]}")
+    return resultados
+
+
+async def executa(args) -> dict:
+    engine = create_engine(args.url)
+    rotas = [rota for rota in ROTAS if not args.rotas or rota.nome in args.rotas]
+    resultados = {}
+
+    async with cria_client(engine, args.base_url) as client:
+        if {"unitario", "concorrente"} & set(args.cenarios):
+            carrega_dados(engine, args.fornecedores, args.contas, args.semente)
+            cache.limpa()
+            contexto = Contexto(args.fornecedores, args.contas)
+
+            if "unitario" in args.cenarios:
+                print("unitario")
+                resultados["unitario"] = await executa_cenario(
+                    client, rotas, contexto, args, concorrencia=1
+                )
+            if "concorrente" in args.cenarios:
+                print("concorrente")
+                resultados["concorrente"] = await executa_cenario(
+                    client, rotas, contexto, args, concorrencia=args.concorrencia
+                )
+
+        if "grande" in args.cenarios:
+            carrega_dados(engine, args.fornecedores, args.contas_grande, args.semente)
+            cache.limpa()
+            contexto = Contexto(args.fornecedores, args.contas_grande)
+
+            print("grande")
+            resultados["grande"] = await executa_cenario(
+                client, [rota for rota in rotas if rota.leitura], contexto, args, 1
+            )
+
+    engine.dispose()
+
+    return {
+        "metadados": {
+            "commit": commit_atual(),
+            "data": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            # Só o dialeto, para não gravar usuário e senha no resultado
+            "banco": make_url(args.url).get_backend_name(),
+            "servidor": "externo" if args.base_url else "mesmo processo",
+            "fornecedores": args.fornecedores,
+            "contas": args.contas,
+            "contas_grande": args.contas_grande,
+            "requisicoes": args.requisicoes,
+            "concorrencia": args.concorrencia,
+        },
+        "cenarios": resultados,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das rotas da API")
+    parser.add_argument("--url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--base-url", help="servidor já em execução, ex.: http://localhost:8000")
+    parser.add_argument("--fornecedores", type=int, default=100)
+    parser.add_argument("--contas", type=int, default=10000)
+    parser.add_argument("--contas-grande", type=int, default=200000)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    parser.add_argument("--aquecimento", type=int, default=10)
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument(
+        "--cenarios", type=lambda valor: valor.split(","), default=list(CENARIOS)
+    )
+    parser.add_argument(
+        "--rotas", type=lambda valor: valor.split(","), help="ex.: contas.listar,contas.obter"
+    )
+    parser.add_argument("--saida", default="benchmark.json")
+    args = parser.parse_args()
+
+    resultado = asyncio.run(executa(args))
+
+    with open(args.saida, "w") as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"resultado gravado em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Rotas medidas pelos benchmarks.
+
+Cada rota recebe o índice da iteração e monta a requisição. Quando a rota
+precisa de um registro próprio (PUT, DELETE, baixa), ``prepara`` cria esse
+registro antes da medição, fora do tempo contado.
+"""
+from dataclasses import dataclass
+from datetime import date
+from itertools import count
+from typing import Awaitable, Callable
+
+from benchmarks.dados import ANO_DOS_DADOS
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import (
+    QUANTIDADE_PERMITIDA_POR_MES,
+)
+
+CONTAS = "/contas-a-pagar-e-receber"
+FORNECEDORES = "/fornecedor-cliente"
+TAMANHO_LOTE = 10
+
+
+class Contexto:
+    """Tamanho do conjunto carregado e datas livres para novas contas."""
+
+    def __init__(self, fornecedores: int, contas: int):
+        self.fornecedores = fornecedores
+        self.contas = contas
+        self._vagas = count()
+
+    def fornecedor_id(self, i: int) -> int | None:
+        return 1 + i % self.fornecedores if self.fornecedores else None
+
+    def conta_id(self, i: int) -> int:
+        return 1 + i % self.contas
+
+    def data_livre(self) -> str:
+        # Meses bem depois dos dados carregados, sem estourar o limite mensal
+        vaga = next(self._vagas) // QUANTIDADE_PERMITIDA_POR_MES
+        return date(2100 + vaga // 12, vaga % 12 + 1, 1).isoformat()
+
+    def nova_conta(self, i: int) -> dict:
+        return {
+            "descricao": f"Benchmark {i}",
+            "valor": 123.45,
+            "tipo": "PAGAR",
+            "fornecedor_cliente_id": self.fornecedor_id(i),
+            "data_previsao": self.data_livre(),
+        }
+
+
+@dataclass
+class Requisicao:
+    metodo: str
+    caminho: str
+    json: dict | list | None = None
+
+
+@dataclass
+class Rota:
+    nome: str
+    monta: Callable[[Contexto, int, object], Requisicao]
+    prepara: Callable[[object, Contexto, int], Awaitable[object]] | None = None
+    leitura: bool = True
+
+
+async def cria_conta(client, contexto: Contexto, i: int) -> dict:
+    response = await client.post(CONTAS, json=contexto.nova_conta(i))
+    response.raise_for_status()
+    return response.json()
+
+
+async def cria_contas(client, contexto: Contexto, i: int) -> list:
+    return [
+        (await cria_conta(client, contexto, i * TAMANHO_LOTE + j))["id"]
+        for j in range(TAMANHO_LOTE)
+    ]
+
+
+async def cria_fornecedor(client, contexto: Contexto, i: int) -> dict:
+    response = await client.post(FORNECEDORES, json={"nome": f"Benchmark {i}"})
+    response.raise_for_status()
+    return response.json()
+
+
+def atualizacao_de_conta(contexto: Contexto, i: int, conta: dict) -> Requisicao:
+    return Requisicao(
+        "PUT",
+        f"{CONTAS}/{conta['id']}",
+        {
+            "descricao": f"Atualizada {i}",
+            "valor": 200.00,
+            "tipo": conta["tipo"],
+            "fornecedor_cliente_id": contexto.fornecedor_id(i),
+            "data_previsao": conta["data_previsao"],
+        },
+    )
+
+
+ROTAS = [
+    # contas_a_pagar_e_receber_router
+    Rota("contas.listar", lambda c, i, _: Requisicao("GET", f"{CONTAS}?limit=100")),
+    Rota(
+        "contas.listar_filtrado",
+        lambda c, i, _: Requisicao("GET", f"{CONTAS}?tipo=PAGAR&esta_baixada=false&limit=100"),
+    ),
+    Rota(
+        "contas.exportar",
+        lambda c, i, _: Requisicao(
+            "GET", f"{CONTAS}/export?data_previsao_inicio={ANO_DOS_DADOS}-01-01"
+            f"&data_previsao_fim={ANO_DOS_DADOS}-01-31"
+        ),
+    ),
+    Rota(
+        "contas.previsao_por_mes",
+        lambda c, i, _: Requisicao(
+            "GET", f"{CONTAS}/previsao-gastos-por-mes?ano={ANO_DOS_DADOS}"
+        ),
+    ),
+    Rota(
+        "contas.fluxo_de_caixa",
+        # Janela de 5 anos, dia a dia, em torno do ano dos dados
+        lambda c, i, _: Requisicao(
+            "GET", f"{CONTAS}/fluxo-de-caixa?data_inicio={ANO_DOS_DADOS - 2}-01-01"
+            f"&data_fim={ANO_DOS_DADOS + 2}-12-31&saldo_inicial=1000"
+        ),
+    ),
+    Rota("contas.obter", lambda c, i, _: Requisicao("GET", f"{CONTAS}/{c.conta_id(i)}")),
+    Rota(
+        "contas.buscar",
+        lambda c, i, _: Requisicao("GET", f"{CONTAS}/busca?q=Conta+{c.conta_id(i)}&limit=100"),
+    ),
+    Rota(
+        "contas.criar",
+        lambda c, i, _: Requisicao("POST", CONTAS, c.nova_conta(i)),
+        leitura=False,
+    ),
+    Rota(
+        "contas.criar_lote",
+        lambda c, i, _: Requisicao(
+            "POST", f"{CONTAS}/lote", [c.nova_conta(i) for _ in range(TAMANHO_LOTE)]
+        ),
+        leitura=False,
+    ),
+    Rota(
+        "contas.baixar_lote",
+        lambda c, i, ids: Requisicao("POST", f"{CONTAS}/baixar-lote", {"ids": ids}),
+        prepara=cria_contas,
+        leitura=False,
+    ),
+    Rota("contas.atualizar", atualizacao_de_conta, prepara=cria_conta, leitura=False),
+    Rota(
+        "contas.baixar",
+        lambda c, i, conta: Requisicao("POST", f"{CONTAS}/{conta['id']}/baixar"),
+        prepara=cria_conta,
+        leitura=False,
+    ),
+    Rota(
+        "contas.remover",
+        lambda c, i, conta: Requisicao("DELETE", f"{CONTAS}/{conta['id']}"),
+        prepara=cria_conta,
+        leitura=False,
+    ),
+    # fornecedor_cliente_router
+    Rota("fornecedores.listar", lambda c, i, _: Requisicao("GET", FORNECEDORES)),
+    Rota(
+        "fornecedores.resumo",
+        lambda c, i, _: Requisicao(
+            "GET", f"{FORNECEDORES}/resumo?ordenar_por=valor_a_pagar_em_aberto&limit=50"
+        ),
+    ),
+    Rota(
+        "fornecedores.obter",
+        lambda c, i, _: Requisicao("GET", f"{FORNECEDORES}/{c.fornecedor_id(i)}"),
+    ),
+    Rota(
+        "fornecedores.criar",
+        lambda c, i, _: Requisicao("POST", FORNECEDORES, {"nome": f"Benchmark {i}"}),
+        leitura=False,
+    ),
+    Rota(
+        "fornecedores.atualizar",
+        lambda c, i, fornecedor: Requisicao(
+            "PUT", f"{FORNECEDORES}/{fornecedor['id']}", {"nome": f"Atualizado {i}"}
+        ),
+        prepara=cria_fornecedor,
+        leitura=False,
+    ),
+    Rota(
+        "fornecedores.remover",
+        lambda c, i, fornecedor: Requisicao("DELETE", f"{FORNECEDORES}/{fornecedor['id']}"),
+        prepara=cria_fornecedor,
+        leitura=False,
+    ),
+    # fornecedor_cliente_vs_contas_router
+    Rota(
+        "fornecedores.contas",
+        lambda c, i, _: Requisicao(
+            "GET", f"{FORNECEDORES}/{c.fornecedor_id(i)}/contas-a-pagar-e-receber"
+        ),
+    ),
+]
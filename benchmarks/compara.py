@@ -0,0 +1,81 @@
+"""Compara dois resultados de ``python -m benchmarks`` e aponta regressões.
+
+Cada limite é a piora relativa tolerada numa métrica. Para latências, piorar
+é subir; para vazão, é cair. Sai com código 1 se alguma rota passar do limite:
+
+    python -m benchmarks.compara base.json atual.json --limite p95_ms=0.2
+"""
+import argparse
+import json
+import sys
+
+LIMITES_PADRAO = {"p95_ms": 0.20, "vazao_rps": 0.20}
+METRICAS_MAIOR_E_MELHOR = {"vazao_rps"}
+
+
+def le_limite(valor: str) -> tuple:
+    metrica, _, limite = valor.partition("=")
+    return metrica, float(limite)
+
+
+def variacao(base: float, atual: float) -> float:
+    return (atual - base) / base if base else 0.0
+
+
+def encontra_regressoes(base: dict, atual: dict, limites: dict) -> list:
+    regressoes = []
+
+    for cenario, rotas in atual["cenarios"].items():
+        for rota, metricas in rotas.items():
+            metricas_base = base["cenarios"].get(cenario, {}).get(rota)
+            if metricas_base is None:
+                continue
+
+            if metricas["erros"] > metricas_base["erros"]:
+                regressoes.append(
+                    (cenario, rota, "erros", metricas_base["erros"], metricas["erros"], None)
+                )
+
+            for metrica, limite in limites.items():
+                delta = variacao(metricas_base[metrica], metricas[metrica])
+                piora = -delta if metrica in METRICAS_MAIOR_E_MELHOR else delta
+                if piora > limite:
+                    regressoes.append(
+                        (cenario, rota, metrica, metricas_base[metrica], metricas[metrica], delta)
+                    )
+
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark")
+    parser.add_argument("base")
+    parser.add_argument("atual")
+    parser.add_argument(
+        "--limite",
+        type=le_limite,
+        action="append",
+        help="METRICA=FRACAO, ex.: p99_ms=0.3 (padrão: p95_ms=0.2 e vazao_rps=0.2)",
+    )
+    args = parser.parse_args()
+
+    with open(args.base) as arquivo:
+        base = json.load(arquivo)
+    with open(args.atual) as arquivo:
+        atual = json.load(arquivo)
+
+    limites = dict(args.limite) if args.limite else LIMITES_PADRAO
+    regressoes = encontra_regressoes(base, atual, limites)
+
+    print(f"base: {base['metadados']['commit']}  atual: {atual['metadados']['commit']}")
+    for cenario, rota, metrica, antes, depois, delta in regressoes:
+        percentual = f" ({delta:+.0%})" if delta is not None else ""
+        print(f"REGRESSÃO {cenario}/{rota} {metrica}: {antes} -> {depois}{percentual}")
+
+    if regressoes:
+        sys.exit(1)
+    print("sem regressões")
+
+
+if __name__ == "__main__":
+    main()
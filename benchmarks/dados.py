@@ -0,0 +1,112 @@
+"""Gerador de dados sintéticos para os benchmarks.
+
+Carrega N fornecedores e M contas com inserts em lote (executemany) e depois
+reconstrói resumo_mensal e os contadores do mês, como a aplicação esperaria.
+Funciona com SQLite ou com um Postgres local:
+
+    python -m benchmarks.dados --url postgresql://localhost/contas --contas 100000
+"""
+import argparse
+import os
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (  # noqa: E402
+    ContaPagarReceber,
+)
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import (  # noqa: E402
+    FornecedorCliente,
+)
+from contas_a_pagar_e_receber.resumo_mensal import (  # noqa: E402
+    reconstroi_resumo_mensal,
+)
+from shared.database import Base  # noqa: E402
+
+ANO_DOS_DADOS = 2024
+TAMANHO_LOTE_CARGA = 10000
+
+
+def gera_contas(quantidade: int, quantidade_fornecedores: int, semente: int = 42):
+    aleatorio = random.Random(semente)
+    inicio = date(ANO_DOS_DADOS, 1, 1)
+
+    for i in range(quantidade):
+        valor = Decimal(aleatorio.randint(100, 100000)) / 100
+        esta_baixada = aleatorio.random() < 0.3
+        fornecedor_cliente_id = None
+        if quantidade_fornecedores and aleatorio.random() < 0.8:
+            fornecedor_cliente_id = aleatorio.randint(1, quantidade_fornecedores)
+
+        yield {
+            "descricao": f"Conta {i}",
+            "valor": valor,
+            "tipo": aleatorio.choice(["PAGAR", "RECEBER"]),
+            "data_previsao": inicio + timedelta(days=aleatorio.randint(0, 364)),
+            "data_baixa": inicio if esta_baixada else None,
+            "valor_baixa": valor if esta_baixada else None,
+            "esta_baixada": esta_baixada,
+            "fornecedor_cliente_id": fornecedor_cliente_id,
+        }
+
+
+def em_lotes(itens, tamanho: int):
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) == tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def carrega_dados(
+    engine, quantidade_fornecedores: int, quantidade_contas: int, semente: int = 42
+) -> None:
+    """Recria as tabelas e carrega o conjunto sintético.
+
+    Os ids começam em 1 nas duas tabelas, então os cenários podem escolher
+    registros existentes só pelo tamanho do conjunto.
+    """
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conexao:
+        for lote in em_lotes(
+            ({"nome": f"Fornecedor {i}"} for i in range(quantidade_fornecedores)),
+            TAMANHO_LOTE_CARGA,
+        ):
+            conexao.execute(insert(FornecedorCliente), lote)
+
+        for lote in em_lotes(
+            gera_contas(quantidade_contas, quantidade_fornecedores, semente),
+            TAMANHO_LOTE_CARGA,
+        ):
+            conexao.execute(insert(ContaPagarReceber), lote)
+
+    with Session(engine) as db:
+        reconstroi_resumo_mensal(db)
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carrega dados sintéticos no banco")
+    parser.add_argument("--url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--fornecedores", type=int, default=100)
+    parser.add_argument("--contas", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    carrega_dados(engine, args.fornecedores, args.contas, args.semente)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
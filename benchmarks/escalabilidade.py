@@ -0,0 +1,137 @@
+"""Mede a vazão do servidor com 1, 2, 4, ... workers do gunicorn.
+
+Para cada quantidade de workers sobe ``gunicorn main:app -c gunicorn.conf.py``
+numa porta local, gera carga com vários processos clientes (httpx
+assíncrono) durante alguns segundos e compara a vazão com a de um worker:
+
+    python -m benchmarks.escalabilidade --url sqlite:///./benchmark.db
+
+Os clientes rodam na mesma máquina e disputam os núcleos com os workers, por
+isso por padrão os workers vão só até metade dos núcleos e a outra metade
+fica com os processos clientes (--clientes).
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from benchmarks.dados import carrega_dados  # noqa: E402
+
+CAMINHO = "/contas-a-pagar-e-receber/{id}"
+
+
+def porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def aguarda_servidor(base_url: str, prazo: float = 30) -> None:
+    limite = time.monotonic() + prazo
+    while time.monotonic() < limite:
+        try:
+            httpx.get(base_url + "/", timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"servidor não respondeu em {base_url}")
+
+
+async def gera_carga(base_url: str, duracao: float, conexoes: int, contas: int) -> int:
+    concluidas = 0
+    fim = time.monotonic() + duracao
+
+    async def cliente(indice: int):
+        nonlocal concluidas
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            i = indice
+            while time.monotonic() < fim:
+                response = await client.get(CAMINHO.format(id=1 + i % contas))
+                if response.status_code == 200:
+                    concluidas += 1
+                i += conexoes
+
+    await asyncio.gather(*(cliente(indice) for indice in range(conexoes)))
+    return concluidas
+
+
+def processo_cliente(argumentos) -> int:
+    return asyncio.run(gera_carga(*argumentos))
+
+
+def mede_vazao(args, workers: int) -> float:
+    porta = porta_livre()
+    base_url = f"http://127.0.0.1:{porta}"
+    ambiente = {
+        **os.environ,
+        "SQLALCHEMY_DATABASE_URL": args.url,
+        "PORT": str(porta),
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_MAX_REQUESTS": "0",
+    }
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn.conf.py"],
+        env=ambiente,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        aguarda_servidor(base_url)
+        # Aquece cada worker antes de medir
+        processo_cliente((base_url, 1, args.conexoes, args.contas))
+
+        with multiprocessing.Pool(args.clientes) as pool:
+            concluidas = sum(
+                pool.map(
+                    processo_cliente,
+                    [(base_url, args.duracao, args.conexoes, args.contas)] * args.clientes,
+                )
+            )
+        return concluidas / args.duracao
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+
+def main():
+    nucleos = multiprocessing.cpu_count()
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--contas", type=int, default=10000)
+    parser.add_argument("--workers", type=lambda valor: [int(w) for w in valor.split(",")])
+    parser.add_argument("--clientes", type=int, default=max(1, nucleos // 2))
+    parser.add_argument("--conexoes", type=int, default=32, help="por processo cliente")
+    parser.add_argument("--duracao", type=float, default=10)
+    args = parser.parse_args()
+
+    if args.workers is None:
+        args.workers = [1]
+        while args.workers[-1] * 2 <= max(1, nucleos // 2):
+            args.workers.append(args.workers[-1] * 2)
+
+    engine = create_engine(args.url)
+    carrega_dados(engine, 100, args.contas)
+    engine.dispose()
+
+    base = None
+    for workers in args.workers:
+        vazao = mede_vazao(args, workers)
+        base = base or vazao
+        print(
+            f"{workers:>3} workers: {vazao:8.1f} req/s  "
+            f"{vazao / base:5.2f}x  (eficiência {vazao / base / workers:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
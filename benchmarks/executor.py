@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+from benchmarks.cenarios import Contexto, Rota
+
+PERCENTIS = (50, 90, 95, 99)
+
+
+def percentil(valores_ordenados, p: float) -> float:
+    # Interpolação linear entre os dois vizinhos, como o numpy faz por padrão
+    if not valores_ordenados:
+        return 0.0
+
+    posicao = (len(valores_ordenados) - 1) * p / 100
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(valores_ordenados) - 1)
+    fracao = posicao - abaixo
+    return valores_ordenados[abaixo] * (1 - fracao) + valores_ordenados[acima] * fracao
+
+
+def resume_latencias(latencias, erros: int, duracao: float) -> dict:
+    ordenadas = sorted(latencias)
+    resumo = {"requisicoes": len(latencias), "erros": erros}
+
+    for p in PERCENTIS:
+        resumo[f"p{p}_ms"] = round(percentil(ordenadas, p) * 1000, 3)
+    resumo["media_ms"] = round(sum(ordenadas) / len(ordenadas) * 1000, 3) if ordenadas else 0.0
+    resumo["vazao_rps"] = round(len(latencias) / duracao, 2) if duracao else 0.0
+
+    return resumo
+
+
+async def mede_rota(
+    client,
+    rota: Rota,
+    contexto: Contexto,
+    requisicoes: int,
+    concorrencia: int = 1,
+    aquecimento: int = 0,
+) -> dict:
+    """Mede uma rota com ``concorrencia`` requisições em voo ao mesmo tempo.
+
+    Os registros de ``rota.prepara`` são criados todos antes da medição, para
+    que só a requisição medida entre no tempo.
+    """
+    total = aquecimento + requisicoes
+    preparados = [
+        await rota.prepara(client, contexto, i) if rota.prepara else None
+        for i in range(total)
+    ]
+    montadas = [rota.monta(contexto, i, preparados[i]) for i in range(total)]
+
+    for requisicao in montadas[:aquecimento]:
+        await client.request(requisicao.metodo, requisicao.caminho, json=requisicao.json)
+
+    latencias = []
+    erros = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def executa(requisicao):
+        nonlocal erros
+        async with semaforo:
+            inicio = time.perf_counter()
+            response = await client.request(
+                requisicao.metodo, requisicao.caminho, json=requisicao.json
+            )
+            await response.aread()
+            latencias.append(time.perf_counter() - inicio)
+            if response.status_code >= 400:
+                erros += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(executa(requisicao) for requisicao in montadas[aquecimento:]))
+    duracao = time.perf_counter() - inicio
+
+    return resume_latencias(latencias, erros, duracao)
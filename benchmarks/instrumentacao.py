@@ -0,0 +1,141 @@
+"""Mede o custo do MiddlewareDeMetricas e dos eventos de query.
+
+As duas partes são medidas isoladas, porque a diferença some no ruído de uma
+requisição completa:
+
+- o middleware em volta de uma aplicação ASGI que só responde 200;
+- ``SELECT 1`` no SQLite com e sem os eventos before/after_cursor_execute.
+
+Para referência, mostra também o tempo de GET /contas-a-pagar-e-receber/{id}
+sem instrumentação:
+
+    python -m benchmarks.instrumentacao --repeticoes 20000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine, event, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from benchmarks.dados import carrega_dados  # noqa: E402
+from contas_a_pagar_e_receber.routers import contas_a_pagar_e_receber_router  # noqa: E402
+from shared.dependencies import get_db  # noqa: E402
+from shared.metricas_requisicoes import (  # noqa: E402
+    ConsumoDaRequisicao,
+    MetricasRequisicoes,
+    MiddlewareDeMetricas,
+    antes_da_query,
+    depois_da_query,
+    requisicao_atual,
+)
+
+ESCOPO = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+
+async def aplicacao_vazia(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def envia(_):
+    pass
+
+
+async def recebe():
+    return {"type": "http.request", "body": b""}
+
+
+async def mede_aplicacao(aplicacao, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        await aplicacao(dict(ESCOPO), recebe, envia)
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def mede_queries(engine, repeticoes: int) -> float:
+    with engine.connect() as conexao:
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            conexao.execute(text("SELECT 1"))
+        return (time.perf_counter() - inicio) / repeticoes
+
+
+async def mede_requisicao(engine, repeticoes: int) -> float:
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    app = FastAPI()
+    app.include_router(contas_a_pagar_e_receber_router.router)
+
+    def override_get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            await client.get("/contas-a-pagar-e-receber/1")
+        return (time.perf_counter() - inicio) / repeticoes
+
+
+def melhor_de(rodadas: int, medicao) -> float:
+    return min(medicao() for _ in range(rodadas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=20000)
+    parser.add_argument("--rodadas", type=int, default=5)
+    args = parser.parse_args()
+
+    instrumentada = MiddlewareDeMetricas(aplicacao_vazia, MetricasRequisicoes())
+    sem_middleware = melhor_de(
+        args.rodadas, lambda: asyncio.run(mede_aplicacao(aplicacao_vazia, args.repeticoes))
+    )
+    com_middleware = melhor_de(
+        args.rodadas, lambda: asyncio.run(mede_aplicacao(instrumentada, args.repeticoes))
+    )
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{diretorio}/benchmark.db")
+        carrega_dados(engine, 10, 1000)
+
+        sem_eventos = melhor_de(args.rodadas, lambda: mede_queries(engine, args.repeticoes))
+
+        event.listen(engine, "before_cursor_execute", antes_da_query)
+        event.listen(engine, "after_cursor_execute", depois_da_query)
+        token = requisicao_atual.set(ConsumoDaRequisicao())
+        com_eventos = melhor_de(args.rodadas, lambda: mede_queries(engine, args.repeticoes))
+        requisicao_atual.reset(token)
+        event.remove(engine, "before_cursor_execute", antes_da_query)
+        event.remove(engine, "after_cursor_execute", depois_da_query)
+
+        requisicao = melhor_de(
+            args.rodadas, lambda: asyncio.run(mede_requisicao(engine, args.repeticoes // 20))
+        )
+        engine.dispose()
+
+    custo_middleware = com_middleware - sem_middleware
+    custo_query = com_eventos - sem_eventos
+    print(f"middleware: {custo_middleware * 1e6:+.2f} µs por requisição")
+    print(f"eventos de query: {custo_query * 1e6:+.2f} µs por query")
+    print(
+        f"GET /contas-a-pagar-e-receber/{{id}} sem instrumentação: {requisicao * 1e6:.0f} µs"
+        f" (middleware + 2 queries = {(custo_middleware + 2 * custo_query) / requisicao:.2%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
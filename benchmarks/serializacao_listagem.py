@@ -0,0 +1,102 @@
+"""Compara o custo de CPU da listagem de contas com e sem SERIALIZACAO_RAPIDA.
+
+Carrega as contas num SQLite temporário, percorre todas as páginas de
+GET /contas-a-pagar-e-receber nos dois modos e mostra o tempo de CPU por
+10 mil linhas (melhor de algumas repetições):
+
+    python -m benchmarks.serializacao_listagem --contas 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from benchmarks.dados import carrega_dados  # noqa: E402
+from main import app  # noqa: E402
+from shared import serializacao  # noqa: E402
+from shared.dependencies import get_db  # noqa: E402
+from shared.paginacao import CABECALHO_PROXIMO_CURSOR, LIMITE_MAXIMO  # noqa: E402
+
+
+def percorre_listagem(client: TestClient) -> int:
+    linhas = 0
+    cursor = None
+
+    while True:
+        params = {"limit": LIMITE_MAXIMO}
+        if cursor is not None:
+            params["cursor"] = cursor
+
+        response = client.get("/contas-a-pagar-e-receber", params=params)
+        response.raise_for_status()
+        linhas += len(response.json())
+
+        cursor = response.headers.get(CABECALHO_PROXIMO_CURSOR)
+        if cursor is None:
+            return linhas
+
+
+def mede_cpu(client: TestClient, rapida: bool, repeticoes: int) -> tuple:
+    serializacao.SERIALIZACAO_RAPIDA = rapida
+    melhor = None
+
+    for _ in range(repeticoes):
+        inicio = time.process_time()
+        linhas = percorre_listagem(client)
+        decorrido = time.process_time() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+
+    return melhor, linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contas", type=int, default=10000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{diretorio}/benchmark.db")
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        carrega_dados(engine, 100, args.contas)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+
+        # Aquece caches de compilação do SQLAlchemy e do pydantic
+        mede_cpu(client, rapida=False, repeticoes=1)
+        mede_cpu(client, rapida=True, repeticoes=1)
+
+        resultados = {
+            "response_model": mede_cpu(client, rapida=False, repeticoes=args.repeticoes),
+            "serializacao_rapida": mede_cpu(
+                client, rapida=True, repeticoes=args.repeticoes
+            ),
+        }
+        engine.dispose()
+
+    for modo, (segundos, linhas) in resultados.items():
+        print(f"{modo:>20}: {segundos * 10000 / linhas * 1000:8.1f} ms de CPU / 10k linhas")
+
+    economia = resultados["response_model"][0] - resultados["serializacao_rapida"][0]
+    print(
+        f"{'economia':>20}: {economia * 10000 / args.contas * 1000:8.1f} ms de CPU / 10k linhas"
+        f" ({economia / resultados['response_model'][0]:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
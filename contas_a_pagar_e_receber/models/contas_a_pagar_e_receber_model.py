@@ -1,7 +1,19 @@
-from sqlalchemy import Boolean, Column, Date, ForeignKey, Integer, Numeric, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    false,
+)
 from sqlalchemy.orm import relationship
 
 from shared.database import Base
+from shared.datas import agora
 
 
 class ContaPagarReceber(Base):
@@ -14,7 +26,43 @@ class ContaPagarReceber(Base):
     data_previsao = Column(Date(), nullable=False)
     data_baixa = Column(Date())
     valor_baixa = Column(Numeric(scale=2))
-    esta_baixada = Column(Boolean, default=False)
+    # NOT NULL para que esta_baixada = false use o índice e inclua toda conta em aberto
+    esta_baixada = Column(Boolean, nullable=False, default=False, server_default=false())
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
+    atualizado_em = Column(
+        DateTime(timezone=True), nullable=False, default=agora, onupdate=agora
+    )
 
     fornecedor_cliente_id = Column(Integer, ForeignKey("fornecedor_cliente.id"))
     fornecedor = relationship("FornecedorCliente")
+
+    __mapper_args__ = {"version_id_col": versao}
+
+    __table_args__ = (
+        Index("ix_contas_a_pagar_e_receber_data_previsao_id", "data_previsao", "id"),
+        Index(
+            "ix_contas_a_pagar_e_receber_tipo_data_previsao_id",
+            "tipo",
+            "data_previsao",
+            "id",
+        ),
+        Index(
+            "ix_contas_a_pagar_e_receber_esta_baixada_data_previsao_id",
+            "esta_baixada",
+            "data_previsao",
+            "id",
+        ),
+        Index(
+            "ix_contas_a_pagar_e_receber_fornecedor_cliente_id_data_previsao_id",
+            "fornecedor_cliente_id",
+            "data_previsao",
+            "id",
+        ),
+        # ILIKE '%termo%' da busca; só existe no Postgres, com a extensão pg_trgm
+        Index(
+            "ix_contas_a_pagar_e_receber_descricao_trgm",
+            "descricao",
+            postgresql_using="gin",
+            postgresql_ops={"descricao": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 from shared.database import Base
+from shared.datas import agora
 
 
 class FornecedorCliente(Base):
@@ -8,3 +9,19 @@ class FornecedorCliente(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     nome = Column(String(255))
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
+    atualizado_em = Column(
+        DateTime(timezone=True), nullable=False, default=agora, onupdate=agora
+    )
+
+    __mapper_args__ = {"version_id_col": versao}
+
+    __table_args__ = (
+        # ILIKE '%termo%' da busca de contas; só existe no Postgres, com a extensão pg_trgm
+        Index(
+            "ix_fornecedor_cliente_nome_trgm",
+            "nome",
+            postgresql_using="gin",
+            postgresql_ops={"nome": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer
+
+from shared.database import Base
+
+
+class QuantidadeContasPorMes(Base):
+    __tablename__ = "quantidade_contas_por_mes"
+
+    ano = Column(Integer, primary_key=True)
+    mes = Column(Integer, primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
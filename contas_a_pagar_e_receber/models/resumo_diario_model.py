@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Date, Integer, Numeric, String
+
+from shared.database import Base
+
+
+class ResumoDiario(Base):
+    __tablename__ = "resumo_diario"
+
+    data = Column(Date(), primary_key=True)
+    tipo = Column(String(30), primary_key=True)
+    valor_total = Column(Numeric(scale=2), nullable=False, default=0)
+    quantidade = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Numeric, String
+
+from shared.database import Base
+
+
+class ResumoMensal(Base):
+    __tablename__ = "resumo_mensal"
+
+    ano = Column(Integer, primary_key=True)
+    mes = Column(Integer, primary_key=True)
+    tipo = Column(String(30), primary_key=True)
+    valor_total = Column(Numeric(scale=2), nullable=False, default=0)
+    valor_baixado = Column(Numeric(scale=2), nullable=False, default=0)
+    quantidade = Column(Integer, nullable=False, default=0)
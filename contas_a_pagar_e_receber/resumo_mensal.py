@@ -0,0 +1,194 @@
+"""Manutenção incremental das tabelas resumo_mensal e resumo_diario.
+
+Cada conta contribui para a linha (ano, mes, tipo) da sua data_previsao com o
+valor, o valor baixado e uma unidade na quantidade, e para a linha (data, tipo)
+de resumo_diario com o valor e a quantidade. As escritas aplicam a diferença
+entre a contribuição antiga e a nova na mesma transação da conta.
+
+Para recalcular tudo a partir das contas (backfill ou reparo):
+
+    python -m contas_a_pagar_e_receber.resumo_mensal
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import Integer, case, cast, delete, extract, func, insert, select
+from sqlalchemy.orm import Session
+
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (
+    ContaPagarReceber,
+)
+from contas_a_pagar_e_receber.models.quantidade_contas_por_mes_model import (
+    QuantidadeContasPorMes,
+)
+from contas_a_pagar_e_receber.models.resumo_diario_model import ResumoDiario
+from contas_a_pagar_e_receber.models.resumo_mensal_model import ResumoMensal
+from shared.dialetos import insert_do_dialeto
+
+
+def valor_baixado_da_conta(esta_baixada, valor_baixa) -> Decimal:
+    if esta_baixada and valor_baixa is not None:
+        return Decimal(valor_baixa)
+    return Decimal(0)
+
+
+def contribuicao_da_conta(conta) -> tuple:
+    """Retorna a chave (ano, mes, tipo) e os valores com que a conta entra no resumo."""
+    # Antes do refresh o tipo ainda pode ser o ContaPagarReceberTipoEnum do request
+    tipo = getattr(conta.tipo, "value", conta.tipo)
+    chave = (conta.data_previsao.year, conta.data_previsao.month, tipo)
+    valores = (
+        Decimal(conta.valor or 0),
+        valor_baixado_da_conta(conta.esta_baixada, conta.valor_baixa),
+        1,
+    )
+    return chave, valores
+
+
+def contribuicao_diaria_da_conta(conta) -> tuple:
+    """Retorna a chave (data, tipo) e os valores com que a conta entra no resumo diário."""
+    tipo = getattr(conta.tipo, "value", conta.tipo)
+    return (conta.data_previsao, tipo), (Decimal(conta.valor or 0), 1)
+
+
+def acumula(diferencas, chave, valores, sinal) -> None:
+    diferenca = diferencas[chave]
+    for indice, valor in enumerate(valores):
+        diferenca[indice] += sinal * valor
+
+
+class AlteracoesDoResumo:
+    """Acumula diferenças por (ano, mes, tipo) para aplicar com um upsert por chave.
+
+    As diferenças por (data, tipo) de resumo_diario vão num único upsert com
+    várias linhas, já que um lote pode tocar milhares de dias.
+    """
+
+    def __init__(self):
+        self._diferencas = defaultdict(lambda: [Decimal(0), Decimal(0), 0])
+        self._diferencas_diarias = defaultdict(lambda: [Decimal(0), 0])
+
+    def soma(self, conta) -> None:
+        acumula(self._diferencas, *contribuicao_da_conta(conta), sinal=1)
+        acumula(self._diferencas_diarias, *contribuicao_diaria_da_conta(conta), sinal=1)
+
+    def subtrai(self, conta) -> None:
+        acumula(self._diferencas, *contribuicao_da_conta(conta), sinal=-1)
+        acumula(self._diferencas_diarias, *contribuicao_diaria_da_conta(conta), sinal=-1)
+
+    def soma_valor_baixado(self, chave: tuple, valor_baixado: Decimal) -> None:
+        self._diferencas[chave][1] += valor_baixado
+
+    def aplica(self, db: Session) -> None:
+        insert_com_conflito = insert_do_dialeto(db)
+
+        # Ordem fixa das chaves para que transações concorrentes não entrem em deadlock
+        for (ano, mes, tipo), (valor_total, valor_baixado, quantidade) in sorted(
+            self._diferencas.items()
+        ):
+            if not (valor_total or valor_baixado or quantidade):
+                continue
+
+            comando = insert_com_conflito(ResumoMensal).values(
+                ano=ano,
+                mes=mes,
+                tipo=tipo,
+                valor_total=valor_total,
+                valor_baixado=valor_baixado,
+                quantidade=quantidade,
+            )
+            db.execute(
+                comando.on_conflict_do_update(
+                    index_elements=[ResumoMensal.ano, ResumoMensal.mes, ResumoMensal.tipo],
+                    set_={
+                        "valor_total": ResumoMensal.valor_total
+                        + comando.excluded.valor_total,
+                        "valor_baixado": ResumoMensal.valor_baixado
+                        + comando.excluded.valor_baixado,
+                        "quantidade": ResumoMensal.quantidade
+                        + comando.excluded.quantidade,
+                    },
+                )
+            )
+
+        self._diferencas.clear()
+        self._aplica_diarias(db, insert_com_conflito)
+
+    def _aplica_diarias(self, db: Session, insert_com_conflito) -> None:
+        linhas = [
+            {"data": data, "tipo": tipo, "valor_total": valor_total, "quantidade": quantidade}
+            for (data, tipo), (valor_total, quantidade) in sorted(
+                self._diferencas_diarias.items()
+            )
+            if valor_total or quantidade
+        ]
+        self._diferencas_diarias.clear()
+        if not linhas:
+            return
+
+        comando = insert_com_conflito(ResumoDiario).values(linhas)
+        db.execute(
+            comando.on_conflict_do_update(
+                index_elements=[ResumoDiario.data, ResumoDiario.tipo],
+                set_={
+                    "valor_total": ResumoDiario.valor_total + comando.excluded.valor_total,
+                    "quantidade": ResumoDiario.quantidade + comando.excluded.quantidade,
+                },
+            )
+        )
+
+
+def reconstroi_resumo_mensal(db: Session) -> None:
+    """Recalcula resumo_mensal, resumo_diario e quantidade_contas_por_mes a partir das contas."""
+    ano = cast(extract("year", ContaPagarReceber.data_previsao), Integer)
+    mes = cast(extract("month", ContaPagarReceber.data_previsao), Integer)
+    valor_baixado = case(
+        (ContaPagarReceber.esta_baixada.is_(True), ContaPagarReceber.valor_baixa),
+        else_=0,
+    )
+
+    db.execute(delete(ResumoMensal))
+    db.execute(
+        insert(ResumoMensal).from_select(
+            ["ano", "mes", "tipo", "valor_total", "valor_baixado", "quantidade"],
+            select(
+                ano,
+                mes,
+                ContaPagarReceber.tipo,
+                func.coalesce(func.sum(ContaPagarReceber.valor), 0),
+                func.coalesce(func.sum(valor_baixado), 0),
+                func.count(),
+            ).group_by(ano, mes, ContaPagarReceber.tipo),
+        )
+    )
+
+    db.execute(delete(ResumoDiario))
+    db.execute(
+        insert(ResumoDiario).from_select(
+            ["data", "tipo", "valor_total", "quantidade"],
+            select(
+                ContaPagarReceber.data_previsao,
+                ContaPagarReceber.tipo,
+                func.coalesce(func.sum(ContaPagarReceber.valor), 0),
+                func.count(),
+            ).group_by(ContaPagarReceber.data_previsao, ContaPagarReceber.tipo),
+        )
+    )
+
+    db.execute(delete(QuantidadeContasPorMes))
+    db.execute(
+        insert(QuantidadeContasPorMes).from_select(
+            ["ano", "mes", "quantidade"],
+            select(ano, mes, func.count()).group_by(ano, mes),
+        )
+    )
+
+
+if __name__ == "__main__":
+    # Registra FornecedorCliente, alvo do relacionamento de ContaPagarReceber
+    import contas_a_pagar_e_receber.models.fornecedor_cliente_model  # noqa: F401
+    from shared.database import obtem_sessionmaker
+
+    with obtem_sessionmaker()() as db:
+        reconstroi_resumo_mensal(db)
+        db.commit()
@@ -0,0 +1,239 @@
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from contas_a_pagar_e_receber.routers import contas_a_pagar_e_receber_router
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import (
+    MEDIA_TYPE_EXPORTACAO,
+    TAMANHO_LOTE_EXPORTACAO,
+    TAMANHO_MAXIMO_LOTE,
+    TAMANHO_MINIMO_BUSCA,
+    BaixaEmLoteRequest,
+    ContaPagarReceberRequest,
+    ContaPagarReceberResponse,
+    FiltroContas,
+    FormatoExportacaoEnum,
+    GranularidadeFluxoDeCaixaEnum,
+    PeriodoFluxoDeCaixa,
+    PrevisaoPorMes,
+    ResultadoLoteConta,
+    cabecalhos_exportacao,
+    formata_lote_csv,
+    formata_lote_exportacao,
+    monta_consulta_exportacao,
+)
+from shared.assincrono import executa_em_sessao_sincrona
+from shared.dependencies import get_async_db
+from shared.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO
+
+router = APIRouter(prefix="/contas-a-pagar-e-receber")
+
+
+@router.get("", response_model=List[ContaPagarReceberResponse])
+async def listar_contas(
+    response: Response,
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    filtros: FiltroContas = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ContaPagarReceberResponse]:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.listar_contas,
+        List[ContaPagarReceberResponse],
+        response=response,
+        limit=limit,
+        cursor=cursor,
+        filtros=filtros,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_contas(
+    formato: FormatoExportacaoEnum = FormatoExportacaoEnum.NDJSON,
+    filtros: FiltroContas = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    consulta = monta_consulta_exportacao(filtros)
+
+    return StreamingResponse(
+        gera_exportacao(db.bind, consulta, formato),
+        media_type=MEDIA_TYPE_EXPORTACAO[formato],
+        headers=cabecalhos_exportacao(formato),
+    )
+
+
+@router.get("/previsao-gastos-por-mes", response_model=List[PrevisaoPorMes])
+async def previsa_de_gatos_por_mes(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    ano: int | None = Query(default=None, ge=1, le=9998),
+):
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.previsa_de_gatos_por_mes,
+        request=request,
+        response=response,
+        ano=ano,
+    )
+
+
+@router.get("/busca", response_model=List[ContaPagarReceberResponse])
+async def buscar_contas(
+    response: Response,
+    q: str = Query(min_length=TAMANHO_MINIMO_BUSCA, max_length=255),
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ContaPagarReceberResponse]:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.buscar_contas,
+        List[ContaPagarReceberResponse],
+        response=response,
+        q=q,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+@router.get("/fluxo-de-caixa", response_model=List[PeriodoFluxoDeCaixa])
+async def fluxo_de_caixa(
+    data_inicio: date,
+    data_fim: date,
+    granularidade: GranularidadeFluxoDeCaixaEnum = GranularidadeFluxoDeCaixaEnum.DIA,
+    saldo_inicial: Decimal = Query(default=Decimal(0), decimal_places=2),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[PeriodoFluxoDeCaixa]:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.fluxo_de_caixa,
+        List[PeriodoFluxoDeCaixa],
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        granularidade=granularidade,
+        saldo_inicial=saldo_inicial,
+    )
+
+
+@router.get("/{id}", response_model=ContaPagarReceberResponse)
+async def listar_uma_contas(
+    request: Request, response: Response, id: int, db: AsyncSession = Depends(get_async_db)
+) -> ContaPagarReceberResponse:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.listar_uma_contas,
+        ContaPagarReceberResponse,
+        request=request,
+        response=response,
+        id=id,
+    )
+
+
+@router.post("", response_model=ContaPagarReceberResponse, status_code=201)
+async def criar_conta(
+    conta_a_pagar_e_receber_request: ContaPagarReceberRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> ContaPagarReceberResponse:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.criar_conta,
+        ContaPagarReceberResponse,
+        conta_a_pagar_e_receber_request=conta_a_pagar_e_receber_request,
+    )
+
+
+@router.post("/lote", response_model=List[ResultadoLoteConta], status_code=200)
+async def criar_contas_em_lote(
+    contas_request: List[ContaPagarReceberRequest] = Body(
+        min_length=1, max_length=TAMANHO_MAXIMO_LOTE
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ResultadoLoteConta]:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.criar_contas_em_lote,
+        contas_request=contas_request,
+    )
+
+
+@router.post(
+    "/baixar-lote", response_model=List[ContaPagarReceberResponse], status_code=200
+)
+async def baixar_contas_em_lote(
+    baixa_em_lote_request: BaixaEmLoteRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ContaPagarReceberResponse]:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.baixar_contas_em_lote,
+        baixa_em_lote_request=baixa_em_lote_request,
+    )
+
+
+@router.put(
+    "/{id_da_conta_a_pagar_e_receber}",
+    response_model=ContaPagarReceberResponse,
+    status_code=200,
+)
+async def atualizar_conta(
+    id_da_conta_a_pagar_e_receber: int,
+    conta_a_pagar_e_receber_request: ContaPagarReceberRequest,
+    versao: int | None = Query(default=None, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+) -> ContaPagarReceberResponse:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.atualizar_conta,
+        ContaPagarReceberResponse,
+        id_da_conta_a_pagar_e_receber=id_da_conta_a_pagar_e_receber,
+        conta_a_pagar_e_receber_request=conta_a_pagar_e_receber_request,
+        versao=versao,
+    )
+
+
+@router.post(
+    "/{id_da_conta_a_pagar_e_receber}/baixar",
+    response_model=ContaPagarReceberResponse,
+    status_code=200,
+)
+async def baixar_conta(
+    id_da_conta_a_pagar_e_receber: int,
+    versao: int | None = Query(default=None, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+) -> ContaPagarReceberResponse:
+    return await executa_em_sessao_sincrona(
+        db,
+        contas_a_pagar_e_receber_router.baixar_conta,
+        ContaPagarReceberResponse,
+        id_da_conta_a_pagar_e_receber=id_da_conta_a_pagar_e_receber,
+        versao=versao,
+    )
+
+
+@router.delete("/{id}", status_code=204)
+async def deletar_conta(
+    id: int,
+    versao: int | None = Query(default=None, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+) -> None:
+    await executa_em_sessao_sincrona(
+        db, contas_a_pagar_e_receber_router.deletar_conta, id=id, versao=versao
+    )
+
+
+async def gera_exportacao(bind, consulta, formato: FormatoExportacaoEnum):
+    async with bind.connect() as conexao:
+        resultado = await conexao.stream(
+            consulta.execution_options(yield_per=TAMANHO_LOTE_EXPORTACAO)
+        )
+
+        if formato == FormatoExportacaoEnum.CSV:
+            yield formata_lote_csv([resultado.keys()])
+        async for lote in resultado.partitions():
+            yield formata_lote_exportacao(lote, formato)
@@ -1,27 +1,92 @@
-from collections import OrderedDict
-from datetime import date
+import csv
+import io
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
 from decimal import Decimal
 from enum import Enum
+from itertools import accumulate
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import extract
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Numeric,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
 from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (
     ContaPagarReceber,
 )
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorCliente
+from contas_a_pagar_e_receber.models.quantidade_contas_por_mes_model import (
+    QuantidadeContasPorMes,
+)
+from contas_a_pagar_e_receber.models.resumo_diario_model import ResumoDiario
+from contas_a_pagar_e_receber.models.resumo_mensal_model import ResumoMensal
+from contas_a_pagar_e_receber.resumo_mensal import (
+    AlteracoesDoResumo,
+    contribuicao_da_conta,
+    valor_baixado_da_conta,
+)
 from contas_a_pagar_e_receber.routers.fornecedor_cliente_router import (
     FornecedorClienteResponse,
+    busca_fornecedor_cliente_em_cache,
+    chave_do_fornecedor_cliente,
+)
+from shared.cache import cache
+from shared.concorrencia import (
+    condicoes_da_escrita,
+    confere_versao,
+    erro_da_escrita_condicional,
+    versao_desatualizada,
+)
+from shared.dependencies import get_db, get_read_db
+from shared.dialetos import inicio_da_semana, insert_do_dialeto
+from shared.etag import (
+    calcula_etag,
+    etag_corresponde,
+    resposta_nao_modificada,
 )
-from shared.dependencies import get_db
 from shared.exeptions import NotFound
+from shared import serializacao
+from shared.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    LIMITE_MAXIMO,
+    LIMITE_PADRAO,
+    codifica_cursor,
+    codifica_cursor_da_busca,
+    decodifica_cursor,
+    decodifica_cursor_da_busca,
+)
 
 router = APIRouter(prefix="/contas-a-pagar-e-receber")
 
 QUANTIDADE_PERMITIDA_POR_MES = 100
+TAMANHO_LOTE_EXPORTACAO = 1000
+TAMANHO_MAXIMO_LOTE = 5000
+# Com menos de 3 caracteres não há trigrama, e o índice da busca não ajuda
+TAMANHO_MINIMO_BUSCA = 3
+ESCAPE_DO_LIKE = "!"
+CENTAVO = Decimal("0.01")
+# Pouco mais de 10 anos; a janela de 5 anos do fluxo de caixa cabe com folga
+MAXIMO_DIAS_FLUXO_DE_CAIXA = 3660
+
+MENSAGEM_FORNECEDOR_INEXISTENTE = "Esse fornecedor não existe no banco de dados"
+MENSAGEM_LIMITE_DO_MES = "Você não pode mais lançar contas para esse mês"
 
 
 class ContaPagarReceberResponse(BaseModel):
@@ -35,6 +100,7 @@ class ContaPagarReceberResponse(BaseModel):
     data_baixa: date | None = None
     valor_baixa: float | None = None
     esta_baixada: bool | None = None
+    versao: int
     fornecedor: FornecedorClienteResponse | None = None
 
 
@@ -56,21 +122,231 @@ class PrevisaoPorMes(BaseModel):
     valor_total: Decimal
 
 
+class GranularidadeFluxoDeCaixaEnum(str, Enum):
+    DIA = "dia"
+    SEMANA = "semana"
+
+
+class PeriodoFluxoDeCaixa(BaseModel):
+    inicio: date
+    entradas: Decimal
+    saidas: Decimal
+    saldo_do_periodo: Decimal
+    saldo_acumulado: Decimal
+
+
+class ResultadoLoteConta(BaseModel):
+    indice: int
+    status_code: int
+    conta: ContaPagarReceberResponse | None = None
+    erro: str | None = None
+
+
+class BaixaEmLoteRequest(BaseModel):
+    ids: List[int] | None = Field(default=None, min_length=1, max_length=TAMANHO_MAXIMO_LOTE)
+    tipo: ContaPagarReceberTipoEnum | None = None
+    data_previsao_ate: date | None = None
+
+
+class FiltroContasDoFornecedor(BaseModel):
+    tipo: ContaPagarReceberTipoEnum | None = None
+    esta_baixada: bool | None = None
+    data_previsao_inicio: date | None = None
+    data_previsao_fim: date | None = None
+
+
+class FiltroContas(FiltroContasDoFornecedor):
+    fornecedor_cliente_id: int | None = None
+
+
+class FormatoExportacaoEnum(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+COLUNAS_EXPORTACAO = (
+    ContaPagarReceber.id,
+    ContaPagarReceber.descricao,
+    ContaPagarReceber.valor,
+    ContaPagarReceber.tipo,
+    ContaPagarReceber.data_previsao,
+    ContaPagarReceber.data_baixa,
+    ContaPagarReceber.valor_baixa,
+    ContaPagarReceber.esta_baixada,
+    ContaPagarReceber.fornecedor_cliente_id,
+)
+
+COLUNAS_LISTAGEM = (
+    ContaPagarReceber.id,
+    ContaPagarReceber.descricao,
+    ContaPagarReceber.valor,
+    ContaPagarReceber.tipo,
+    ContaPagarReceber.data_previsao,
+    ContaPagarReceber.data_baixa,
+    ContaPagarReceber.valor_baixa,
+    ContaPagarReceber.esta_baixada,
+    ContaPagarReceber.versao,
+    FornecedorCliente.id.label("fornecedor_id"),
+    FornecedorCliente.nome.label("fornecedor_nome"),
+    FornecedorCliente.versao.label("fornecedor_versao"),
+)
+
+MEDIA_TYPE_EXPORTACAO = {
+    FormatoExportacaoEnum.NDJSON: "application/x-ndjson",
+    FormatoExportacaoEnum.CSV: "text/csv",
+}
+
+
 @router.get("", response_model=List[ContaPagarReceberResponse])
-def listar_contas(db: Session = Depends(get_db)) -> List[ContaPagarReceberResponse]:
-    return db.query(ContaPagarReceber).all()
+def listar_contas(
+    response: Response,
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    filtros: FiltroContas = Depends(),
+    db: Session = Depends(get_read_db),
+) -> List[ContaPagarReceberResponse]:
+    if serializacao.SERIALIZACAO_RAPIDA:
+        return listar_contas_serializadas(limit, cursor, filtros, db)
+
+    query = pagina_de_contas(
+        aplica_filtros_de_contas(db.query(ContaPagarReceber), filtros).options(
+            joinedload(ContaPagarReceber.fornecedor)
+        ),
+        limit,
+        cursor,
+    )
+
+    # Busca um registro a mais só para saber se existe uma próxima página
+    contas = query.all()
+
+    if len(contas) > limit:
+        contas = contas[:limit]
+        ultima_conta = contas[-1]
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codifica_cursor(
+            ultima_conta.data_previsao, ultima_conta.id
+        )
+
+    return contas
+
+
+@router.get("/export", response_class=StreamingResponse)
+def exportar_contas(
+    formato: FormatoExportacaoEnum = FormatoExportacaoEnum.NDJSON,
+    filtros: FiltroContas = Depends(),
+    db: Session = Depends(get_read_db),
+) -> StreamingResponse:
+    consulta = monta_consulta_exportacao(filtros)
+
+    # O corpo é enviado depois que a sessão da dependência já foi fechada,
+    # então o gerador abre a própria conexão no mesmo engine.
+    return StreamingResponse(
+        gera_exportacao(db.get_bind(), consulta, formato),
+        media_type=MEDIA_TYPE_EXPORTACAO[formato],
+        headers=cabecalhos_exportacao(formato),
+    )
 
 
 @router.get("/previsao-gastos-por-mes", response_model=List[PrevisaoPorMes])
-def previsa_de_gatos_por_mes(db: Session = Depends(get_db), ano=date.today().year):
-    return relatorio_gastos_previstos_por_mes_de_um_ano(db, ano)
+def previsa_de_gatos_por_mes(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    ano: int | None = Query(default=None, ge=1, le=9998),
+):
+    if ano is None:
+        ano = date.today().year
+
+    previsao = relatorio_gastos_previstos_por_mes_de_um_ano(db, ano)
+
+    # O relatório já é pequeno e barato, então a ETag sai do próprio resultado
+    etag = calcula_etag(
+        "previsao", ano, *((p.mes, p.valor_total) for p in previsao)
+    )
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+
+    response.headers["ETag"] = etag
+    return previsao
+
+
+@router.get("/busca", response_model=List[ContaPagarReceberResponse])
+def buscar_contas(
+    response: Response,
+    q: str = Query(min_length=TAMANHO_MINIMO_BUSCA, max_length=255),
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+) -> List[ContaPagarReceberResponse]:
+    relevancia = relevancia_da_busca(db, q)
+    padrao = f"%{escapa_like(q)}%"
+
+    consulta = (
+        select(ContaPagarReceber, relevancia.label("relevancia"))
+        .outerjoin(ContaPagarReceber.fornecedor)
+        .options(contains_eager(ContaPagarReceber.fornecedor))
+        .where(
+            or_(
+                ContaPagarReceber.descricao.ilike(padrao, escape=ESCAPE_DO_LIKE),
+                FornecedorCliente.nome.ilike(padrao, escape=ESCAPE_DO_LIKE),
+            )
+        )
+        .order_by(relevancia.desc(), ContaPagarReceber.id)
+        .limit(limit + 1)
+    )
+
+    if cursor is not None:
+        relevancia_do_cursor, id_do_cursor = decodifica_cursor_da_busca(cursor)
+        consulta = consulta.where(
+            or_(
+                relevancia < relevancia_do_cursor,
+                and_(relevancia == relevancia_do_cursor, ContaPagarReceber.id > id_do_cursor),
+            )
+        )
+
+    resultados = db.execute(consulta).all()
+
+    if len(resultados) > limit:
+        resultados = resultados[:limit]
+        ultima_conta, ultima_relevancia = resultados[-1]
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codifica_cursor_da_busca(
+            ultima_relevancia, ultima_conta.id
+        )
+
+    return [conta for conta, _ in resultados]
+
+
+@router.get("/fluxo-de-caixa", response_model=List[PeriodoFluxoDeCaixa])
+def fluxo_de_caixa(
+    data_inicio: date,
+    data_fim: date,
+    granularidade: GranularidadeFluxoDeCaixaEnum = GranularidadeFluxoDeCaixaEnum.DIA,
+    saldo_inicial: Decimal = Query(default=Decimal(0), decimal_places=2),
+    db: Session = Depends(get_read_db),
+) -> List[PeriodoFluxoDeCaixa]:
+    if data_fim < data_inicio:
+        raise HTTPException(
+            status_code=422, detail="data_fim deve ser igual ou posterior a data_inicio"
+        )
+    if (data_fim - data_inicio).days >= MAXIMO_DIAS_FLUXO_DE_CAIXA:
+        raise HTTPException(
+            status_code=422,
+            detail=f"O período pode ter no máximo {MAXIMO_DIAS_FLUXO_DE_CAIXA} dias",
+        )
+
+    return fluxo_de_caixa_por_periodo(
+        db, data_inicio, data_fim, granularidade, saldo_inicial.quantize(CENTAVO)
+    )
 
 
 @router.get("/{id}", response_model=ContaPagarReceberResponse)
 def listar_uma_contas(
-    id: int, db: Session = Depends(get_db)
+    request: Request, response: Response, id: int, db: Session = Depends(get_read_db)
 ) -> List[ContaPagarReceberResponse]:
+    etag = etag_da_conta(id, db)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
 
+    response.headers["ETag"] = etag
     return busca_conta_por_id(id, db)
 
 
@@ -79,21 +355,171 @@ def criar_conta(
     conta_a_pagar_e_receber_request: ContaPagarReceberRequest,
     db: Session = Depends(get_db),
 ) -> ContaPagarReceberResponse:
-    valida_fornecedor(conta_a_pagar_e_receber_request.fornecedor_cliente_id, db)
+    fornecedor = valida_fornecedor(conta_a_pagar_e_receber_request.fornecedor_cliente_id, db)
 
-    valida_se_pode_registrar_novas_contas(
-        db=db, conta_a_pagar_e_receber_request=conta_a_pagar_e_receber_request
-    )
+    reserva_vaga_no_mes(db, conta_a_pagar_e_receber_request.data_previsao)
 
-    contas_a_pagar_e_receber = ContaPagarReceber(
-        **conta_a_pagar_e_receber_request.model_dump()
-    )
+    # O RETURNING já traz id, versão e defaults, sem o refresh depois do commit
+    with recusa_fornecedor_excluido(db, conta_a_pagar_e_receber_request.fornecedor_cliente_id):
+        conta_a_pagar_e_receber = db.scalars(
+            insert(ContaPagarReceber).returning(ContaPagarReceber),
+            [conta_a_pagar_e_receber_request.model_dump()],
+        ).one()
 
-    db.add(contas_a_pagar_e_receber)
+    alteracoes_do_resumo = AlteracoesDoResumo()
+    alteracoes_do_resumo.soma(conta_a_pagar_e_receber)
+    alteracoes_do_resumo.aplica(db)
+
+    resposta = resposta_da_conta(conta_a_pagar_e_receber, fornecedor)
     db.commit()
-    db.refresh(contas_a_pagar_e_receber)
 
-    return contas_a_pagar_e_receber
+    return resposta
+
+
+@router.post("/lote", response_model=List[ResultadoLoteConta], status_code=200)
+def criar_contas_em_lote(
+    contas_request: List[ContaPagarReceberRequest] = Body(
+        min_length=1, max_length=TAMANHO_MAXIMO_LOTE
+    ),
+    db: Session = Depends(get_db),
+) -> List[ResultadoLoteConta]:
+    resultados: List[ResultadoLoteConta | None] = [None] * len(contas_request)
+
+    fornecedores_existentes = carrega_fornecedores_das_contas(db, contas_request)
+
+    indices_por_mes = defaultdict(list)
+    for indice, conta in enumerate(contas_request):
+        if (
+            conta.fornecedor_cliente_id is not None
+            and conta.fornecedor_cliente_id not in fornecedores_existentes
+        ):
+            resultados[indice] = ResultadoLoteConta(
+                indice=indice, status_code=422, erro=MENSAGEM_FORNECEDOR_INEXISTENTE
+            )
+        else:
+            mes = (conta.data_previsao.year, conta.data_previsao.month)
+            indices_por_mes[mes].append(indice)
+
+    indices_aceitos = []
+    # Meses sempre na mesma ordem para que lotes concorrentes não entrem em deadlock
+    for (ano, mes), indices in sorted(indices_por_mes.items()):
+        quantidade_reservada = reserva_vagas_no_mes(db, ano, mes, len(indices))
+        indices_aceitos.extend(indices[:quantidade_reservada])
+        for indice in indices[quantidade_reservada:]:
+            resultados[indice] = ResultadoLoteConta(
+                indice=indice, status_code=422, erro=MENSAGEM_LIMITE_DO_MES
+            )
+
+    indices_aceitos.sort()
+    if indices_aceitos:
+        # render_nulls mantém todos os itens com as mesmas colunas, num único executemany
+        contas = db.scalars(
+            insert(ContaPagarReceber).returning(
+                ContaPagarReceber, sort_by_parameter_order=True
+            ),
+            [contas_request[indice].model_dump() for indice in indices_aceitos],
+            execution_options={"render_nulls": True},
+        ).all()
+
+        alteracoes_do_resumo = AlteracoesDoResumo()
+        for conta in contas:
+            alteracoes_do_resumo.soma(conta)
+        alteracoes_do_resumo.aplica(db)
+
+        # Monta as respostas antes do commit, que expira os objetos da sessão
+        for indice, conta in zip(indices_aceitos, contas):
+            resultados[indice] = ResultadoLoteConta(
+                indice=indice,
+                status_code=201,
+                conta=resposta_com_fornecedor_carregado(conta, fornecedores_existentes),
+            )
+
+    db.commit()
+
+    return resultados
+
+
+@router.post(
+    "/baixar-lote", response_model=List[ContaPagarReceberResponse], status_code=200
+)
+def baixar_contas_em_lote(
+    baixa_em_lote_request: BaixaEmLoteRequest,
+    db: Session = Depends(get_db),
+) -> List[ContaPagarReceberResponse]:
+    if (
+        baixa_em_lote_request.ids is None
+        and baixa_em_lote_request.tipo is None
+        and baixa_em_lote_request.data_previsao_ate is None
+    ):
+        raise HTTPException(
+            status_code=422, detail="Informe os ids ou ao menos um filtro para a baixa"
+        )
+
+    condicoes = [
+        # Contas já baixadas com o valor atual ficam como estão, assim como em baixar_conta
+        or_(
+            ContaPagarReceber.esta_baixada.is_not(True),
+            ContaPagarReceber.valor_baixa.is_(None),
+            ContaPagarReceber.valor_baixa != ContaPagarReceber.valor,
+        )
+    ]
+    if baixa_em_lote_request.ids is not None:
+        condicoes.append(ContaPagarReceber.id.in_(baixa_em_lote_request.ids))
+    if baixa_em_lote_request.tipo is not None:
+        condicoes.append(ContaPagarReceber.tipo == baixa_em_lote_request.tipo.value)
+    if baixa_em_lote_request.data_previsao_ate is not None:
+        condicoes.append(
+            ContaPagarReceber.data_previsao <= baixa_em_lote_request.data_previsao_ate
+        )
+
+    # O RETURNING só enxerga os valores novos; o valor baixado anterior de cada
+    # conta é lido antes (com as linhas travadas) para atualizar o resumo mensal.
+    valor_baixado_anterior = {
+        conta.id: valor_baixado_da_conta(conta.esta_baixada, conta.valor_baixa)
+        for conta in db.execute(
+            select(
+                ContaPagarReceber.id,
+                ContaPagarReceber.esta_baixada,
+                ContaPagarReceber.valor_baixa,
+            )
+            .where(*condicoes)
+            .with_for_update()
+        )
+    }
+
+    if not valor_baixado_anterior:
+        return []
+
+    contas = db.scalars(
+        update(ContaPagarReceber)
+        .where(ContaPagarReceber.id.in_(valor_baixado_anterior), *condicoes)
+        .values(
+            esta_baixada=True,
+            data_baixa=date.today(),
+            valor_baixa=ContaPagarReceber.valor,
+            versao=ContaPagarReceber.versao + 1,
+        )
+        .returning(ContaPagarReceber)
+    ).all()
+
+    alteracoes_do_resumo = AlteracoesDoResumo()
+    for conta in contas:
+        chave, (_, valor_baixado, _) = contribuicao_da_conta(conta)
+        alteracoes_do_resumo.soma_valor_baixado(
+            chave, valor_baixado - valor_baixado_anterior[conta.id]
+        )
+    alteracoes_do_resumo.aplica(db)
+
+    fornecedores_carregados = carrega_fornecedores_das_contas(db, contas)
+
+    contas_baixadas = [
+        resposta_com_fornecedor_carregado(conta, fornecedores_carregados)
+        for conta in sorted(contas, key=lambda c: (c.data_previsao, c.id))
+    ]
+
+    db.commit()
+
+    return contas_baixadas
 
 
 @router.put(
@@ -104,22 +530,45 @@ def criar_conta(
 def atualizar_conta(
     id_da_conta_a_pagar_e_receber: int,
     conta_a_pagar_e_receber_request: ContaPagarReceberRequest,
+    versao: int | None = Query(default=None, ge=1),
     db: Session = Depends(get_db),
 ) -> ContaPagarReceberResponse:
-    valida_fornecedor(conta_a_pagar_e_receber_request.fornecedor_cliente_id, db)
+    fornecedor = valida_fornecedor(conta_a_pagar_e_receber_request.fornecedor_cliente_id, db)
 
-    conta_a_pagar_e_receber = busca_conta_por_id(id_da_conta_a_pagar_e_receber, db)
-    conta_a_pagar_e_receber.tipo = conta_a_pagar_e_receber_request.tipo
-    conta_a_pagar_e_receber.valor = conta_a_pagar_e_receber_request.valor
-    conta_a_pagar_e_receber.descricao = conta_a_pagar_e_receber_request.descricao
-    conta_a_pagar_e_receber.fornecedor_cliente_id = (
-        conta_a_pagar_e_receber_request.fornecedor_cliente_id
+    conta_a_pagar_e_receber = busca_conta_para_escrita(
+        id_da_conta_a_pagar_e_receber, versao, db
     )
 
-    db.add(conta_a_pagar_e_receber)
+    data_previsao_anterior = conta_a_pagar_e_receber.data_previsao
+    data_previsao_nova = conta_a_pagar_e_receber_request.data_previsao
+    if (data_previsao_anterior.year, data_previsao_anterior.month) != (
+        data_previsao_nova.year,
+        data_previsao_nova.month,
+    ):
+        reserva_vaga_no_mes(db, data_previsao_nova)
+        libera_vaga_no_mes(db, data_previsao_anterior)
+
+    alteracoes_do_resumo = AlteracoesDoResumo()
+    alteracoes_do_resumo.subtrai(conta_a_pagar_e_receber)
+
+    with recusa_fornecedor_excluido(db, conta_a_pagar_e_receber_request.fornecedor_cliente_id):
+        conta_a_pagar_e_receber = atualiza_conta(
+            db,
+            conta_a_pagar_e_receber,
+            data_previsao=data_previsao_nova,
+            tipo=conta_a_pagar_e_receber_request.tipo.value,
+            valor=conta_a_pagar_e_receber_request.valor,
+            descricao=conta_a_pagar_e_receber_request.descricao,
+            fornecedor_cliente_id=conta_a_pagar_e_receber_request.fornecedor_cliente_id,
+        )
+
+    alteracoes_do_resumo.soma(conta_a_pagar_e_receber)
+    alteracoes_do_resumo.aplica(db)
+
+    resposta = resposta_da_conta(conta_a_pagar_e_receber, fornecedor)
     db.commit()
-    db.refresh(conta_a_pagar_e_receber)
-    return conta_a_pagar_e_receber
+
+    return resposta
 
 
 @router.post(
@@ -128,37 +577,91 @@ def atualizar_conta(
     status_code=200,
 )
 def baixar_conta(
-    id_da_conta_a_pagar_e_receber: int, db: Session = Depends(get_db)
+    id_da_conta_a_pagar_e_receber: int,
+    versao: int | None = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
 ) -> ContaPagarReceberResponse:
-    conta_a_pagar_e_receber = busca_conta_por_id(id_da_conta_a_pagar_e_receber, db)
+    conta_a_pagar_e_receber = busca_conta_para_escrita(
+        id_da_conta_a_pagar_e_receber, versao, db
+    )
 
     if (
         conta_a_pagar_e_receber.esta_baixada
         and conta_a_pagar_e_receber.valor == conta_a_pagar_e_receber.valor_baixa
     ):
-        return conta_a_pagar_e_receber
+        return resposta_da_conta(
+            conta_a_pagar_e_receber, fornecedor_da_conta(conta_a_pagar_e_receber, db)
+        )
+
+    alteracoes_do_resumo = AlteracoesDoResumo()
+    alteracoes_do_resumo.subtrai(conta_a_pagar_e_receber)
+
+    conta_a_pagar_e_receber = atualiza_conta(
+        db,
+        conta_a_pagar_e_receber,
+        data_baixa=date.today(),
+        esta_baixada=True,
+        valor_baixa=ContaPagarReceber.valor,
+    )
 
-    conta_a_pagar_e_receber.data_baixa = date.today()
-    conta_a_pagar_e_receber.esta_baixada = True
-    conta_a_pagar_e_receber.valor_baixa = conta_a_pagar_e_receber.valor
+    alteracoes_do_resumo.soma(conta_a_pagar_e_receber)
+    alteracoes_do_resumo.aplica(db)
 
-    db.add(conta_a_pagar_e_receber)
+    resposta = resposta_da_conta(
+        conta_a_pagar_e_receber, fornecedor_da_conta(conta_a_pagar_e_receber, db)
+    )
     db.commit()
-    db.refresh(conta_a_pagar_e_receber)
-    return conta_a_pagar_e_receber
+
+    return resposta
 
 
 @router.delete("/{id}", status_code=204)
 def deletar_conta(
     id: int,
+    versao: int | None = Query(default=None, ge=1),
     db: Session = Depends(get_db),
 ) -> None:
-    conta_a_pagar_e_receber = busca_conta_por_id(id, db)
+    # O RETURNING devolve o que a conta somava no contador e no resumo do mês
+    conta_removida = db.execute(
+        delete(ContaPagarReceber)
+        .where(*condicoes_da_escrita(ContaPagarReceber, id, versao))
+        .returning(
+            ContaPagarReceber.data_previsao,
+            ContaPagarReceber.tipo,
+            ContaPagarReceber.valor,
+            ContaPagarReceber.esta_baixada,
+            ContaPagarReceber.valor_baixa,
+        )
+    ).one_or_none()
+
+    if conta_removida is None:
+        raise erro_da_escrita_condicional(
+            db, ContaPagarReceber, id, "Conta a Pagar e receber"
+        )
+
+    libera_vaga_no_mes(db, conta_removida.data_previsao)
+
+    alteracoes_do_resumo = AlteracoesDoResumo()
+    alteracoes_do_resumo.subtrai(conta_removida)
+    alteracoes_do_resumo.aplica(db)
 
-    db.delete(conta_a_pagar_e_receber)
     db.commit()
 
 
+def etag_da_conta(id: int, db: Session) -> str:
+    # A resposta inclui o fornecedor, então a versão dele também entra na ETag
+    versoes = db.execute(
+        select(ContaPagarReceber.versao, FornecedorCliente.versao)
+        .outerjoin(ContaPagarReceber.fornecedor)
+        .where(ContaPagarReceber.id == id)
+    ).one_or_none()
+
+    if versoes is None:
+        raise NotFound("Conta a Pagar e receber")
+
+    return calcula_etag("conta", id, *versoes)
+
+
 def busca_conta_por_id(id: int, db: Session) -> ContaPagarReceber:
     conta_a_pagar_e_receber = db.get(ContaPagarReceber, id)
 
@@ -168,74 +671,474 @@ def busca_conta_por_id(id: int, db: Session) -> ContaPagarReceber:
     return conta_a_pagar_e_receber
 
 
-def valida_fornecedor(fornecedor_cliente_id, db):
-    if fornecedor_cliente_id is not None:
-        conta_apagar_e_receber = db.get(FornecedorCliente, fornecedor_cliente_id)
-        if conta_apagar_e_receber is None:
-            raise HTTPException(
-                status_code=422, detail="Esse fornecedor não existe no banco de dados"
+def busca_conta_para_escrita(id: int, versao: int | None, db: Session) -> ContaPagarReceber:
+    # FOR UPDATE segura a linha até o commit, então os valores anteriores usados
+    # no resumo mensal não mudam entre esta leitura e o UPDATE
+    conta_a_pagar_e_receber = db.scalars(
+        select(ContaPagarReceber).where(ContaPagarReceber.id == id).with_for_update()
+    ).one_or_none()
+
+    if conta_a_pagar_e_receber is None:
+        raise NotFound("Conta a Pagar e receber")
+
+    confere_versao(conta_a_pagar_e_receber.versao, versao)
+
+    return conta_a_pagar_e_receber
+
+
+def atualiza_conta(db: Session, conta: ContaPagarReceber, **valores) -> ContaPagarReceber:
+    """UPDATE condicionado à versão lida, com o RETURNING no lugar do refresh.
+
+    No SQLite o FOR UPDATE não existe; se outra escrita passar entre a leitura e
+    o UPDATE, nenhuma linha é afetada e a requisição recebe 409.
+    """
+    conta_atualizada = db.scalars(
+        update(ContaPagarReceber)
+        .where(ContaPagarReceber.id == conta.id, ContaPagarReceber.versao == conta.versao)
+        .values(**valores, versao=ContaPagarReceber.versao + 1)
+        .returning(ContaPagarReceber)
+        .execution_options(populate_existing=True)
+    ).one_or_none()
+
+    if conta_atualizada is None:
+        raise versao_desatualizada()
+
+    return conta_atualizada
+
+
+def resposta_da_conta(
+    conta: ContaPagarReceber, fornecedor: dict | None
+) -> ContaPagarReceberResponse:
+    # O fornecedor vem do cache, sem carregar o relacionamento com outro SELECT
+    return ContaPagarReceberResponse(
+        id=conta.id,
+        descricao=conta.descricao,
+        valor=conta.valor,
+        tipo=conta.tipo,
+        data_previsao=conta.data_previsao,
+        data_baixa=conta.data_baixa,
+        valor_baixa=conta.valor_baixa,
+        esta_baixada=conta.esta_baixada,
+        versao=conta.versao,
+        fornecedor=fornecedor,
+    )
+
+
+def resposta_com_fornecedor_carregado(
+    conta: ContaPagarReceber, fornecedores: dict
+) -> ContaPagarReceberResponse:
+    fornecedor = fornecedores.get(conta.fornecedor_cliente_id)
+    if fornecedor is not None:
+        fornecedor = FornecedorClienteResponse.model_validate(fornecedor).model_dump()
+    return resposta_da_conta(conta, fornecedor)
+
+
+def fornecedor_da_conta(conta: ContaPagarReceber, db: Session) -> dict | None:
+    if conta.fornecedor_cliente_id is None:
+        return None
+
+    try:
+        return busca_fornecedor_cliente_em_cache(conta.fornecedor_cliente_id, db)
+    except NotFound:
+        # Mesmo resultado do relacionamento quando o fornecedor já foi excluído
+        return None
+
+
+def valida_fornecedor(fornecedor_cliente_id, db) -> dict | None:
+    if fornecedor_cliente_id is None:
+        return None
+
+    try:
+        return busca_fornecedor_cliente_em_cache(fornecedor_cliente_id, db)
+    except NotFound:
+        raise HTTPException(status_code=422, detail=MENSAGEM_FORNECEDOR_INEXISTENTE)
+
+
+@contextmanager
+def recusa_fornecedor_excluido(db: Session, fornecedor_cliente_id: int | None):
+    """Converte a violação da FK do fornecedor em 422.
+
+    Com o cache em memória, outro worker pode ter excluído o fornecedor que
+    valida_fornecedor ainda encontrou no cache deste processo.
+    """
+    try:
+        yield
+    except IntegrityError:
+        if fornecedor_cliente_id is None:
+            raise
+        db.rollback()
+        cache.invalida(chave_do_fornecedor_cliente(fornecedor_cliente_id))
+        raise HTTPException(status_code=422, detail=MENSAGEM_FORNECEDOR_INEXISTENTE)
+
+
+def carrega_fornecedores_das_contas(db: Session, contas) -> dict:
+    """Busca com um único IN os fornecedores das contas, indexados pelo id."""
+    ids_dos_fornecedores = {
+        conta.fornecedor_cliente_id
+        for conta in contas
+        if conta.fornecedor_cliente_id is not None
+    }
+
+    if not ids_dos_fornecedores:
+        return {}
+
+    return {
+        fornecedor.id: fornecedor
+        for fornecedor in db.scalars(
+            select(FornecedorCliente).where(
+                FornecedorCliente.id.in_(ids_dos_fornecedores)
             )
+        )
+    }
 
 
-def valida_se_pode_registrar_novas_contas(
-    conta_a_pagar_e_receber_request: ContaPagarReceberRequest, db: Session
-) -> None:
-    if (
-        recupera_numero_registros(
-            db,
-            conta_a_pagar_e_receber_request.data_previsao.year,
-            conta_a_pagar_e_receber_request.data_previsao.month,
+def garante_contador_do_mes(db: Session, ano: int, mes: int) -> None:
+    insert_com_conflito = insert_do_dialeto(db)
+    db.execute(
+        insert_com_conflito(QuantidadeContasPorMes)
+        .values(ano=ano, mes=mes, quantidade=0)
+        .on_conflict_do_nothing()
+    )
+
+
+def reserva_vaga_no_mes(db: Session, data_previsao: date) -> None:
+    ano, mes = data_previsao.year, data_previsao.month
+
+    garante_contador_do_mes(db, ano, mes)
+
+    # O UPDATE condicional trava a linha do mês até o commit, então
+    # requisições concorrentes (mesmo em outros workers) não passam do limite.
+    resultado = db.execute(
+        update(QuantidadeContasPorMes)
+        .where(QuantidadeContasPorMes.ano == ano)
+        .where(QuantidadeContasPorMes.mes == mes)
+        .where(QuantidadeContasPorMes.quantidade < QUANTIDADE_PERMITIDA_POR_MES)
+        .values(quantidade=QuantidadeContasPorMes.quantidade + 1)
+    )
+
+    if resultado.rowcount == 0:
+        raise HTTPException(status_code=422, detail=MENSAGEM_LIMITE_DO_MES)
+
+
+def reserva_vagas_no_mes(db: Session, ano: int, mes: int, quantidade: int) -> int:
+    """Reserva até ``quantidade`` vagas no mês e retorna quantas conseguiu."""
+    garante_contador_do_mes(db, ano, mes)
+
+    # FOR UPDATE segura a linha do mês até o commit (no SQLite a escrita já é serializada)
+    quantidade_atual = db.scalar(
+        select(QuantidadeContasPorMes.quantidade)
+        .where(QuantidadeContasPorMes.ano == ano)
+        .where(QuantidadeContasPorMes.mes == mes)
+        .with_for_update()
+    )
+    reservadas = max(0, min(quantidade, QUANTIDADE_PERMITIDA_POR_MES - quantidade_atual))
+
+    if reservadas == 0:
+        return 0
+
+    resultado = db.execute(
+        update(QuantidadeContasPorMes)
+        .where(QuantidadeContasPorMes.ano == ano)
+        .where(QuantidadeContasPorMes.mes == mes)
+        .where(
+            QuantidadeContasPorMes.quantidade + reservadas
+            <= QUANTIDADE_PERMITIDA_POR_MES
         )
-        >= QUANTIDADE_PERMITIDA_POR_MES
-    ):
-        raise HTTPException(
-            status_code=422, detail="Você não pode mais lançar contas para esse mês"
+        .values(quantidade=QuantidadeContasPorMes.quantidade + reservadas)
+    )
+
+    return reservadas if resultado.rowcount == 1 else 0
+
+
+def libera_vaga_no_mes(db: Session, data_previsao: date) -> None:
+    db.execute(
+        update(QuantidadeContasPorMes)
+        .where(QuantidadeContasPorMes.ano == data_previsao.year)
+        .where(QuantidadeContasPorMes.mes == data_previsao.month)
+        .where(QuantidadeContasPorMes.quantidade > 0)
+        .values(quantidade=QuantidadeContasPorMes.quantidade - 1)
+    )
+
+
+def aplica_filtros_de_contas(query, filtros: FiltroContas):
+    return query.filter(*condicoes_dos_filtros(filtros))
+
+
+def condicoes_dos_filtros(filtros: FiltroContas) -> list:
+    # Apenas comparações diretas com as colunas, para que os índices compostos
+    # de (coluna, data_previsao, id) possam ser usados em range scans.
+    condicoes = []
+    if filtros.tipo is not None:
+        condicoes.append(ContaPagarReceber.tipo == filtros.tipo.value)
+    if filtros.esta_baixada is not None:
+        condicoes.append(ContaPagarReceber.esta_baixada == filtros.esta_baixada)
+    if filtros.fornecedor_cliente_id is not None:
+        condicoes.append(
+            ContaPagarReceber.fornecedor_cliente_id == filtros.fornecedor_cliente_id
         )
+    if filtros.data_previsao_inicio is not None:
+        condicoes.append(ContaPagarReceber.data_previsao >= filtros.data_previsao_inicio)
+    if filtros.data_previsao_fim is not None:
+        condicoes.append(ContaPagarReceber.data_previsao <= filtros.data_previsao_fim)
+
+    return condicoes
 
 
-def recupera_numero_registros(db, ano, mes) -> int:
-    quantidade_de_registros = (
-        db.query(ContaPagarReceber)
-        .filter(extract("year", ContaPagarReceber.data_previsao) == ano)
-        .filter(extract("month", ContaPagarReceber.data_previsao) == mes)
-        .count()
+def pagina_de_contas(query, limit: int, cursor: str | None):
+    query = query.order_by(ContaPagarReceber.data_previsao, ContaPagarReceber.id)
+
+    if cursor is not None:
+        query = query.filter(condicao_do_cursor(cursor))
+
+    return query.limit(limit + 1)
+
+
+def condicao_do_cursor(cursor: str):
+    return tuple_(ContaPagarReceber.data_previsao, ContaPagarReceber.id) > tuple_(
+        *decodifica_cursor(cursor)
     )
 
-    return quantidade_de_registros
 
+def listar_contas_serializadas(
+    limit: int, cursor: str | None, filtros: FiltroContas, db: Session
+) -> Response:
+    consulta = pagina_de_contas(
+        aplica_filtros_de_contas(
+            select(*COLUNAS_LISTAGEM).outerjoin(ContaPagarReceber.fornecedor), filtros
+        ),
+        limit,
+        cursor,
+    )
+    linhas = db.execute(consulta).all()
+
+    headers = {}
+    if len(linhas) > limit:
+        linhas = linhas[:limit]
+        headers[CABECALHO_PROXIMO_CURSOR] = codifica_cursor(
+            linhas[-1].data_previsao, linhas[-1].id
+        )
 
-def recupera_numero_registros(db, ano, mes) -> int:
-    quantidade_de_registros = (
-        db.query(ContaPagarReceber)
-        .filter(extract("year", ContaPagarReceber.data_previsao) == ano)
-        .filter(extract("month", ContaPagarReceber.data_previsao) == mes)
-        .count()
+    return serializacao.resposta_json(
+        [conta_serializada(linha) for linha in linhas], headers=headers
     )
 
-    return quantidade_de_registros
 
+def conta_serializada(linha) -> dict:
+    # Mesmas chaves e ordem de ContaPagarReceberResponse
+    (
+        id,
+        descricao,
+        valor,
+        tipo,
+        data_previsao,
+        data_baixa,
+        valor_baixa,
+        esta_baixada,
+        versao,
+        fornecedor_id,
+        fornecedor_nome,
+        fornecedor_versao,
+    ) = linha
 
-def relatorio_gastos_previstos_por_mes_de_um_ano(db, ano) -> List[PrevisaoPorMes]:
-    contas = (
-        db.query(ContaPagarReceber)
-        .filter(extract("year", ContaPagarReceber.data_previsao) == ano)
-        .filter(ContaPagarReceber.tipo == ContaPagarReceberTipoEnum.PAGAR)
-        .order_by(ContaPagarReceber.data_previsao)
-        .all()
+    return {
+        "id": id,
+        "descricao": descricao,
+        "valor": valor,
+        "tipo": tipo,
+        "data_previsao": data_previsao,
+        "data_baixa": data_baixa,
+        "valor_baixa": valor_baixa,
+        "esta_baixada": esta_baixada,
+        "versao": versao,
+        "fornecedor": (
+            None
+            if fornecedor_id is None
+            else {"id": fornecedor_id, "nome": fornecedor_nome, "versao": fornecedor_versao}
+        ),
+    }
+
+
+def escapa_like(termo: str) -> str:
+    for caractere in (ESCAPE_DO_LIKE, "%", "_"):
+        termo = termo.replace(caractere, ESCAPE_DO_LIKE + caractere)
+    return termo
+
+
+def relevancia_da_busca(db: Session, q: str):
+    """Nota de 0 a 1 que ordena os resultados da busca.
+
+    No Postgres é a similaridade de trigramas (pg_trgm) com a descrição ou com
+    o nome do fornecedor, o que estiver mais próximo. Nos outros bancos,
+    termos no início da descrição ou do nome vêm antes dos encontrados no meio.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.greatest(
+            func.similarity(ContaPagarReceber.descricao, q),
+            func.coalesce(func.similarity(FornecedorCliente.nome, q), 0),
+        )
+
+    prefixo = f"{escapa_like(q)}%"
+    return case(
+        (
+            or_(
+                ContaPagarReceber.descricao.ilike(prefixo, escape=ESCAPE_DO_LIKE),
+                FornecedorCliente.nome.ilike(prefixo, escape=ESCAPE_DO_LIKE),
+            ),
+            literal(1.0),
+        ),
+        else_=literal(0.5),
     )
 
-    valor_por_mes = OrderedDict()
 
-    for conta in contas:
+def monta_consulta_exportacao(filtros: FiltroContas):
+    return aplica_filtros_de_contas(select(*COLUNAS_EXPORTACAO), filtros).order_by(
+        ContaPagarReceber.data_previsao, ContaPagarReceber.id
+    )
+
+
+def cabecalhos_exportacao(formato: FormatoExportacaoEnum) -> dict:
+    return {"Content-Disposition": f'attachment; filename="contas.{formato.value}"'}
+
+
+def gera_exportacao(bind, consulta, formato: FormatoExportacaoEnum):
+    with bind.connect() as conexao:
+        resultado = conexao.execution_options(
+            stream_results=True, yield_per=TAMANHO_LOTE_EXPORTACAO
+        ).execute(consulta)
+
+        if formato == FormatoExportacaoEnum.CSV:
+            yield formata_lote_csv([resultado.keys()])
+        for lote in resultado.partitions():
+            yield formata_lote_exportacao(lote, formato)
+
+
+def formata_lote_exportacao(lote, formato: FormatoExportacaoEnum) -> str:
+    if formato == FormatoExportacaoEnum.CSV:
+        return formata_lote_csv(lote)
+
+    return "".join(formata_linha_ndjson(linha) for linha in lote)
+
+
+def formata_lote_csv(linhas) -> str:
+    saida = io.StringIO()
+    csv.writer(saida, lineterminator="\n").writerows(linhas)
+    return saida.getvalue()
+
+
+def formata_linha_ndjson(linha) -> str:
+    registro = {}
+    for coluna, valor in linha._mapping.items():
+        if isinstance(valor, Decimal):
+            valor = float(valor)
+        elif isinstance(valor, date):
+            valor = valor.isoformat()
+        registro[coluna] = valor
+
+    return json.dumps(registro, ensure_ascii=False) + "\n"
 
-        mes = conta.data_previsao.month
 
-        if valor_por_mes.get(mes) is None:
-            valor_por_mes[mes] = 0
+def relatorio_gastos_previstos_por_mes_de_um_ano(db, ano) -> List[PrevisaoPorMes]:
+    # resumo_mensal é mantido a cada escrita, então lê no máximo 12 linhas
+    valor_por_mes = db.execute(
+        select(ResumoMensal.mes, ResumoMensal.valor_total)
+        .where(ResumoMensal.ano == ano)
+        .where(ResumoMensal.tipo == ContaPagarReceberTipoEnum.PAGAR.value)
+        .where(ResumoMensal.quantidade > 0)
+        .order_by(ResumoMensal.mes)
+    ).all()
+
+    return [
+        PrevisaoPorMes(mes=mes, valor_total=valor_total)
+        for mes, valor_total in valor_por_mes
+    ]
+
+
+def fluxo_de_caixa_por_periodo(
+    db: Session,
+    data_inicio: date,
+    data_fim: date,
+    granularidade: GranularidadeFluxoDeCaixaEnum,
+    saldo_inicial: Decimal,
+) -> List[PeriodoFluxoDeCaixa]:
+    # resumo_diario tem no máximo uma linha por dia e tipo, então a janela
+    # máxima lê poucos milhares de linhas, seja qual for o número de contas
+    if granularidade == GranularidadeFluxoDeCaixaEnum.SEMANA:
+        inicio = inicio_da_semana(db, ResumoDiario.data)
+        primeiro_periodo = data_inicio - timedelta(days=data_inicio.weekday())
+        passo = timedelta(weeks=1)
+    else:
+        inicio = ResumoDiario.data
+        primeiro_periodo = data_inicio
+        passo = timedelta(days=1)
+
+    entradas = soma_do_tipo(ContaPagarReceberTipoEnum.RECEBER)
+    saidas = soma_do_tipo(ContaPagarReceberTipoEnum.PAGAR)
+    colunas = [inicio.label("inicio"), entradas.label("entradas"), saidas.label("saidas")]
+
+    if db.get_bind().dialect.name == "postgresql":
+        colunas.append(
+            (
+                literal(saldo_inicial, Numeric)
+                + func.sum(entradas - saidas).over(order_by=inicio)
+            ).label("saldo_acumulado")
+        )
+
+    # A primeira semana só soma a partir de data_inicio, mas é rotulada pela segunda-feira
+    linhas = db.execute(
+        select(*colunas)
+        .where(ResumoDiario.data.between(data_inicio, data_fim))
+        .group_by(inicio)
+        .order_by(inicio)
+    ).all()
 
-        valor_por_mes[mes] += conta.valor
+    # Pelo número de períodos, sem somar um passo além de data_fim, que
+    # estouraria date.max no fim de 9999
+    quantidade_de_periodos = (data_fim - primeiro_periodo).days // passo.days + 1
+    periodos = [primeiro_periodo + passo * indice for indice in range(quantidade_de_periodos)]
 
-    return [PrevisaoPorMes(mes=k, valor_total=v) for k, v in valor_por_mes.items()]
+    return monta_fluxo_de_caixa(linhas, periodos, saldo_inicial)
 
-    # for k, g in groupby(contas, lambda x: x.data_previsao.month):
-    #     print({k: sum([v.valor for v in g])})
+
+def soma_do_tipo(tipo: ContaPagarReceberTipoEnum):
+    return func.coalesce(
+        func.sum(case((ResumoDiario.tipo == tipo.value, ResumoDiario.valor_total), else_=0)),
+        0,
+    )
+
+
+def monta_fluxo_de_caixa(linhas, periodos, saldo_inicial: Decimal) -> List[PeriodoFluxoDeCaixa]:
+    """Completa os períodos sem contas e junta o saldo acumulado de cada um."""
+    por_inicio = {linha.inicio: linha for linha in linhas}
+    zero = Decimal("0.00")
+    totais = [
+        (por_inicio[periodo].entradas, por_inicio[periodo].saidas)
+        if periodo in por_inicio
+        else (zero, zero)
+        for periodo in periodos
+    ]
+
+    if linhas and "saldo_acumulado" in linhas[0]._fields:
+        # Saldo da window function; um período vazio repete o saldo do anterior
+        saldos = []
+        saldo = saldo_inicial
+        for periodo in periodos:
+            if periodo in por_inicio:
+                saldo = por_inicio[periodo].saldo_acumulado
+            saldos.append(saldo)
+    else:
+        # No SQLite as somas saem como REAL; acumular os Decimal já arredondados
+        # de cada período evita que o erro de ponto flutuante cresça com a janela
+        saldos = list(
+            accumulate((entradas - saidas for entradas, saidas in totais), initial=saldo_inicial)
+        )[1:]
+
+    return [
+        PeriodoFluxoDeCaixa(
+            inicio=periodo,
+            entradas=entradas,
+            saidas=saidas,
+            saldo_do_periodo=entradas - saidas,
+            saldo_acumulado=saldo,
+        )
+        for periodo, (entradas, saidas), saldo in zip(periodos, totais, saldos)
+    ]
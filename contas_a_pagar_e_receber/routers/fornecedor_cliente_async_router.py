@@ -0,0 +1,71 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from contas_a_pagar_e_receber.routers import fornecedor_cliente_router
+from contas_a_pagar_e_receber.routers.fornecedor_cliente_router import (
+    FornecedorClienteRequest,
+    FornecedorClienteResponse,
+    OrdenacaoResumoEnum,
+    ResumoFornecedorClienteResponse,
+)
+from shared.assincrono import executa_em_sessao_sincrona
+from shared.dependencies import get_async_db
+from shared.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO
+
+router = APIRouter(prefix="/fornecedor-cliente")
+
+
+@router.get("", response_model=List[FornecedorClienteResponse])
+async def listar_fornecedor_cliente(request: Request, response: Response,
+                                    db: AsyncSession = Depends(get_async_db)) -> List[FornecedorClienteResponse]:
+    return await executa_em_sessao_sincrona(db, fornecedor_cliente_router.listar_fornecedor_cliente,
+                                            List[FornecedorClienteResponse],
+                                            request=request, response=response)
+
+@router.get("/resumo", response_model=List[ResumoFornecedorClienteResponse])
+async def resumir_fornecedores_clientes(response: Response,
+                                        ordenar_por: OrdenacaoResumoEnum = OrdenacaoResumoEnum.NOME,
+                                        limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+                                        cursor: str | None = None,
+                                        db: AsyncSession = Depends(get_async_db)) -> List[ResumoFornecedorClienteResponse]:
+    return await executa_em_sessao_sincrona(db, fornecedor_cliente_router.resumir_fornecedores_clientes,
+                                            List[ResumoFornecedorClienteResponse],
+                                            response=response, ordenar_por=ordenar_por,
+                                            limit=limit, cursor=cursor)
+
+@router.get("/{id_do_fornecedor_cliente}", response_model=FornecedorClienteResponse)
+async def obter_fornecedor_cliente_por_id(id_do_fornecedor_cliente: int,
+                                          db: AsyncSession = Depends(get_async_db)) -> FornecedorClienteResponse:
+    return await executa_em_sessao_sincrona(db, fornecedor_cliente_router.obter_fornecedor_cliente_por_id,
+                                            FornecedorClienteResponse,
+                                            id_do_fornecedor_cliente=id_do_fornecedor_cliente)
+
+@router.post("", response_model=FornecedorClienteResponse, status_code=201)
+async def criar_fornecedor_cliente(fornecedor_cliente_request: FornecedorClienteRequest,
+                                   db: AsyncSession = Depends(get_async_db)) -> FornecedorClienteResponse:
+    return await executa_em_sessao_sincrona(db, fornecedor_cliente_router.criar_fornecedor_cliente,
+                                            FornecedorClienteResponse,
+                                            fornecedor_cliente_request=fornecedor_cliente_request)
+
+
+@router.put("/{id_do_fornecedor_cliente}", response_model=FornecedorClienteResponse, status_code=200)
+async def atualizar_fornecedor_cliente(id_do_fornecedor_cliente: int,
+                                       fornecedor_cliente_request: FornecedorClienteRequest,
+                                       versao: int | None = Query(default=None, ge=1),
+                                       db: AsyncSession = Depends(get_async_db)) -> FornecedorClienteResponse:
+    return await executa_em_sessao_sincrona(db, fornecedor_cliente_router.atualizar_fornecedor_cliente,
+                                            FornecedorClienteResponse,
+                                            id_do_fornecedor_cliente=id_do_fornecedor_cliente,
+                                            fornecedor_cliente_request=fornecedor_cliente_request,
+                                            versao=versao)
+
+
+@router.delete("/{id_do_fornecedor_cliente}", status_code=204)
+async def excluir_fornecedor_cliente(id_do_fornecedor_cliente: int,
+                                     versao: int | None = Query(default=None, ge=1),
+                                     db: AsyncSession = Depends(get_async_db)) -> None:
+    await executa_em_sessao_sincrona(db, fornecedor_cliente_router.excluir_fornecedor_cliente,
+                                     id_do_fornecedor_cliente=id_do_fornecedor_cliente,
+                                     versao=versao)
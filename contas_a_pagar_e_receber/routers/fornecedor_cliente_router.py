@@ -1,12 +1,33 @@
+from decimal import Decimal
+from enum import Enum
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import and_, case, delete, func, insert, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (
+    ContaPagarReceber,
+)
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorCliente
-from shared.dependencies import get_db
+from shared.cache import cache
+from shared.concorrencia import condicoes_da_escrita, erro_da_escrita_condicional
+from shared.dependencies import get_db, get_read_db
+from shared.etag import (
+    assinatura_da_colecao,
+    calcula_etag,
+    etag_corresponde,
+    resposta_nao_modificada,
+)
 from shared.exeptions import NotFound
+from shared.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    LIMITE_MAXIMO,
+    LIMITE_PADRAO,
+    codifica_cursor_ordenado,
+    decodifica_cursor_ordenado,
+)
 
 router = APIRouter(prefix="/fornecedor-cliente")
 
@@ -14,6 +35,7 @@ router = APIRouter(prefix="/fornecedor-cliente")
 class FornecedorClienteResponse(BaseModel):
     id: int
     nome: str
+    versao: int
 
     model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
 
@@ -23,49 +45,153 @@ class FornecedorClienteRequest(BaseModel):
     nome: str = Field(min_length=3, max_length=255)
 
 
+class ResumoFornecedorClienteResponse(BaseModel):
+    id: int
+    nome: str
+    quantidade_a_pagar_em_aberto: int
+    valor_a_pagar_em_aberto: Decimal
+    quantidade_a_pagar_baixadas: int
+    valor_a_pagar_baixado: Decimal
+    quantidade_a_receber_em_aberto: int
+    valor_a_receber_em_aberto: Decimal
+    quantidade_a_receber_baixadas: int
+    valor_a_receber_baixado: Decimal
+    saldo_em_aberto: Decimal  # a receber - a pagar
+
+
+class OrdenacaoResumoEnum(str, Enum):
+    NOME = "nome"
+    A_PAGAR = "valor_a_pagar_em_aberto"
+    A_RECEBER = "valor_a_receber_em_aberto"
+    SALDO = "saldo_em_aberto"
+
+
 @router.get("", response_model=List[FornecedorClienteResponse])
-def listar_fornecedor_cliente(db: Session = Depends(get_db)) -> List[FornecedorClienteResponse]:
+def listar_fornecedor_cliente(request: Request, response: Response,
+                              db: Session = Depends(get_read_db)) -> List[FornecedorClienteResponse]:
+    etag = calcula_etag("fornecedores", *assinatura_da_colecao(db, FornecedorCliente))
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+
+    response.headers["ETag"] = etag
     return db.query(FornecedorCliente).all()
 
+@router.get("/resumo", response_model=List[ResumoFornecedorClienteResponse])
+def resumir_fornecedores_clientes(
+    response: Response,
+    ordenar_por: OrdenacaoResumoEnum = OrdenacaoResumoEnum.NOME,
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+) -> List[ResumoFornecedorClienteResponse]:
+    agregados = agregados_do_resumo()
+
+    # Um único LEFT JOIN ... GROUP BY; fornecedores sem contas saem zerados
+    consulta = (
+        select(
+            FornecedorCliente.id,
+            FornecedorCliente.nome,
+            *(expressao.label(nome) for nome, expressao in agregados.items()),
+        )
+        .outerjoin(
+            ContaPagarReceber,
+            ContaPagarReceber.fornecedor_cliente_id == FornecedorCliente.id,
+        )
+        .group_by(FornecedorCliente.id, FornecedorCliente.nome)
+        .limit(limit + 1)
+    )
+
+    if ordenar_por == OrdenacaoResumoEnum.NOME:
+        consulta = consulta.order_by(FornecedorCliente.nome, FornecedorCliente.id)
+        if cursor is not None:
+            consulta = consulta.where(
+                tuple_(FornecedorCliente.nome, FornecedorCliente.id)
+                > tuple_(*decodifica_cursor_ordenado(cursor))
+            )
+    else:
+        # Maiores valores primeiro. No SQLite as somas são REAL, então a chave é
+        # arredondada para que o valor do cursor compare igual ao da linha.
+        chave = func.round(agregados[ordenar_por.value], 2)
+        consulta = consulta.order_by(chave.desc(), FornecedorCliente.id)
+        if cursor is not None:
+            valor, id = decodifica_cursor_ordenado(cursor, Decimal)
+            consulta = consulta.having(
+                or_(chave < valor, and_(chave == valor, FornecedorCliente.id > id))
+            )
+
+    linhas = db.execute(consulta).all()
+
+    if len(linhas) > limit:
+        linhas = linhas[:limit]
+        ultima_linha = linhas[-1]._mapping
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codifica_cursor_ordenado(
+            ultima_linha[ordenar_por.value], ultima_linha["id"]
+        )
+
+    return [linha._mapping for linha in linhas]
+
+
 @router.get("/{id_do_fornecedor_cliente}", response_model=FornecedorClienteResponse)
 def obter_fornecedor_cliente_por_id(id_do_fornecedor_cliente: int,
                                     db: Session = Depends(get_db)) -> List[FornecedorClienteResponse]:
-    return busca_fornecedor_cliente_por_id(id_do_fornecedor_cliente, db)
+    return busca_fornecedor_cliente_em_cache(id_do_fornecedor_cliente, db)
 
 @router.post("", response_model=FornecedorClienteResponse, status_code=201)
 def criar_fornecedor_cliente(fornecedor_cliente_request: FornecedorClienteRequest,
                              db: Session = Depends(get_db)) -> FornecedorClienteResponse:
-    fornecedor_cliente = FornecedorCliente(
-        **fornecedor_cliente_request.model_dump()
-    )
+    # O RETURNING já traz id e versão, sem o refresh depois do commit
+    fornecedor_cliente = db.scalars(
+        insert(FornecedorCliente).returning(FornecedorCliente),
+        [fornecedor_cliente_request.model_dump()],
+    ).one()
 
-    db.add(fornecedor_cliente)
+    resposta = FornecedorClienteResponse.model_validate(fornecedor_cliente)
     db.commit()
-    db.refresh(fornecedor_cliente)
 
-    return fornecedor_cliente
+    return resposta
 
 
 @router.put("/{id_do_fornecedor_cliente}", response_model=FornecedorClienteResponse, status_code=200)
 def atualizar_fornecedor_cliente(id_do_fornecedor_cliente: int,
                                  fornecedor_cliente_request: FornecedorClienteRequest,
+                                 versao: int | None = Query(default=None, ge=1),
                                  db: Session = Depends(get_db)) -> FornecedorClienteResponse:
-    fornecedor_cliente = busca_fornecedor_cliente_por_id(id_do_fornecedor_cliente, db)
-    fornecedor_cliente.nome = fornecedor_cliente_request.nome
+    fornecedor_cliente = db.scalars(
+        update(FornecedorCliente)
+        .where(*condicoes_da_escrita(FornecedorCliente, id_do_fornecedor_cliente, versao))
+        .values(nome=fornecedor_cliente_request.nome, versao=FornecedorCliente.versao + 1)
+        .returning(FornecedorCliente)
+    ).one_or_none()
 
-    db.add(fornecedor_cliente)
+    if fornecedor_cliente is None:
+        raise erro_da_escrita_condicional(
+            db, FornecedorCliente, id_do_fornecedor_cliente, "Fornecedor Cliente"
+        )
+
+    resposta = FornecedorClienteResponse.model_validate(fornecedor_cliente)
     db.commit()
-    db.refresh(fornecedor_cliente)
-    return fornecedor_cliente
+    cache.invalida(chave_do_fornecedor_cliente(id_do_fornecedor_cliente))
+
+    return resposta
 
 
 @router.delete("/{id_do_fornecedor_cliente}", status_code=204)
 def excluir_fornecedor_cliente(id_do_fornecedor_cliente: int,
+                               versao: int | None = Query(default=None, ge=1),
                                db: Session = Depends(get_db)) -> None:
-    fornecedor_cliente = busca_fornecedor_cliente_por_id(id_do_fornecedor_cliente, db)
+    id_excluido = db.scalar(
+        delete(FornecedorCliente)
+        .where(*condicoes_da_escrita(FornecedorCliente, id_do_fornecedor_cliente, versao))
+        .returning(FornecedorCliente.id)
+    )
+
+    if id_excluido is None:
+        raise erro_da_escrita_condicional(
+            db, FornecedorCliente, id_do_fornecedor_cliente, "Fornecedor Cliente"
+        )
 
-    db.delete(fornecedor_cliente)
     db.commit()
+    cache.invalida(chave_do_fornecedor_cliente(id_do_fornecedor_cliente))
 
 
 def busca_fornecedor_cliente_por_id(id_do_fornecedor_cliente: int, db: Session) -> FornecedorCliente:
@@ -74,4 +200,46 @@ def busca_fornecedor_cliente_por_id(id_do_fornecedor_cliente: int, db: Session)
     if fornecedor_cliente is None:
         raise NotFound("Fornecedor Cliente")
 
-    return fornecedor_cliente
\ No newline at end of file
+    return fornecedor_cliente
+
+
+def agregados_do_resumo() -> dict:
+    agregados = {}
+
+    for tipo, sufixo in (("PAGAR", "a_pagar"), ("RECEBER", "a_receber")):
+        do_tipo = ContaPagarReceber.tipo == tipo
+        em_aberto = and_(do_tipo, ContaPagarReceber.esta_baixada.is_not(True))
+        baixada = and_(do_tipo, ContaPagarReceber.esta_baixada.is_(True))
+
+        agregados[f"quantidade_{sufixo}_em_aberto"] = conta_onde(em_aberto)
+        agregados[f"valor_{sufixo}_em_aberto"] = soma_onde(em_aberto, ContaPagarReceber.valor)
+        agregados[f"quantidade_{sufixo}_baixadas"] = conta_onde(baixada)
+        agregados[f"valor_{sufixo}_baixado"] = soma_onde(
+            baixada, ContaPagarReceber.valor_baixa
+        )
+
+    agregados["saldo_em_aberto"] = (
+        agregados["valor_a_receber_em_aberto"] - agregados["valor_a_pagar_em_aberto"]
+    )
+    return agregados
+
+
+def conta_onde(condicao):
+    return func.count(case((condicao, ContaPagarReceber.id)))
+
+
+def soma_onde(condicao, coluna):
+    return func.coalesce(func.sum(case((condicao, coluna))), 0)
+
+
+def chave_do_fornecedor_cliente(id_do_fornecedor_cliente: int) -> str:
+    return f"fornecedor_cliente:{id_do_fornecedor_cliente}"
+
+
+def busca_fornecedor_cliente_em_cache(id_do_fornecedor_cliente: int, db: Session) -> dict:
+    return cache.obtem_ou_carrega(
+        chave_do_fornecedor_cliente(id_do_fornecedor_cliente),
+        lambda: FornecedorClienteResponse.model_validate(
+            busca_fornecedor_cliente_por_id(id_do_fornecedor_cliente, db)
+        ).model_dump(),
+    )
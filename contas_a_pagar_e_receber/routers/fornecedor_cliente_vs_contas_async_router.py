@@ -0,0 +1,39 @@
+from typing import List
+
+from fastapi import Depends, APIRouter, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from contas_a_pagar_e_receber.routers import fornecedor_cliente_vs_contas_router
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import (
+    ContaPagarReceberResponse,
+    FiltroContasDoFornecedor,
+)
+from shared.assincrono import executa_em_sessao_sincrona
+from shared.dependencies import get_async_db
+from shared.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO
+
+router = APIRouter(prefix="/fornecedor-cliente")
+
+
+@router.get(
+    "/{id_do_fornecedor_cliente}/contas-a-pagar-e-receber",
+    response_model=List[ContaPagarReceberResponse],
+)
+async def obter_contas_de_um_fornecedor_cliente_por_id(
+    id_do_fornecedor_cliente: int,
+    response: Response,
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    filtros: FiltroContasDoFornecedor = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ContaPagarReceberResponse]:
+    return await executa_em_sessao_sincrona(
+        db,
+        fornecedor_cliente_vs_contas_router.obter_contas_de_um_fornecedor_cliente_por_id,
+        List[ContaPagarReceberResponse],
+        id_do_fornecedor_cliente=id_do_fornecedor_cliente,
+        response=response,
+        limit=limit,
+        cursor=cursor,
+        filtros=filtros,
+    )
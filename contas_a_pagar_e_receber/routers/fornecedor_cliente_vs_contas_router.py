@@ -1,16 +1,28 @@
 from typing import List
 
-from fastapi import Depends, APIRouter, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import Depends, APIRouter, HTTPException, Query, Response
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, contains_eager
 
 from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (
     ContaPagarReceber,
 )
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorCliente
 from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import (
+    MENSAGEM_FORNECEDOR_INEXISTENTE,
     ContaPagarReceberResponse,
+    FiltroContas,
+    FiltroContasDoFornecedor,
+    condicao_do_cursor,
+    condicoes_dos_filtros,
+)
+from shared.dependencies import get_read_db
+from shared.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    LIMITE_MAXIMO,
+    LIMITE_PADRAO,
+    codifica_cursor,
 )
-from shared.dependencies import get_db
 
 router = APIRouter(prefix="/fornecedor-cliente")
 
@@ -20,18 +32,42 @@ router = APIRouter(prefix="/fornecedor-cliente")
     response_model=List[ContaPagarReceberResponse],
 )
 def obter_contas_de_um_fornecedor_cliente_por_id(
-    id_do_fornecedor_cliente: int, db: Session = Depends(get_db)
+    id_do_fornecedor_cliente: int,
+    response: Response,
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = None,
+    filtros: FiltroContasDoFornecedor = Depends(),
+    db: Session = Depends(get_read_db),
 ) -> List[ContaPagarReceberResponse]:
+    condicoes = condicoes_dos_filtros(
+        FiltroContas(**filtros.model_dump(), fornecedor_cliente_id=id_do_fornecedor_cliente)
+    )
+    if cursor is not None:
+        condicoes.append(condicao_do_cursor(cursor))
+
+    # O fornecedor é a linha sentinela: com os filtros no ON do LEFT JOIN, um
+    # fornecedor sem contas na página ainda volta uma vez, com a conta nula, e
+    # um fornecedor inexistente não volta nenhuma linha. A mesma query prova
+    # que ele existe, preenche conta.fornecedor e lê a página pelo índice
+    # (fornecedor_cliente_id, data_previsao, id).
+    linhas = db.execute(
+        select(FornecedorCliente, ContaPagarReceber)
+        .outerjoin(ContaPagarReceber, and_(*condicoes))
+        .where(FornecedorCliente.id == id_do_fornecedor_cliente)
+        .options(contains_eager(ContaPagarReceber.fornecedor))
+        .order_by(ContaPagarReceber.data_previsao, ContaPagarReceber.id)
+        .limit(limit + 1)
+    ).all()
 
-    test_none = db.get(FornecedorCliente, id_do_fornecedor_cliente)
-    if test_none is None:
-        raise HTTPException(
-            status_code=422, detail="Esse fornecedor não existe no banco de dados"
+    if not linhas:
+        raise HTTPException(status_code=422, detail=MENSAGEM_FORNECEDOR_INEXISTENTE)
+
+    contas = [conta for _, conta in linhas if conta is not None]
+
+    if len(contas) > limit:
+        contas = contas[:limit]
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codifica_cursor(
+            contas[-1].data_previsao, contas[-1].id
         )
 
-    resposta_db = (
-        db.query(ContaPagarReceber)
-        .filter_by(fornecedor_cliente_id=id_do_fornecedor_cliente)
-        .all()
-    )
-    return resposta_db
+    return contas
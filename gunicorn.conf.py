@@ -0,0 +1,48 @@
+"""Configuração do gunicorn para produção com vários workers uvicorn.
+
+    gunicorn main:app -c gunicorn.conf.py
+
+Cada worker é um processo com o próprio event loop e o próprio pool de
+conexões: o engine é criado no lifespan de cada worker, e engines herdados
+por fork são descartados em shared.database.descarta_engines_apos_fork.
+
+Também é de cada processo: /metrics, os buffers de diagnóstico e o cache em
+memória dos fornecedores. Esse cache só é invalidado no worker que recebeu a
+escrita, então os outros podem devolver um fornecedor alterado ou excluído até
+CACHE_TTL_SEGUNDOS depois. Com mais de um worker, use CACHE_REDIS_URL.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '80')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# WEB_CONCURRENCY é a convenção lida também por `uvicorn --workers`
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Recicla o worker depois de N requisições para conter o crescimento de
+# memória; o jitter evita que todos reiniciem ao mesmo tempo. 0 desativa.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(
+    os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10))
+)
+
+# Tempo para terminar as requisições em andamento ao reciclar ou desligar
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Importa a aplicação uma vez no master e compartilha as páginas com os workers
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG")
+
+
+def on_starting(server):
+    if workers > 1 and not os.getenv("CACHE_REDIS_URL"):
+        server.log.warning(
+            "%s workers com o cache em memória: fornecedores alterados ou excluídos "
+            "podem aparecer em outros workers por até CACHE_TTL_SEGUNDOS; "
+            "defina CACHE_REDIS_URL",
+            workers,
+        )
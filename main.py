@@ -1,34 +1,91 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
+from anyio.to_thread import current_default_thread_limiter, run_sync
 from fastapi import FastAPI
+from sqlalchemy.engine import Engine
 
 from contas_a_pagar_e_receber.routers import (
+    contas_a_pagar_e_receber_async_router,
     contas_a_pagar_e_receber_router,
+    fornecedor_cliente_async_router,
     fornecedor_cliente_router,
+    fornecedor_cliente_vs_contas_async_router,
     fornecedor_cliente_vs_contas_router,
 )
+from shared import database, diagnostico_router, metricas_router
 from shared.exeptions import NotFound
 from shared.exeptions_handler import not_found_exception_handler
-
-app = FastAPI()
-
-app = FastAPI(swagger_ui_parameters={"syntaxHighlight.theme": "obsidian"})
+from shared.metricas_requisicoes import MiddlewareDeMetricas, metricas_requisicoes
+from shared.replica import MiddlewareLeiaSuasEscritas
 
 tags_metadata = [
     {"name": "Contas", "description": "Contas para pagar ou receber"},
-    {"name": "Fornecedor", "description": "Fornecedor/cliente"}
+    {"name": "Fornecedor", "description": "Fornecedor/cliente"},
+    {"name": "Diagnóstico", "description": "Métricas internas da aplicação"},
 ]
 
-app = FastAPI(openapi_tags=tags_metadata)
 
-@app.get("/")
-def hello_world() -> str:
-    return {"Hello": "World"}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if database.THREAD_LIMITER_TOKENS:
+        current_default_thread_limiter().total_tokens = int(
+            database.THREAD_LIMITER_TOKENS
+        )
+
+    # Engine e pool ficam prontos antes da primeira requisição
+    if database.modo_assincrono():
+        if database.SQLALCHEMY_POOL_WARMUP:
+            await database.aquece_pool_assincrono(database.SQLALCHEMY_POOL_WARMUP)
+        else:
+            database.obtem_async_engine()
+    elif database.SQLALCHEMY_POOL_WARMUP:
+        await run_sync(database.aquece_pool, database.SQLALCHEMY_POOL_WARMUP)
+    else:
+        database.obtem_engine()
+
+    # O schema fica em app.openapi_schema, então /docs não paga para montá-lo
+    app.openapi()
+
+    yield
+
+    await database.descarta_engines()
+
+
+def cria_app() -> FastAPI:
+    app = FastAPI(
+        openapi_tags=tags_metadata,
+        lifespan=lifespan,
+        swagger_ui_parameters={"syntaxHighlight.theme": "obsidian"},
+    )
+
+    @app.get("/")
+    def hello_world() -> str:
+        return {"Hello": "World"}
+
+    # Com SQLALCHEMY_ASYNC_DATABASE_URL configurada os handlers async são usados
+    if database.modo_assincrono():
+        app.include_router(contas_a_pagar_e_receber_async_router.router,tags=['Contas'])
+        app.include_router(fornecedor_cliente_async_router.router,tags=["Fornecedor"])
+        app.include_router(fornecedor_cliente_vs_contas_async_router.router,tags=["Fornecedor"])
+    else:
+        app.include_router(contas_a_pagar_e_receber_router.router,tags=['Contas'])
+        app.include_router(fornecedor_cliente_router.router,tags=["Fornecedor"])
+        app.include_router(fornecedor_cliente_vs_contas_router.router,tags=["Fornecedor"])
+    app.include_router(diagnostico_router.router,tags=["Diagnóstico"])
+    app.include_router(metricas_router.router,tags=["Diagnóstico"])
+    app.add_exception_handler(NotFound, not_found_exception_handler)
+
+    # Escuta todos os engines, inclusive o sync_engine por trás do modo assíncrono
+    metricas_requisicoes.escuta(Engine)
+    if database.replica_configurada():
+        app.add_middleware(MiddlewareLeiaSuasEscritas)
+    app.add_middleware(MiddlewareDeMetricas)
+
+    return app
 
 
-app.include_router(contas_a_pagar_e_receber_router.router,tags=['Contas'])
-app.include_router(fornecedor_cliente_router.router,tags=["Fornecedor"])
-app.include_router(fornecedor_cliente_vs_contas_router.router,tags=["Fornecedor"])
-app.add_exception_handler(NotFound, not_found_exception_handler)
+app = cria_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def executa_em_sessao_sincrona(db: AsyncSession, funcao, resposta=None, **kwargs):
+    """Executa um handler síncrono com a Session por trás da AsyncSession.
+
+    O I/O passa pelo driver assíncrono, então o event loop não fica bloqueado.
+    Quando ``resposta`` é informado, o resultado já é convertido dentro da
+    sessão, evitando lazy loads fora do greenlet durante a serialização.
+    """
+
+    def executa(sessao):
+        resultado = funcao(db=sessao, **kwargs)
+
+        if resposta is None or isinstance(resultado, Response):
+            return resultado
+
+        return TypeAdapter(resposta).validate_python(resultado, from_attributes=True)
+
+    return await db.run_sync(executa)
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEmMemoria:
+    """Backend LRU com TTL, local ao processo.
+
+    Só serve para um processo: com vários workers, a invalidação feita por um
+    deles não chega aos outros. Nesse caso use CacheRedis (CACHE_REDIS_URL).
+    """
+
+    def __init__(self, max_itens: int = 1024):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: str) -> str | None:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+
+            valor, expira_em = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return None
+
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave: str, valor: str, ttl: int) -> None:
+        with self._lock:
+            self._itens[chave] = (valor, time.monotonic() + ttl)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def delete(self, chave: str) -> None:
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+
+class CacheRedis:
+    """Backend para qualquer cliente compatível com o redis-py (get/set/delete)."""
+
+    def __init__(self, cliente, prefixo: str = "contas:"):
+        self.cliente = cliente
+        self.prefixo = prefixo
+
+    def get(self, chave: str) -> str | None:
+        valor = self.cliente.get(self.prefixo + chave)
+        if isinstance(valor, bytes):
+            return valor.decode()
+        return valor
+
+    def set(self, chave: str, valor: str, ttl: int) -> None:
+        self.cliente.set(self.prefixo + chave, valor, ex=ttl)
+
+    def delete(self, chave: str) -> None:
+        self.cliente.delete(self.prefixo + chave)
+
+    def clear(self) -> None:
+        for chave in self.cliente.scan_iter(match=self.prefixo + "*"):
+            self.cliente.delete(chave)
+
+
+class Cache:
+    """Cache read-through com contadores de acerto e falha.
+
+    Os valores são guardados como JSON, para que os dois backends se comportem
+    da mesma forma.
+    """
+
+    def __init__(self, backend, ttl: int = 60):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obtem(self, chave: str):
+        valor = self.backend.get(chave)
+
+        with self._lock:
+            if valor is None:
+                self.falhas += 1
+            else:
+                self.acertos += 1
+
+        return None if valor is None else json.loads(valor)
+
+    def define(self, chave: str, valor) -> None:
+        self.backend.set(chave, json.dumps(valor), self.ttl)
+
+    def obtem_ou_carrega(self, chave: str, carregador):
+        valor = self.obtem(chave)
+
+        if valor is None:
+            valor = carregador()
+            self.define(chave, valor)
+
+        return valor
+
+    def invalida(self, chave: str) -> None:
+        self.backend.delete(chave)
+
+    def limpa(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            self.acertos = 0
+            self.falhas = 0
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "backend": type(self.backend).__name__,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_de_acerto": round(self.acertos / total, 4) if total else 0.0,
+            }
+
+
+def cria_cache() -> Cache:
+    ttl = int(os.getenv("CACHE_TTL_SEGUNDOS", "60"))
+    redis_url = os.getenv("CACHE_REDIS_URL")
+
+    if redis_url:
+        # Dependência opcional, só necessária com o backend Redis
+        import redis
+
+        return Cache(CacheRedis(redis.Redis.from_url(redis_url)), ttl=ttl)
+
+    max_itens = int(os.getenv("CACHE_MAX_ITENS", "1024"))
+    return Cache(CacheEmMemoria(max_itens=max_itens), ttl=ttl)
+
+
+cache = cria_cache()
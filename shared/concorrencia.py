@@ -0,0 +1,33 @@
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from shared.exeptions import NotFound
+
+MENSAGEM_VERSAO_DESATUALIZADA = (
+    "O registro foi alterado por outra requisição; leia a versão atual e tente de novo"
+)
+
+
+def versao_desatualizada() -> HTTPException:
+    return HTTPException(status_code=409, detail=MENSAGEM_VERSAO_DESATUALIZADA)
+
+
+def confere_versao(versao_atual: int, versao_esperada: int | None) -> None:
+    """Sem ``versao_esperada`` o cliente aceita gravar sobre qualquer versão."""
+    if versao_esperada is not None and versao_atual != versao_esperada:
+        raise versao_desatualizada()
+
+
+def condicoes_da_escrita(modelo, id: int, versao: int | None) -> list:
+    condicoes = [modelo.id == id]
+    if versao is not None:
+        condicoes.append(modelo.versao == versao)
+    return condicoes
+
+
+def erro_da_escrita_condicional(db: Session, modelo, id: int, nome: str) -> Exception:
+    # Só roda quando o UPDATE/DELETE condicional não afetou nenhuma linha
+    if db.scalar(select(modelo.id).where(modelo.id == id)) is None:
+        return NotFound(nome)
+    return versao_desatualizada()
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from shared.datas import agora
+from shared.metricas_requisicoes import requisicao_atual
+
+logger = logging.getLogger("consultas_lentas")
+
+# Tipos que não carregam dado de cliente; textos e binários são omitidos
+TIPOS_SEM_REDACAO = (bool, int, float, Decimal, date, datetime, type(None))
+MAXIMO_PARAMETROS_EXECUTEMANY = 3
+COMANDOS_COM_PLANO = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class RegistroDeConsultasLentas:
+    """Guarda as consultas que passaram do limite num buffer circular.
+
+    Cada amostra leva o SQL, os parâmetros com textos omitidos, a rota da
+    requisição e, no Postgres, o plano do EXPLAIN (sem ANALYZE, então a
+    consulta não roda de novo).
+    """
+
+    def __init__(self, limite_ms: float = 500, max_amostras: int = 100):
+        self.limite_ms = limite_ms
+        self._lock = threading.Lock()
+        self._amostras = deque(maxlen=max_amostras)
+        self._engines = []
+        # Guardados uma vez, para que event.remove encontre os mesmos objetos
+        self._antes = self.antes_da_query
+        self._depois = self.depois_da_query
+
+    @property
+    def ativo(self) -> bool:
+        return bool(self._engines)
+
+    def configura(self, limite_ms: float, max_amostras: int) -> None:
+        with self._lock:
+            self.limite_ms = limite_ms
+            self._amostras = deque(self._amostras, maxlen=max_amostras)
+
+    def escuta(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._antes)
+        event.listen(engine, "after_cursor_execute", self._depois)
+        self._engines.append(engine)
+
+    def deixa_de_escutar(self, engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._antes)
+        event.remove(engine, "after_cursor_execute", self._depois)
+        self._engines.remove(engine)
+
+    def antes_da_query(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["inicio_consulta_lenta"] = time.perf_counter()
+
+    def depois_da_query(self, conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info.pop("inicio_consulta_lenta", None)
+        if inicio is None:
+            return
+
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if duracao_ms < self.limite_ms:
+            return
+
+        consumo = requisicao_atual.get()
+        amostra = {
+            "registrada_em": agora().isoformat(),
+            "duracao_ms": round(duracao_ms, 3),
+            "rota": consumo.rota if consumo is not None else None,
+            "sql": statement,
+            "parametros": redige_parametros(parameters, executemany),
+            "plano": None,
+        }
+        if (
+            conn.dialect.name == "postgresql"
+            and not executemany
+            and statement.lstrip().upper().startswith(COMANDOS_COM_PLANO)
+        ):
+            amostra["plano"] = explica(cursor, statement, parameters)
+
+        logger.warning(
+            "Consulta lenta (%.1f ms) em %s: %s %s",
+            duracao_ms,
+            amostra["rota"],
+            statement,
+            amostra["parametros"],
+        )
+        with self._lock:
+            self._amostras.append(amostra)
+
+    def amostras(self) -> list:
+        with self._lock:
+            return list(reversed(self._amostras))
+
+    def limpa(self) -> None:
+        with self._lock:
+            self._amostras.clear()
+
+    def resumo(self) -> dict:
+        return {
+            "ativo": self.ativo,
+            "limite_ms": self.limite_ms,
+            "max_amostras": self._amostras.maxlen,
+            "amostras": self.amostras(),
+        }
+
+
+consultas_lentas = RegistroDeConsultasLentas()
+
+
+def redige_valor(valor):
+    if isinstance(valor, TIPOS_SEM_REDACAO):
+        return valor if isinstance(valor, (bool, int, float, type(None))) else str(valor)
+    if isinstance(valor, (str, bytes)):
+        return f"<{type(valor).__name__} len={len(valor)}>"
+    return f"<{type(valor).__name__}>"
+
+
+def redige_parametros(parametros, executemany: bool = False):
+    if executemany:
+        # Só as primeiras linhas, o suficiente para reconhecer o lote
+        return {
+            "linhas": len(parametros),
+            "amostra": [
+                redige_parametros(linha)
+                for linha in list(parametros)[:MAXIMO_PARAMETROS_EXECUTEMANY]
+            ],
+        }
+    if isinstance(parametros, dict):
+        return {chave: redige_valor(valor) for chave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [redige_valor(valor) for valor in parametros]
+    return redige_valor(parametros)
+
+
+def explica(cursor, statement: str, parameters) -> str:
+    # Cursor novo na mesma conexão DBAPI, sem passar de novo pelos eventos. O
+    # savepoint impede que um EXPLAIN com erro aborte a transação da requisição.
+    cursor_explain = cursor.connection.cursor()
+    try:
+        cursor_explain.execute("SAVEPOINT consulta_lenta")
+        try:
+            cursor_explain.execute(f"EXPLAIN (ANALYZE off) {statement}", parameters)
+            plano = "\n".join(linha[0] for linha in cursor_explain.fetchall())
+        except Exception as erro:
+            cursor_explain.execute("ROLLBACK TO SAVEPOINT consulta_lenta")
+            plano = f"EXPLAIN falhou: {erro}"
+        cursor_explain.execute("RELEASE SAVEPOINT consulta_lenta")
+        return plano
+    except Exception as erro:
+        return f"EXPLAIN falhou: {erro}"
+    finally:
+        cursor_explain.close()
@@ -1,16 +1,266 @@
 
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import DDL, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from shared.consultas_lentas import consultas_lentas
+from shared.metricas_pool import (
+    AsyncAdaptedQueuePoolComMetricas,
+    QueuePoolComMetricas,
+    metricas_pool,
+)
+
+
+SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
+
+# Réplica de leitura opcional, usada pelas rotas que dependem de get_read_db
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("SQLALCHEMY_READ_DATABASE_URL")
+
+# Depois de uma escrita, o mesmo cliente lê do primário por esse tempo
+SQLALCHEMY_READ_YOUR_WRITES_SEGUNDOS = int(
+    os.getenv("SQLALCHEMY_READ_YOUR_WRITES_SEGUNDOS", "5")
+)
+
+# Quanto tempo as leituras ficam no primário depois de uma falha da réplica
+SQLALCHEMY_READ_RETRY_SEGUNDOS = int(os.getenv("SQLALCHEMY_READ_RETRY_SEGUNDOS", "30"))
+
+# Modo assíncrono opcional, ex.: postgresql+asyncpg://... ou sqlite+aiosqlite:///...
+SQLALCHEMY_ASYNC_DATABASE_URL = os.getenv("SQLALCHEMY_ASYNC_DATABASE_URL")
+
+# Quantidade de threads em que os handlers síncronos rodam (padrão do anyio: 40)
+THREAD_LIMITER_TOKENS = os.getenv("THREAD_LIMITER_TOKENS")
+
+# Diagnóstico opcional: registra consultas acima desse tempo (em ms)
+SQLALCHEMY_SLOW_QUERY_MS = os.getenv("SQLALCHEMY_SLOW_QUERY_MS")
+SQLALCHEMY_SLOW_QUERY_SAMPLES = int(os.getenv("SQLALCHEMY_SLOW_QUERY_SAMPLES", "100"))
+
+# Conexões abertas no startup, antes da primeira requisição
+SQLALCHEMY_POOL_WARMUP = int(os.getenv("SQLALCHEMY_POOL_WARMUP", "0"))
+
+if SQLALCHEMY_SLOW_QUERY_MS:
+    consultas_lentas.configura(
+        float(SQLALCHEMY_SLOW_QUERY_MS), SQLALCHEMY_SLOW_QUERY_SAMPLES
+    )
+
+
+def configuracao_do_pool(url: str) -> dict:
+    """Monta os argumentos do pool a partir das variáveis de ambiente.
+
+    Só repassa o que foi configurado, mantendo os padrões do SQLAlchemy.
+    """
+    configuracao = {}
+
+    for variavel, argumento in [
+        ("SQLALCHEMY_POOL_SIZE", "pool_size"),
+        ("SQLALCHEMY_MAX_OVERFLOW", "max_overflow"),
+        ("SQLALCHEMY_POOL_TIMEOUT", "pool_timeout"),
+        ("SQLALCHEMY_POOL_RECYCLE", "pool_recycle"),
+    ]:
+        valor = os.getenv(variavel)
+        if valor:
+            configuracao[argumento] = int(valor)
+
+    pool_pre_ping = os.getenv("SQLALCHEMY_POOL_PRE_PING")
+    if pool_pre_ping:
+        configuracao["pool_pre_ping"] = pool_pre_ping.lower() in ("1", "true", "yes")
+
+    url = make_url(url)
+    classe_do_pool = url.get_dialect().get_pool_class(url)
+    if issubclass(classe_do_pool, AsyncAdaptedQueuePool):
+        configuracao["poolclass"] = AsyncAdaptedQueuePoolComMetricas
+    elif issubclass(classe_do_pool, QueuePool):
+        configuracao["poolclass"] = QueuePoolComMetricas
+
+    return configuracao
+
+
+_lock = threading.Lock()
+_engine = None
+_session_local = None
+_async_engine = None
+_async_session_local = None
+_engine_de_leitura = None
+_session_local_de_leitura = None
+_replica_indisponivel_ate = 0.0
+
+
+def obtem_engine():
+    """Cria o engine na primeira chamada, e não no import do módulo.
+
+    Assim Alembic, scripts e testes que só precisam dos models não pagam pela
+    criação do engine, e a URL não aparece em nenhuma saída.
+    """
+    global _engine, _session_local
+
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                if not SQLALCHEMY_DATABASE_URL:
+                    raise RuntimeError("SQLALCHEMY_DATABASE_URL não está configurada")
+
+                engine = create_engine(
+                    SQLALCHEMY_DATABASE_URL,
+                    **configuracao_do_pool(SQLALCHEMY_DATABASE_URL),
+                )
+                metricas_pool.escuta(engine)
+                if SQLALCHEMY_SLOW_QUERY_MS:
+                    consultas_lentas.escuta(engine)
+
+                _session_local = sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine
+                )
+                _engine = engine
+
+    return _engine
+
+
+def obtem_sessionmaker():
+    obtem_engine()
+    return _session_local
+
 
+def replica_configurada() -> bool:
+    return bool(SQLALCHEMY_READ_DATABASE_URL)
 
-SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL", "fallback_connection_string")
 
-print("SQLALCHEMY_DATABASE_URL:", SQLALCHEMY_DATABASE_URL)
+def obtem_sessionmaker_de_leitura():
+    """Sessões na réplica, ou None sem réplica ou enquanto ela estiver fora."""
+    global _engine_de_leitura, _session_local_de_leitura
 
+    if not replica_configurada() or time.monotonic() < _replica_indisponivel_ate:
+        return None
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    if _engine_de_leitura is None:
+        with _lock:
+            if _engine_de_leitura is None:
+                # As métricas de espera do pool são só do primário
+                configuracao = configuracao_do_pool(SQLALCHEMY_READ_DATABASE_URL)
+                configuracao.pop("poolclass", None)
+                engine = create_engine(SQLALCHEMY_READ_DATABASE_URL, **configuracao)
+                if SQLALCHEMY_SLOW_QUERY_MS:
+                    consultas_lentas.escuta(engine)
+
+                _session_local_de_leitura = sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine
+                )
+                _engine_de_leitura = engine
+
+    return _session_local_de_leitura
+
+
+def marca_replica_indisponivel() -> None:
+    global _replica_indisponivel_ate
+
+    _replica_indisponivel_ate = time.monotonic() + SQLALCHEMY_READ_RETRY_SEGUNDOS
+
+
+def modo_assincrono() -> bool:
+    return bool(SQLALCHEMY_ASYNC_DATABASE_URL)
+
+
+def obtem_async_engine():
+    global _async_engine, _async_session_local
+
+    if not modo_assincrono():
+        return None
+
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                # Importado só no modo assíncrono
+                from sqlalchemy.ext.asyncio import (
+                    async_sessionmaker,
+                    create_async_engine,
+                )
+
+                async_engine = create_async_engine(
+                    SQLALCHEMY_ASYNC_DATABASE_URL,
+                    **configuracao_do_pool(SQLALCHEMY_ASYNC_DATABASE_URL),
+                )
+                metricas_pool.escuta(async_engine.sync_engine)
+                if SQLALCHEMY_SLOW_QUERY_MS:
+                    consultas_lentas.escuta(async_engine.sync_engine)
+
+                _async_session_local = async_sessionmaker(
+                    autoflush=False, bind=async_engine
+                )
+                _async_engine = async_engine
+
+    return _async_engine
+
+
+def obtem_async_sessionmaker():
+    if obtem_async_engine() is None:
+        return None
+    return _async_session_local
+
+
+def aquece_pool(quantidade: int) -> None:
+    # Abre as conexões juntas, para que o pool fique com todas ociosas
+    engine = obtem_engine()
+    conexoes = [engine.connect() for _ in range(quantidade)]
+    for conexao in conexoes:
+        conexao.close()
+
+
+async def aquece_pool_assincrono(quantidade: int) -> None:
+    async_engine = obtem_async_engine()
+    conexoes = [await async_engine.connect() for _ in range(quantidade)]
+    for conexao in conexoes:
+        await conexao.close()
+
+
+async def descarta_engines() -> None:
+    global _engine, _session_local, _async_engine, _async_session_local
+    global _engine_de_leitura, _session_local_de_leitura, _replica_indisponivel_ate
+
+    with _lock:
+        engine, async_engine = _engine, _async_engine
+        engine_de_leitura = _engine_de_leitura
+        _engine = _session_local = _async_engine = _async_session_local = None
+        _engine_de_leitura = _session_local_de_leitura = None
+        _replica_indisponivel_ate = 0.0
+
+    if engine is not None:
+        engine.dispose()
+    if engine_de_leitura is not None:
+        engine_de_leitura.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def descarta_engines_apos_fork() -> None:
+    """Descarta no processo filho as conexões herdadas do processo pai.
+
+    dispose(close=False) troca o pool por um novo sem fechar os sockets, que
+    continuam sendo do pai. O lock também é recriado, porque pode ter sido
+    copiado adquirido por outra thread do pai.
+    """
+    global _lock
+
+    _lock = threading.Lock()
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _engine_de_leitura is not None:
+        _engine_de_leitura.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
+# Vale para o preload do gunicorn e para qualquer outro fork depois do import
+os.register_at_fork(after_in_child=descarta_engines_apos_fork)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+# Os índices trigram da busca dependem da extensão, criada antes das tabelas
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
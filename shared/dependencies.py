@@ -1,8 +1,60 @@
-from shared.database import  SessionLocal
+from fastapi import Depends, Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from shared import database
+from shared.replica import ler_do_primario
+
 
 def get_db():
-    db = SessionLocal()
+    db = database.obtem_sessionmaker()()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Sessão para rotas só de leitura: réplica quando possível, senão primário.
+
+    A sessão do primário vem de get_db e só abre conexão se for usada, então
+    não custa nada quando a leitura vai para a réplica.
+    """
+    db_de_leitura = abre_sessao_na_replica(request)
+    if db_de_leitura is None:
+        yield db
+        return
+
+    try:
+        yield db_de_leitura
+    finally:
+        db_de_leitura.close()
+
+
+def abre_sessao_na_replica(request: Request) -> Session | None:
+    if ler_do_primario(request):
+        return None
+
+    session_local = database.obtem_sessionmaker_de_leitura()
+    if session_local is None:
+        return None
+
+    db = session_local()
+    try:
+        # Conecta já aqui para que uma réplica fora do ar caia no primário
+        db.connection()
+    except DBAPIError:
+        db.close()
+        database.marca_replica_indisponivel()
+        return None
+
+    return db
+
+
+async def get_async_db():
+    async_session_local = database.obtem_async_sessionmaker()
+    if async_session_local is None:
+        raise RuntimeError("SQLALCHEMY_ASYNC_DATABASE_URL não está configurada")
+
+    async with async_session_local() as db:
+        yield db
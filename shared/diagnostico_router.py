@@ -0,0 +1,39 @@
+from anyio.to_thread import current_default_thread_limiter
+from fastapi import APIRouter
+
+from shared import database
+from shared.cache import cache
+from shared.consultas_lentas import consultas_lentas
+from shared.metricas_pool import metricas_pool
+
+router = APIRouter(prefix="/diagnostico")
+
+
+@router.get("/pool")
+async def obter_metricas_do_pool() -> dict:
+    limitador = current_default_thread_limiter()
+
+    return {
+        "banco": metricas_pool.resumo(engine_das_requisicoes().pool),
+        "threads": {
+            "total": limitador.total_tokens,
+            "em_uso": limitador.borrowed_tokens,
+        },
+    }
+
+
+@router.get("/cache")
+async def obter_estatisticas_do_cache() -> dict:
+    return cache.estatisticas()
+
+
+@router.get("/consultas-lentas")
+async def obter_consultas_lentas() -> dict:
+    return consultas_lentas.resumo()
+
+
+def engine_das_requisicoes():
+    # No modo assíncrono as requisições usam o pool do async engine
+    if database.modo_assincrono():
+        return database.obtem_async_engine().sync_engine
+    return database.obtem_engine()
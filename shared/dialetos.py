@@ -0,0 +1,32 @@
+from sqlalchemy import Date, cast, func, literal_column, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def insert_do_dialeto(db: Session):
+    """Retorna o insert() do dialeto em uso, que suporta ON CONFLICT."""
+    dialeto = db.get_bind().dialect.name
+
+    if dialeto == "postgresql":
+        return postgresql.insert
+    if dialeto == "sqlite":
+        return sqlite.insert
+
+    raise NotImplementedError(f"Dialeto não suportado: {dialeto}")
+
+
+def inicio_da_semana(db: Session, coluna):
+    """Segunda-feira da semana (ISO) de uma coluna de data, como Date."""
+    dialeto = db.get_bind().dialect.name
+
+    # Literais em vez de parâmetros, para que a mesma expressão no SELECT, no
+    # GROUP BY e no OVER seja reconhecida pelo Postgres como igual
+    if dialeto == "postgresql":
+        return cast(func.date_trunc(literal_column("'week'"), coluna), Date)
+    if dialeto == "sqlite":
+        return type_coerce(
+            func.date(coluna, literal_column("'-6 days'"), literal_column("'weekday 1'")),
+            Date,
+        )
+
+    raise NotImplementedError(f"Dialeto não suportado: {dialeto}")
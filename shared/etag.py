@@ -0,0 +1,45 @@
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+
+
+def calcula_etag(*partes) -> str:
+    conteudo = "|".join(str(parte) for parte in partes)
+    return '"' + hashlib.sha1(conteudo.encode()).hexdigest() + '"'
+
+
+def etag_corresponde(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match usa comparação fraca, então W/"x" também vale para "x"
+    return etag in (
+        candidata.strip().removeprefix("W/") for candidata in if_none_match.split(",")
+    )
+
+
+def resposta_nao_modificada(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def assinatura_da_colecao(db, modelo, *filtros) -> tuple:
+    """Resume uma coleção em uma única agregação, sem carregar as linhas.
+
+    count e max(id) mudam com inserções e remoções; sum(versao) e
+    max(atualizado_em) mudam a cada atualização.
+    """
+    consulta = select(
+        func.count(),
+        func.max(modelo.id),
+        func.sum(modelo.versao),
+        func.max(modelo.atualizado_em),
+    )
+    for filtro in filtros:
+        consulta = consulta.where(filtro)
+
+    return tuple(db.execute(consulta).one())
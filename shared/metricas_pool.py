@@ -0,0 +1,90 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class MetricasPool:
+    """Contadores do pool de conexões alimentados pelos eventos do SQLAlchemy."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.conexoes_criadas = 0
+        self.conexoes_invalidadas = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.espera_total_segundos = 0.0
+        self.espera_maxima_segundos = 0.0
+
+    def registra_espera(self, segundos: float, timeout: bool = False) -> None:
+        with self._lock:
+            self.espera_total_segundos += segundos
+            self.espera_maxima_segundos = max(self.espera_maxima_segundos, segundos)
+            if timeout:
+                self.timeouts += 1
+
+    def incrementa(self, contador: str) -> None:
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + 1)
+
+    def escuta(self, engine) -> None:
+        event.listen(engine, "connect", lambda *_: self.incrementa("conexoes_criadas"))
+        event.listen(engine, "invalidate", lambda *_: self.incrementa("conexoes_invalidadas"))
+        event.listen(engine, "checkout", lambda *_: self.incrementa("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self.incrementa("checkins"))
+
+    def resumo(self, pool) -> dict:
+        with self._lock:
+            espera_media = (
+                self.espera_total_segundos / self.checkouts if self.checkouts else 0.0
+            )
+            resumo = {
+                "pool": type(pool).__name__,
+                "conexoes_criadas": self.conexoes_criadas,
+                "conexoes_invalidadas": self.conexoes_invalidadas,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "espera_media_ms": round(espera_media * 1000, 3),
+                "espera_maxima_ms": round(self.espera_maxima_segundos * 1000, 3),
+            }
+
+        if isinstance(pool, QueuePool):
+            resumo.update(
+                tamanho=pool.size(),
+                em_uso=pool.checkedout(),
+                ociosas=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+
+        return resumo
+
+
+metricas_pool = MetricasPool()
+
+
+class MedeEsperaDoCheckout:
+    """Mede quanto tempo cada checkout do pool esperou por uma conexão."""
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super().connect()
+        except PoolTimeoutError:
+            metricas_pool.registra_espera(time.perf_counter() - inicio, timeout=True)
+            raise
+
+        metricas_pool.registra_espera(time.perf_counter() - inicio)
+        return conexao
+
+
+class QueuePoolComMetricas(MedeEsperaDoCheckout, QueuePool):
+    pass
+
+
+class AsyncAdaptedQueuePoolComMetricas(MedeEsperaDoCheckout, AsyncAdaptedQueuePool):
+    # O checkout do modo assíncrono também passa por connect(), via greenlet
+    pass
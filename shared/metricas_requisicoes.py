@@ -0,0 +1,216 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_QUERIES = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+ROTA_DESCONHECIDA = "desconhecida"
+
+
+class ConsumoDaRequisicao:
+    """Queries e tempo de banco da requisição em andamento."""
+
+    __slots__ = ("escopo", "queries", "tempo_db")
+
+    def __init__(self, escopo: dict | None = None):
+        self.escopo = escopo
+        self.queries = 0
+        self.tempo_db = 0.0
+
+    @property
+    def rota(self) -> str | None:
+        # O roteamento do FastAPI grava a rota no mesmo escopo do middleware
+        if self.escopo is None:
+            return None
+        rota = getattr(self.escopo.get("route"), "path", ROTA_DESCONHECIDA)
+        return f"{self.escopo['method']} {rota}"
+
+
+# Os handlers síncronos rodam em threads do anyio, que copiam o contexto, então
+# os eventos do SQLAlchemy enxergam o mesmo objeto da requisição.
+requisicao_atual: ContextVar[ConsumoDaRequisicao | None] = ContextVar(
+    "requisicao_atual", default=None
+)
+
+
+class Histograma:
+    def __init__(self, limites):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+
+    def observa(self, valor: float) -> None:
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+
+    def linhas(self, nome: str, rotulos: str) -> list:
+        linhas = []
+        acumulado = 0
+        for limite, contagem in zip(self.limites, self.contagens):
+            acumulado += contagem
+            linhas.append(f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+        acumulado += self.contagens[-1]
+        linhas.append(f'{nome}_bucket{{{rotulos},le="+Inf"}} {acumulado}')
+        linhas.append(f"{nome}_sum{{{rotulos}}} {self.soma}")
+        linhas.append(f"{nome}_count{{{rotulos}}} {acumulado}")
+        return linhas
+
+
+class MetricasRequisicoes:
+    """Latência, status, requisições em andamento e consumo de banco por rota.
+
+    As métricas são expostas no formato texto do Prometheus por ``exposicao``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.em_andamento = 0
+        self.requisicoes = {}
+        self.latencias = {}
+        self.queries = {}
+        self.tempos_db = {}
+
+    def inicia(self) -> None:
+        with self._lock:
+            self.em_andamento += 1
+
+    def finaliza(
+        self,
+        metodo: str,
+        rota: str,
+        status: int,
+        duracao: float,
+        consumo: ConsumoDaRequisicao,
+    ) -> None:
+        chave = (metodo, rota)
+
+        with self._lock:
+            self.em_andamento -= 1
+            self.requisicoes[(metodo, rota, status)] = (
+                self.requisicoes.get((metodo, rota, status), 0) + 1
+            )
+            if chave not in self.latencias:
+                self.latencias[chave] = Histograma(LIMITES_LATENCIA)
+                self.queries[chave] = Histograma(LIMITES_QUERIES)
+                self.tempos_db[chave] = Histograma(LIMITES_LATENCIA)
+            self.latencias[chave].observa(duracao)
+            self.queries[chave].observa(consumo.queries)
+            self.tempos_db[chave].observa(consumo.tempo_db)
+
+    def escuta(self, alvo) -> None:
+        # Idempotente, já que cada app criado pela fábrica chama escuta(Engine)
+        if not event.contains(alvo, "before_cursor_execute", antes_da_query):
+            event.listen(alvo, "before_cursor_execute", antes_da_query)
+            event.listen(alvo, "after_cursor_execute", depois_da_query)
+
+    def exposicao(self) -> str:
+        with self._lock:
+            linhas = [
+                "# HELP http_requests_in_progress Requisições HTTP em andamento.",
+                "# TYPE http_requests_in_progress gauge",
+                f"http_requests_in_progress {self.em_andamento}",
+                "# HELP http_requests_total Requisições HTTP por rota e status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (metodo, rota, status), total in sorted(self.requisicoes.items()):
+                linhas.append(
+                    f"http_requests_total{{{rotulos(metodo, rota)},"
+                    f'status="{status}"}} {total}'
+                )
+
+            for nome, descricao, histogramas in [
+                (
+                    "http_request_duration_seconds",
+                    "Latência das requisições HTTP.",
+                    self.latencias,
+                ),
+                (
+                    "http_request_db_queries",
+                    "Queries enviadas ao banco por requisição.",
+                    self.queries,
+                ),
+                (
+                    "http_request_db_duration_seconds",
+                    "Tempo de banco por requisição.",
+                    self.tempos_db,
+                ),
+            ]:
+                linhas.append(f"# HELP {nome} {descricao}")
+                linhas.append(f"# TYPE {nome} histogram")
+                for (metodo, rota), histograma in sorted(histogramas.items()):
+                    linhas.extend(histograma.linhas(nome, rotulos(metodo, rota)))
+
+        return "\n".join(linhas) + "\n"
+
+    def limpa(self) -> None:
+        with self._lock:
+            self.requisicoes.clear()
+            self.latencias.clear()
+            self.queries.clear()
+            self.tempos_db.clear()
+
+
+metricas_requisicoes = MetricasRequisicoes()
+
+
+def rotulos(metodo: str, rota: str) -> str:
+    return f'method="{escapa_rotulo(metodo)}",route="{escapa_rotulo(rota)}"'
+
+
+def escapa_rotulo(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def antes_da_query(conn, cursor, statement, parameters, context, executemany):
+    consumo = requisicao_atual.get()
+    if consumo is not None:
+        consumo.queries += 1
+        conn.info["inicio_da_query"] = time.perf_counter()
+
+
+def depois_da_query(conn, cursor, statement, parameters, context, executemany):
+    consumo = requisicao_atual.get()
+    inicio = conn.info.pop("inicio_da_query", None)
+    if consumo is not None and inicio is not None:
+        consumo.tempo_db += time.perf_counter() - inicio
+
+
+class MiddlewareDeMetricas:
+    """Middleware ASGI puro, sem o custo extra do BaseHTTPMiddleware.
+
+    A rota é lida do template do FastAPI (ex.: ``/contas/{id}``) depois do
+    roteamento, para não abrir uma série por id. Caminhos sem rota ficam como
+    ``desconhecida``.
+    """
+
+    def __init__(self, app, metricas: MetricasRequisicoes = metricas_requisicoes):
+        self.app = app
+        self.metricas = metricas
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def envia(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        consumo = ConsumoDaRequisicao(scope)
+        token = requisicao_atual.set(consumo)
+        self.metricas.inicia()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, envia)
+        finally:
+            duracao = time.perf_counter() - inicio
+            requisicao_atual.reset(token)
+            rota = getattr(scope.get("route"), "path", ROTA_DESCONHECIDA)
+            self.metricas.finaliza(scope["method"], rota, status, duracao, consumo)
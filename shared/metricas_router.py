@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from shared.metricas_requisicoes import metricas_requisicoes
+
+router = APIRouter()
+
+CONTENT_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def obter_metricas() -> PlainTextResponse:
+    return PlainTextResponse(
+        metricas_requisicoes.exposicao(), media_type=CONTENT_TYPE_PROMETHEUS
+    )
@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Tuple
+
+from fastapi import HTTPException
+
+CABECALHO_PROXIMO_CURSOR = "X-Next-Cursor"
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+
+
+def codifica_cursor(data_previsao: date, id: int) -> str:
+    return codifica_valores([data_previsao.isoformat(), id])
+
+
+def decodifica_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        data_previsao, id = decodifica_valores(cursor)
+        return date.fromisoformat(data_previsao), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Cursor inválido")
+
+
+def codifica_cursor_da_busca(relevancia: float, id: int) -> str:
+    return codifica_valores([relevancia, id])
+
+
+def decodifica_cursor_da_busca(cursor: str) -> Tuple[float, int]:
+    try:
+        relevancia, id = decodifica_valores(cursor)
+        return float(relevancia), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Cursor inválido")
+
+
+def codifica_cursor_ordenado(chave, id: int) -> str:
+    """Cursor de uma ordenação qualquer; a chave vai como texto (ex.: Decimal)."""
+    return codifica_valores([str(chave), id])
+
+
+def decodifica_cursor_ordenado(cursor: str, converte=str) -> Tuple[object, int]:
+    try:
+        chave, id = decodifica_valores(cursor)
+        return converte(chave), int(id)
+    except (binascii.Error, ValueError, TypeError, ArithmeticError):
+        raise HTTPException(status_code=422, detail="Cursor inválido")
+
+
+def codifica_valores(valores: list) -> str:
+    conteudo = json.dumps(valores).encode()
+    return base64.urlsafe_b64encode(conteudo).decode().rstrip("=")
+
+
+def decodifica_valores(cursor: str) -> list:
+    preenchimento = "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
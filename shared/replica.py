@@ -0,0 +1,51 @@
+from http.cookies import SimpleCookie
+
+from fastapi import Request
+
+from shared import database
+
+COOKIE_LER_DO_PRIMARIO = "ler_do_primario"
+METODOS_DE_LEITURA = {"GET", "HEAD", "OPTIONS"}
+
+
+def ler_do_primario(request: Request) -> bool:
+    # O cookie expira sozinho no cliente depois da janela de read-your-writes
+    return COOKIE_LER_DO_PRIMARIO in request.cookies
+
+
+class MiddlewareLeiaSuasEscritas:
+    """Marca o cliente que acabou de escrever para ler do primário.
+
+    Toda resposta de sucesso a um método de escrita leva um cookie com
+    Max-Age igual a SQLALCHEMY_READ_YOUR_WRITES_SEGUNDOS. Enquanto o cookie
+    existir, get_read_db ignora a réplica, que pode ainda não ter a escrita.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in METODOS_DE_LEITURA:
+            await self.app(scope, receive, send)
+            return
+
+        async def envia(mensagem):
+            if mensagem["type"] == "http.response.start" and mensagem["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[COOKIE_LER_DO_PRIMARIO] = "1"
+                cookie[COOKIE_LER_DO_PRIMARIO]["max-age"] = (
+                    database.SQLALCHEMY_READ_YOUR_WRITES_SEGUNDOS
+                )
+                cookie[COOKIE_LER_DO_PRIMARIO]["path"] = "/"
+                cookie[COOKIE_LER_DO_PRIMARIO]["httponly"] = True
+                cookie[COOKIE_LER_DO_PRIMARIO]["samesite"] = "lax"
+                mensagem = {
+                    **mensagem,
+                    "headers": [
+                        *mensagem.get("headers", []),
+                        (b"set-cookie", cookie.output(header="").strip().encode()),
+                    ],
+                }
+            await send(mensagem)
+
+        await self.app(scope, receive, envia)
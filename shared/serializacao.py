@@ -0,0 +1,29 @@
+import os
+from decimal import Decimal
+
+import orjson
+from fastapi import Response
+
+# Quando ativa, as listagens grandes montam o JSON direto das linhas do banco,
+# sem validar cada item no response_model. O schema do OpenAPI continua o mesmo.
+SERIALIZACAO_RAPIDA = os.getenv("SERIALIZACAO_RAPIDA", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+def converte_para_json(valor):
+    # Mesmo comportamento dos campos float dos response models
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def resposta_json(conteudo, headers: dict | None = None) -> Response:
+    # orjson já escreve date/datetime em ISO 8601
+    return Response(
+        orjson.dumps(conteudo, default=converte_para_json),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from shared import database
+from shared.cache import cache
+
+
+@contextmanager
+def _conta_queries(engine=Engine):
+    queries = []
+
+    def registra_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registra_query)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", registra_query)
+
+
+@pytest.fixture
+def conta_queries():
+    """Conta os statements enviados ao banco dentro do bloco.
+
+    Uso: ``with conta_queries() as queries: client.get(...)``. Sem argumento
+    escuta todos os engines, já que cada módulo de teste sobrescreve o get_db
+    com o seu próprio engine.
+    """
+    return _conta_queries
+
+
+@pytest.fixture(autouse=True)
+def limpa_cache():
+    # Os testes recriam as tabelas, então ids cacheados de um teste não valem no próximo
+    cache.limpa()
+    yield
+
+
+@pytest.fixture
+def banco_temporario(monkeypatch, tmp_path):
+    """Aponta os engines de shared.database para um SQLite temporário.
+
+    Os testes que usam obtem_engine() não dependem de SQLALCHEMY_DATABASE_URL
+    nem abrem conexões no banco configurado no ambiente.
+    """
+    monkeypatch.setattr(database, "SQLALCHEMY_DATABASE_URL", f"sqlite:///{tmp_path}/app.db")
+    monkeypatch.setattr(database, "SQLALCHEMY_READ_DATABASE_URL", None)
+    monkeypatch.setattr(database, "SQLALCHEMY_ASYNC_DATABASE_URL", None)
+    asyncio.run(database.descarta_engines())
+
+    yield
+
+    asyncio.run(database.descarta_engines())
@@ -0,0 +1,142 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from contas_a_pagar_e_receber.routers import (
+    contas_a_pagar_e_receber_async_router,
+    fornecedor_cliente_async_router,
+    fornecedor_cliente_vs_contas_async_router,
+)
+from shared.database import Base
+from shared.dependencies import get_async_db
+from shared.exeptions import NotFound
+from shared.exeptions_handler import not_found_exception_handler
+
+app = FastAPI()
+app.include_router(contas_a_pagar_e_receber_async_router.router)
+app.include_router(fornecedor_cliente_async_router.router)
+app.include_router(fornecedor_cliente_vs_contas_async_router.router)
+app.add_exception_handler(NotFound, not_found_exception_handler)
+
+client = TestClient(app)
+
+engine = create_engine(
+    "sqlite:///./test/test_async.db", connect_args={"check_same_thread": False}
+)
+
+# NullPool porque o TestClient pode usar um event loop diferente por requisição
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test/test_async.db", poolclass=NullPool
+)
+
+TestingAsyncSessionLocal = async_sessionmaker(autoflush=False, bind=async_engine)
+
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+
+def test_deve_criar_e_listar_contas_com_fornecedor_no_modo_assincrono():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "Casa da Música"})
+
+    response = client.post(
+        "/contas-a-pagar-e-receber",
+        json={
+            "descricao": "Curso de Guitarra",
+            "valor": 250,
+            "tipo": "PAGAR",
+            "fornecedor_cliente_id": 1,
+            "data_previsao": "2022-11-29",
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["fornecedor"] == {"id": 1, "nome": "Casa da Música", "versao": 1}
+
+    response = client.get("/contas-a-pagar-e-receber")
+    assert response.status_code == 200
+    assert [c["descricao"] for c in response.json()] == ["Curso de Guitarra"]
+
+    response = client.get("/fornecedor-cliente/1/contas-a-pagar-e-receber")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    response = client.get("/fornecedor-cliente/1")
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "nome": "Casa da Música", "versao": 1}
+
+    response = client.get("/fornecedor-cliente/2")
+    assert response.status_code == 404
+
+    response = client.get("/fornecedor-cliente/resumo")
+    assert response.status_code == 200
+    assert response.json()[0]["valor_a_pagar_em_aberto"] == "250.00"
+
+    response = client.get("/contas-a-pagar-e-receber/previsao-gastos-por-mes?ano=2022")
+    assert response.json() == [{"mes": 11, "valor_total": "250.00"}]
+
+    response = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa"
+        "?data_inicio=2022-11-28&data_fim=2022-11-29&saldo_inicial=1000"
+    )
+    assert response.status_code == 200
+    assert [p["saldo_acumulado"] for p in response.json()] == ["1000.00", "750.00"]
+
+
+def test_deve_baixar_e_remover_conta_no_modo_assincrono():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post(
+        "/contas-a-pagar-e-receber",
+        json={
+            "descricao": "Curso de Python",
+            "valor": 333,
+            "tipo": "PAGAR",
+            "data_previsao": "2022-11-29",
+        },
+    )
+
+    response = client.post("/contas-a-pagar-e-receber/1/baixar")
+    assert response.status_code == 200
+    assert response.json()["esta_baixada"] is True
+
+    assert client.delete("/contas-a-pagar-e-receber/1").status_code == 204
+    assert client.get("/contas-a-pagar-e-receber/1").status_code == 404
+
+
+def test_deve_exportar_contas_no_modo_assincrono():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post(
+        "/contas-a-pagar-e-receber",
+        json={
+            "descricao": "Conta de Luz",
+            "valor": 100.50,
+            "tipo": "PAGAR",
+            "data_previsao": "2024-05-09",
+        },
+    )
+
+    response = client.get("/contas-a-pagar-e-receber/export?formato=csv")
+
+    assert response.status_code == 200
+    assert response.text.splitlines()[1] == "1,Conta de Luz,100.50,PAGAR,2024-05-09,,,False,"
+
+
+def test_deve_retornar_erro_para_fornecedor_invalido_no_modo_assincrono():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.get("/fornecedor-cliente/10/contas-a-pagar-e-receber")
+
+    assert response.status_code == 422
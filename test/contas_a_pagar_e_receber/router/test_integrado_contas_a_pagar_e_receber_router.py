@@ -1,13 +1,27 @@
+import json
 from cgi import print_arguments
 from datetime import date, datetime
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, event, insert
 from sqlalchemy.orm import sessionmaker
 
+from decimal import Decimal
+
 from main import app
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import (
+    ContaPagarReceber,
+)
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorCliente
+from contas_a_pagar_e_receber.models.quantidade_contas_por_mes_model import (
+    QuantidadeContasPorMes,
+)
+from contas_a_pagar_e_receber.models.resumo_diario_model import ResumoDiario
+from contas_a_pagar_e_receber.models.resumo_mensal_model import ResumoMensal
+from contas_a_pagar_e_receber.resumo_mensal import reconstroi_resumo_mensal
 from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import (
     QUANTIDADE_PERMITIDA_POR_MES,
 )
+from shared import serializacao
 from shared.database import Base
 from shared.dependencies import get_db
 
@@ -71,6 +85,7 @@ def test_deve_listar_contas_a_pagar_e_receber():
             "data_baixa": None,
             "valor_baixa": None,
             "esta_baixada": False,
+            "versao": 1,
             "data_previsao": "2024-05-09",
         },
         {
@@ -82,11 +97,279 @@ def test_deve_listar_contas_a_pagar_e_receber():
             "data_baixa": None,
             "valor_baixa": None,
             "esta_baixada": False,
+            "versao": 1,
             "data_previsao": "2024-05-09",
         },
     ]
 
 
+def test_deve_listar_contas_com_fornecedor_em_uma_unica_query(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for i in range(1, 6):
+        client.post("/fornecedor-cliente", json={"nome": f"Fornecedor {i}"})
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta de Luz",
+                "valor": 100.00,
+                "tipo": "PAGAR",
+                "fornecedor_cliente_id": i,
+                "data_previsao": "2024-05-09",
+            },
+        )
+
+    with conta_queries() as queries:
+        response = client.get("/contas-a-pagar-e-receber")
+
+    assert response.status_code == 200
+    assert [c["fornecedor"]["nome"] for c in response.json()] == [
+        f"Fornecedor {i}" for i in range(1, 6)
+    ]
+    assert len(queries) == 1
+
+
+def test_deve_paginar_contas_a_pagar_e_receber_por_cursor():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for data_previsao in ["2024-05-10", "2024-05-09", "2024-05-11", "2024-05-09"]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta de Luz",
+                "valor": 100.00,
+                "tipo": "PAGAR",
+                "data_previsao": data_previsao,
+            },
+        )
+
+    primeira_pagina = client.get("/contas-a-pagar-e-receber?limit=3")
+    assert primeira_pagina.status_code == 200
+    assert [c["id"] for c in primeira_pagina.json()] == [2, 4, 1]
+
+    cursor = primeira_pagina.headers["X-Next-Cursor"]
+    segunda_pagina = client.get(f"/contas-a-pagar-e-receber?limit=3&cursor={cursor}")
+    assert segunda_pagina.status_code == 200
+    assert [c["id"] for c in segunda_pagina.json()] == [3]
+    assert "X-Next-Cursor" not in segunda_pagina.headers
+
+
+def test_deve_listar_contas_com_serializacao_rapida_igual_ao_response_model(
+    monkeypatch, conta_queries
+):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "Fornecedor"})
+    for i, data_previsao in enumerate(["2024-05-10", "2024-05-09", "2024-05-11"]):
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta de Luz",
+                "valor": 100.55,
+                "tipo": "PAGAR",
+                "fornecedor_cliente_id": 1 if i % 2 == 0 else None,
+                "data_previsao": data_previsao,
+            },
+        )
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+
+    esperado = client.get("/contas-a-pagar-e-receber?limit=2")
+
+    monkeypatch.setattr(serializacao, "SERIALIZACAO_RAPIDA", True)
+    with conta_queries() as queries:
+        response = client.get("/contas-a-pagar-e-receber?limit=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == esperado.json()
+    assert response.headers["X-Next-Cursor"] == esperado.headers["X-Next-Cursor"]
+    assert len(queries) == 1
+
+    cursor = response.headers["X-Next-Cursor"]
+    segunda_pagina = client.get(f"/contas-a-pagar-e-receber?limit=2&cursor={cursor}")
+    assert [c["id"] for c in segunda_pagina.json()] == [3]
+    assert "X-Next-Cursor" not in segunda_pagina.headers
+
+
+def test_deve_retornar_erro_para_cursor_invalido():
+    response = client.get("/contas-a-pagar-e-receber?cursor=invalido")
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+def test_deve_buscar_contas_pela_descricao_e_pelo_fornecedor():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "Luz e Força SA"})
+    for descricao, fornecedor_cliente_id in [
+        ("Conta de Luz", None),
+        ("Conta de Água", None),
+        ("Energia", 1),
+        ("Luz do escritório", None),
+        ("Desconto 100%", None),
+    ]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": descricao,
+                "valor": 100,
+                "tipo": "PAGAR",
+                "fornecedor_cliente_id": fornecedor_cliente_id,
+                "data_previsao": "2024-05-09",
+            },
+        )
+
+    response = client.get("/contas-a-pagar-e-receber/busca?q=luz")
+    assert response.status_code == 200
+    # Quem começa com o termo vem antes de quem só o contém
+    assert [c["id"] for c in response.json()] == [3, 4, 1]
+    assert response.json()[0]["fornecedor"]["nome"] == "Luz e Força SA"
+
+    primeira_pagina = client.get("/contas-a-pagar-e-receber/busca?q=luz&limit=2")
+    assert [c["id"] for c in primeira_pagina.json()] == [3, 4]
+    cursor = primeira_pagina.headers["X-Next-Cursor"]
+    segunda_pagina = client.get(
+        f"/contas-a-pagar-e-receber/busca?q=luz&limit=2&cursor={cursor}"
+    )
+    assert [c["id"] for c in segunda_pagina.json()] == [1]
+    assert "X-Next-Cursor" not in segunda_pagina.headers
+
+    # % e _ do termo são literais, não curingas
+    response = client.get("/contas-a-pagar-e-receber/busca", params={"q": "00%"})
+    assert [c["id"] for c in response.json()] == [5]
+    response = client.get("/contas-a-pagar-e-receber/busca", params={"q": "a_a"})
+    assert response.json() == []
+
+    assert client.get("/contas-a-pagar-e-receber/busca?q=lu").status_code == 422
+
+
+def test_deve_filtrar_contas_a_pagar_e_receber():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+
+    for tipo, data_previsao, fornecedor_cliente_id in [
+        ("PAGAR", "2024-05-09", 1),
+        ("RECEBER", "2024-05-10", None),
+        ("PAGAR", "2024-06-01", None),
+        ("PAGAR", "2024-07-01", 1),
+    ]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta de Luz",
+                "valor": 100.00,
+                "tipo": tipo,
+                "fornecedor_cliente_id": fornecedor_cliente_id,
+                "data_previsao": data_previsao,
+            },
+        )
+
+    client.post("/contas-a-pagar-e-receber/3/baixar")
+
+    # Escrita sem esta_baixada, fora da API: o default do banco a deixa em aberto
+    with TestingSessionLocal() as db:
+        db.execute(
+            insert(ContaPagarReceber.__table__).values(
+                descricao="Conta de Gás",
+                valor=10,
+                tipo="PAGAR",
+                data_previsao=date(2024, 8, 1),
+            )
+        )
+        db.commit()
+
+    def ids(params):
+        response = client.get("/contas-a-pagar-e-receber", params=params)
+        assert response.status_code == 200
+        return [c["id"] for c in response.json()]
+
+    assert ids({"tipo": "PAGAR"}) == [1, 3, 4, 5]
+    assert ids({"tipo": "RECEBER"}) == [2]
+    assert ids({"esta_baixada": True}) == [3]
+    assert ids({"esta_baixada": False, "tipo": "PAGAR"}) == [1, 4, 5]
+    assert ids({"fornecedor_cliente_id": 1}) == [1, 4]
+    assert ids(
+        {"data_previsao_inicio": "2024-05-10", "data_previsao_fim": "2024-06-01"}
+    ) == [2, 3]
+
+
+def test_deve_exportar_contas_a_pagar_e_receber_em_ndjson():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for descricao in ["Conta de Luz", "Conta de Água"]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": descricao,
+                "valor": 100.50,
+                "tipo": "PAGAR",
+                "data_previsao": "2024-05-09",
+            },
+        )
+
+    response = client.get("/contas-a-pagar-e-receber/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert linhas == [
+        {
+            "id": 1,
+            "descricao": "Conta de Luz",
+            "valor": 100.50,
+            "tipo": "PAGAR",
+            "data_previsao": "2024-05-09",
+            "data_baixa": None,
+            "valor_baixa": None,
+            "esta_baixada": False,
+            "fornecedor_cliente_id": None,
+        },
+        {
+            "id": 2,
+            "descricao": "Conta de Água",
+            "valor": 100.50,
+            "tipo": "PAGAR",
+            "data_previsao": "2024-05-09",
+            "data_baixa": None,
+            "valor_baixa": None,
+            "esta_baixada": False,
+            "fornecedor_cliente_id": None,
+        },
+    ]
+
+
+def test_deve_exportar_contas_a_pagar_e_receber_em_csv():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post(
+        "/contas-a-pagar-e-receber",
+        json={
+            "descricao": "Conta de Luz",
+            "valor": 100.50,
+            "tipo": "PAGAR",
+            "data_previsao": "2024-05-09",
+        },
+    )
+
+    response = client.get("/contas-a-pagar-e-receber/export?formato=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "id,descricao,valor,tipo,data_previsao,data_baixa,valor_baixa,esta_baixada,fornecedor_cliente_id",
+        "1,Conta de Luz,100.50,PAGAR,2024-05-09,,,False,",
+    ]
+
+
 def test_deve_pegar_por_id():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -112,6 +395,72 @@ def test_deve_pegar_por_id():
     assert response_get.json()["tipo"] == "PAGAR"
 
 
+def test_deve_responder_304_para_conta_nao_modificada(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+    client.post(
+        "/contas-a-pagar-e-receber",
+        json={
+            "descricao": "Conta de Luz",
+            "valor": 100.0,
+            "tipo": "PAGAR",
+            "fornecedor_cliente_id": 1,
+            "data_previsao": "2022-11-29",
+        },
+    )
+
+    response = client.get("/contas-a-pagar-e-receber/1")
+    etag = response.headers["ETag"]
+
+    with conta_queries() as queries:
+        response = client.get(
+            "/contas-a-pagar-e-receber/1", headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert len(queries) == 1
+
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+    response = client.get("/contas-a-pagar-e-receber/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    etag = response.headers["ETag"]
+    client.put("/fornecedor-cliente/1", json={"nome": "Sanasa"})
+    response = client.get("/contas-a-pagar-e-receber/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["fornecedor"]["nome"] == "Sanasa"
+
+
+def test_deve_responder_304_para_previsao_nao_modificada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta = {
+        "descricao": "Conta de Luz",
+        "valor": 100.0,
+        "tipo": "PAGAR",
+        "data_previsao": "2022-11-29",
+    }
+    client.post("/contas-a-pagar-e-receber", json=conta)
+
+    url = "/contas-a-pagar-e-receber/previsao-gastos-por-mes?ano=2022"
+    etag = client.get(url).headers["ETag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/contas-a-pagar-e-receber", json={**conta, "data_previsao": "2023-01-01"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/contas-a-pagar-e-receber/1", json={**conta, "valor": 200.0})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == [{"mes": 11, "valor_total": "200.00"}]
+
+
 def test_deve_retornar_nao_encontrado_para_id_nao_existente():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -139,6 +488,7 @@ def test_deve_criar_conta_a_pagar_e_receber():
     nova_conta_copy["data_baixa"] = None
     nova_conta_copy["valor_baixa"] = None
     nova_conta_copy["esta_baixada"] = False
+    nova_conta_copy["versao"] = 1
     nova_conta_copy["valor"] = 333.00
 
     response = client.post("/contas-a-pagar-e-receber", json=nova_conta)
@@ -166,11 +516,12 @@ def test_deve_criar_conta_a_pagar_e_receber_com_fornecedor_cliente_id():
 
     nova_conta_copy = nova_conta.copy()
     nova_conta_copy["id"] = 1
-    nova_conta_copy["fornecedor"] = {"id": 1, "nome": "Casa da Música"}
+    nova_conta_copy["fornecedor"] = {"id": 1, "nome": "Casa da Música", "versao": 1}
     del nova_conta_copy["fornecedor_cliente_id"]
     nova_conta_copy["data_baixa"] = None
     nova_conta_copy["valor_baixa"] = None
     nova_conta_copy["esta_baixada"] = False
+    nova_conta_copy["versao"] = 1
     nova_conta_copy["valor"] = 250.00
 
     response = client.post("/contas-a-pagar-e-receber", json=nova_conta)
@@ -178,6 +529,88 @@ def test_deve_criar_conta_a_pagar_e_receber_com_fornecedor_cliente_id():
     assert response.json() == nova_conta_copy
 
 
+def test_deve_criar_contas_a_pagar_e_receber_em_lote(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "Casa da Música"})
+
+    contas = [
+        {
+            "descricao": "Curso de Guitarra",
+            "valor": 250,
+            "tipo": "PAGAR",
+            "fornecedor_cliente_id": 1,
+            "data_previsao": "2022-11-29",
+        },
+        {
+            "descricao": "Curso de Baixo",
+            "valor": 300,
+            "tipo": "PAGAR",
+            "fornecedor_cliente_id": 1001,
+            "data_previsao": "2022-11-29",
+        },
+        {
+            "descricao": "Venda de Curso",
+            "valor": 500,
+            "tipo": "RECEBER",
+            "data_previsao": "2022-12-01",
+        },
+    ]
+
+    with conta_queries() as queries:
+        response = client.post("/contas-a-pagar-e-receber/lote", json=contas)
+
+    assert response.status_code == 200
+    resultados = response.json()
+    assert [r["status_code"] for r in resultados] == [201, 422, 201]
+    assert resultados[0]["conta"] == {
+        "id": 1,
+        "descricao": "Curso de Guitarra",
+        "valor": 250.0,
+        "tipo": "PAGAR",
+        "fornecedor": {"id": 1, "nome": "Casa da Música", "versao": 1},
+        "data_baixa": None,
+        "valor_baixa": None,
+        "esta_baixada": False,
+        "versao": 1,
+        "data_previsao": "2022-11-29",
+    }
+    assert resultados[1]["erro"] == "Esse fornecedor não existe no banco de dados"
+    assert resultados[2]["conta"]["id"] == 2
+    # Uma única busca de fornecedores (IN) e nenhum lazy load na resposta
+    assert len([q for q in queries if "FROM fornecedor_cliente" in q]) == 1
+
+    response = client.get("/contas-a-pagar-e-receber")
+    assert [c["descricao"] for c in response.json()] == [
+        "Curso de Guitarra",
+        "Venda de Curso",
+    ]
+
+
+def test_deve_respeitar_limite_mensal_ao_criar_contas_em_lote():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta = {
+        "descricao": "Curso Python",
+        "valor": 1000.5,
+        "tipo": "PAGAR",
+        "data_previsao": "2022-11-29",
+    }
+    client.post("/contas-a-pagar-e-receber", json=conta)
+
+    response = client.post(
+        "/contas-a-pagar-e-receber/lote", json=[conta] * QUANTIDADE_PERMITIDA_POR_MES
+    )
+
+    assert response.status_code == 200
+    status_codes = [r["status_code"] for r in response.json()]
+    assert status_codes == [201] * (QUANTIDADE_PERMITIDA_POR_MES - 1) + [422]
+    assert response.json()[-1]["erro"] == "Você não pode mais lançar contas para esse mês"
+    assert client.post("/contas-a-pagar-e-receber", json=conta).status_code == 422
+
+
 def test_deve_retornar_erro_ao_inserir_uma_nova_conta_com_fornecedor_invalido():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -263,7 +696,7 @@ def test_deve_atualizar_conta_a_pagar_e_receber_com_fornecedor_cliente_id():
     )
 
     assert response_put.status_code == 200
-    assert response_put.json()["fornecedor"] == {"id": 1, "nome": "Código e CIA"}
+    assert response_put.json()["fornecedor"] == {"id": 1, "nome": "Código e CIA", "versao": 1}
 
 
 def test_deve_atualizar_conta_a_pagar_e_receber_com_fornecedor_cliente_id_invalido():
@@ -457,6 +890,202 @@ def test_deve_baixar_conta_modificada():
     assert response_acao.json()["valor_baixa"] == 444.0
 
 
+def ativa_chaves_estrangeiras(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def test_deve_recusar_fornecedor_excluido_que_ainda_esta_no_cache():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+    client.post("/fornecedor-cliente", json={"nome": "Sanasa"})
+    conta = {
+        "descricao": "Conta de Luz",
+        "valor": 100,
+        "tipo": "PAGAR",
+        "fornecedor_cliente_id": 2,
+        "data_previsao": "2022-11-29",
+    }
+    client.post("/contas-a-pagar-e-receber", json=conta)
+    assert client.get("/fornecedor-cliente/1").status_code == 200
+
+    # Exclusão feita por outro worker: o cache deste processo não fica sabendo
+    with TestingSessionLocal() as db:
+        db.execute(delete(FornecedorCliente).where(FornecedorCliente.id == 1))
+        db.commit()
+
+    # Os módulos de teste compartilham o app, então garante o get_db deste engine
+    override_anterior = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = override_get_db
+    engine.dispose()
+    event.listen(engine, "connect", ativa_chaves_estrangeiras)
+    try:
+        response = client.post(
+            "/contas-a-pagar-e-receber", json={**conta, "fornecedor_cliente_id": 1}
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Esse fornecedor não existe no banco de dados"
+
+        client.get("/fornecedor-cliente/1")
+        response = client.put(
+            "/contas-a-pagar-e-receber/1", json={**conta, "fornecedor_cliente_id": 1}
+        )
+        assert response.status_code == 422
+    finally:
+        event.remove(engine, "connect", ativa_chaves_estrangeiras)
+        engine.dispose()
+        app.dependency_overrides[get_db] = override_anterior
+
+    # A conta não foi alterada e a vaga reservada no mês voltou com o rollback
+    response = client.get("/contas-a-pagar-e-receber")
+    assert [c["fornecedor"]["id"] for c in response.json()] == [2]
+    with TestingSessionLocal() as db:
+        assert db.get(QuantidadeContasPorMes, (2022, 11)).quantidade == 1
+
+
+def test_deve_recusar_escritas_com_versao_desatualizada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta = {
+        "descricao": "Curso de Python",
+        "valor": 333,
+        "tipo": "PAGAR",
+        "data_previsao": "2022-11-29",
+    }
+    assert client.post("/contas-a-pagar-e-receber", json=conta).json()["versao"] == 1
+
+    response_put = client.put(
+        "/contas-a-pagar-e-receber/1?versao=1", json={**conta, "valor": 444}
+    )
+    assert response_put.status_code == 200
+    assert response_put.json()["versao"] == 2
+
+    # Outro cliente que ainda tem a versão 1 não sobrescreve a alteração
+    response_put = client.put(
+        "/contas-a-pagar-e-receber/1?versao=1", json={**conta, "valor": 555}
+    )
+    assert response_put.status_code == 409
+    assert client.post("/contas-a-pagar-e-receber/1/baixar?versao=1").status_code == 409
+    assert client.delete("/contas-a-pagar-e-receber/1?versao=1").status_code == 409
+    assert client.get("/contas-a-pagar-e-receber/1").json()["valor"] == 444.0
+
+    response_acao = client.post("/contas-a-pagar-e-receber/1/baixar?versao=2")
+    assert response_acao.status_code == 200
+    assert response_acao.json()["versao"] == 3
+    assert response_acao.json()["valor_baixa"] == 444.0
+
+    assert client.delete("/contas-a-pagar-e-receber/1?versao=3").status_code == 204
+    assert client.delete("/contas-a-pagar-e-receber/1?versao=3").status_code == 404
+
+
+def test_deve_escrever_sem_select_depois_do_commit(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+    client.get("/fornecedor-cliente/1")
+    conta = {
+        "descricao": "Conta de Luz",
+        "valor": 100,
+        "tipo": "PAGAR",
+        "fornecedor_cliente_id": 1,
+        "data_previsao": "2022-11-29",
+    }
+
+    # O fornecedor vem do cache e a conta do RETURNING, então só há a leitura
+    # travada da conta antes do UPDATE
+    with conta_queries() as queries:
+        response = client.post("/contas-a-pagar-e-receber", json=conta)
+        client.put("/contas-a-pagar-e-receber/1", json={**conta, "valor": 200})
+        client.post("/contas-a-pagar-e-receber/1/baixar")
+        client.delete("/contas-a-pagar-e-receber/1")
+
+    assert response.json()["fornecedor"] == {"id": 1, "nome": "CPFL", "versao": 1}
+    assert len([q for q in queries if q.lstrip().startswith("SELECT")]) == 2
+    assert not [q for q in queries if "FROM fornecedor_cliente" in q]
+
+
+def test_deve_baixar_contas_em_lote_por_ids(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+    for valor in [100, 200, 300]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta de Luz",
+                "valor": valor,
+                "tipo": "PAGAR",
+                "fornecedor_cliente_id": 1,
+                "data_previsao": "2022-11-29",
+            },
+        )
+
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+    data_baixa_anterior = client.get("/contas-a-pagar-e-receber/1").json()["data_baixa"]
+
+    with conta_queries() as queries:
+        response = client.post(
+            "/contas-a-pagar-e-receber/baixar-lote", json={"ids": [1, 2]}
+        )
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [2]
+    assert response.json()[0]["esta_baixada"] is True
+    assert response.json()[0]["valor_baixa"] == 200.0
+    assert response.json()[0]["fornecedor"] == {"id": 1, "nome": "CPFL", "versao": 1}
+    # Leitura travada, UPDATE ... RETURNING, upsert do resumo e fornecedores
+    assert len(queries) == 4
+
+    conta_ja_baixada = client.get("/contas-a-pagar-e-receber/1").json()
+    assert conta_ja_baixada["data_baixa"] == data_baixa_anterior
+    assert client.get("/contas-a-pagar-e-receber/3").json()["esta_baixada"] is False
+
+
+def test_deve_baixar_contas_em_lote_por_filtro():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for tipo, data_previsao in [
+        ("PAGAR", "2022-11-01"),
+        ("RECEBER", "2022-11-01"),
+        ("PAGAR", "2022-11-30"),
+        ("PAGAR", "2022-12-01"),
+    ]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta de Luz",
+                "valor": 100,
+                "tipo": tipo,
+                "data_previsao": data_previsao,
+            },
+        )
+
+    response = client.post(
+        "/contas-a-pagar-e-receber/baixar-lote",
+        json={"tipo": "PAGAR", "data_previsao_ate": "2022-11-30"},
+    )
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [1, 3]
+
+    response = client.post(
+        "/contas-a-pagar-e-receber/baixar-lote",
+        json={"tipo": "PAGAR", "data_previsao_ate": "2022-11-30"},
+    )
+    assert response.json() == []
+
+
+def test_deve_exigir_ids_ou_filtro_na_baixa_em_lote():
+    response = client.post("/contas-a-pagar-e-receber/baixar-lote", json={})
+
+    assert response.status_code == 422
+
+
 def test_limite_de_registros_mensais():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -484,6 +1113,38 @@ def test_limite_de_registros_mensais():
     assert all([r.status_code == 201 for r in respostas]) is True
 
 
+def test_limite_de_registros_mensais_libera_vaga_ao_remover_ou_mudar_de_mes():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta = {
+        "descricao": "Curso Python",
+        "valor": 1000.5,
+        "tipo": "PAGAR",
+        "data_previsao": "2022-11-29",
+    }
+    for i in range(0, QUANTIDADE_PERMITIDA_POR_MES):
+        assert client.post("/contas-a-pagar-e-receber", json=conta).status_code == 201
+
+    assert client.post("/contas-a-pagar-e-receber", json=conta).status_code == 422
+
+    client.delete("/contas-a-pagar-e-receber/1")
+    assert client.post("/contas-a-pagar-e-receber", json=conta).status_code == 201
+
+    response_put = client.put(
+        "/contas-a-pagar-e-receber/2", json={**conta, "data_previsao": "2022-12-01"}
+    )
+    assert response_put.status_code == 200
+    assert response_put.json()["data_previsao"] == "2022-12-01"
+    assert client.post("/contas-a-pagar-e-receber", json=conta).status_code == 201
+
+    response_put = client.put("/contas-a-pagar-e-receber/2", json=conta)
+    assert response_put.status_code == 422
+    assert client.get("/contas-a-pagar-e-receber/2").json()["data_previsao"] == (
+        "2022-12-01"
+    )
+
+
 def test_relatorio_gastos_previstos_por_mes_de_um_ano():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -532,6 +1193,234 @@ def test_relatorio_gastos_previstos_por_mes_de_um_ano():
             idx += 1
 
 
+def test_relatorio_gastos_previstos_por_mes_mantem_precisao_decimal():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for valor, tipo in [(0.10, "PAGAR"), (0.20, "PAGAR"), (5, "RECEBER")]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Teste",
+                "valor": valor,
+                "tipo": tipo,
+                "data_previsao": "2023-03-31",
+            },
+        )
+    client.post(
+        "/contas-a-pagar-e-receber",
+        json={
+            "descricao": "Teste",
+            "valor": 7,
+            "tipo": "PAGAR",
+            "data_previsao": "2024-01-01",
+        },
+    )
+
+    resposta = client.get("/contas-a-pagar-e-receber/previsao-gastos-por-mes?ano=2023")
+
+    assert resposta.status_code == 200
+    assert resposta.json() == [{"mes": 3, "valor_total": "0.30"}]
+
+
+def test_resumo_mensal_acompanha_as_escritas_e_a_reconstrucao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta = {
+        "descricao": "Conta de Luz",
+        "valor": 100.10,
+        "tipo": "PAGAR",
+        "data_previsao": "2022-11-29",
+    }
+    client.post("/contas-a-pagar-e-receber", json=conta)
+    client.post("/contas-a-pagar-e-receber", json={**conta, "tipo": "RECEBER"})
+    client.post(
+        "/contas-a-pagar-e-receber/lote",
+        json=[conta, {**conta, "data_previsao": "2022-12-05"}, conta],
+    )
+    client.put(
+        "/contas-a-pagar-e-receber/1",
+        json={**conta, "valor": 50.25, "data_previsao": "2022-10-01"},
+    )
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+    client.put("/contas-a-pagar-e-receber/1", json={**conta, "valor": 70})
+    client.post("/contas-a-pagar-e-receber/baixar-lote", json={"ids": [1, 2, 3]})
+    client.delete("/contas-a-pagar-e-receber/5")
+
+    def resumo():
+        with TestingSessionLocal() as db:
+            return [
+                (r.ano, r.mes, r.tipo, r.valor_total, r.valor_baixado, r.quantidade)
+                for r in db.query(ResumoMensal)
+                .filter(ResumoMensal.quantidade > 0)
+                .order_by(ResumoMensal.ano, ResumoMensal.mes, ResumoMensal.tipo)
+            ]
+
+    def resumo_diario():
+        with TestingSessionLocal() as db:
+            return [
+                (r.data, r.tipo, r.valor_total, r.quantidade)
+                for r in db.query(ResumoDiario)
+                .filter(ResumoDiario.quantidade > 0)
+                .order_by(ResumoDiario.data, ResumoDiario.tipo)
+            ]
+
+    resumo_incremental = resumo()
+    assert resumo_incremental == [
+        (2022, 11, "PAGAR", Decimal("170.10"), Decimal("170.10"), 2),
+        (2022, 11, "RECEBER", Decimal("100.10"), Decimal("100.10"), 1),
+        (2022, 12, "PAGAR", Decimal("100.10"), Decimal("0.00"), 1),
+    ]
+    resumo_diario_incremental = resumo_diario()
+    assert resumo_diario_incremental == [
+        (date(2022, 11, 29), "PAGAR", Decimal("170.10"), 2),
+        (date(2022, 11, 29), "RECEBER", Decimal("100.10"), 1),
+        (date(2022, 12, 5), "PAGAR", Decimal("100.10"), 1),
+    ]
+
+    with TestingSessionLocal() as db:
+        reconstroi_resumo_mensal(db)
+        db.commit()
+
+    assert resumo() == resumo_incremental
+    assert resumo_diario() == resumo_diario_incremental
+
+    resposta = client.get("/contas-a-pagar-e-receber/previsao-gastos-por-mes?ano=2022")
+    assert resposta.json() == [
+        {"mes": 11, "valor_total": "170.10"},
+        {"mes": 12, "valor_total": "100.10"},
+    ]
+
+
+def cria_contas_do_fluxo_de_caixa():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for descricao, valor, tipo, data_previsao in [
+        ("Aluguel", 999, "PAGAR", "2023-12-31"),
+        ("Venda", 1000, "RECEBER", "2024-01-01"),
+        ("Conta de Luz", 300.10, "PAGAR", "2024-01-03"),
+        ("Internet", 200, "PAGAR", "2024-01-08"),
+        ("Venda", 50.05, "RECEBER", "2024-01-09"),
+    ]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": descricao,
+                "valor": valor,
+                "tipo": tipo,
+                "data_previsao": data_previsao,
+            },
+        )
+
+
+def test_fluxo_de_caixa_diario_com_saldo_inicial():
+    cria_contas_do_fluxo_de_caixa()
+
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa"
+        "?data_inicio=2024-01-01&data_fim=2024-01-04&saldo_inicial=100"
+    )
+
+    assert resposta.status_code == 200
+    assert resposta.json() == [
+        {
+            "inicio": "2024-01-01",
+            "entradas": "1000.00",
+            "saidas": "0.00",
+            "saldo_do_periodo": "1000.00",
+            "saldo_acumulado": "1100.00",
+        },
+        {
+            "inicio": "2024-01-02",
+            "entradas": "0.00",
+            "saidas": "0.00",
+            "saldo_do_periodo": "0.00",
+            "saldo_acumulado": "1100.00",
+        },
+        {
+            "inicio": "2024-01-03",
+            "entradas": "0.00",
+            "saidas": "300.10",
+            "saldo_do_periodo": "-300.10",
+            "saldo_acumulado": "799.90",
+        },
+        {
+            "inicio": "2024-01-04",
+            "entradas": "0.00",
+            "saidas": "0.00",
+            "saldo_do_periodo": "0.00",
+            "saldo_acumulado": "799.90",
+        },
+    ]
+
+
+def test_fluxo_de_caixa_semanal_acompanha_as_escritas():
+    cria_contas_do_fluxo_de_caixa()
+    client.put(
+        "/contas-a-pagar-e-receber/4",
+        json={
+            "descricao": "Internet",
+            "valor": 250,
+            "tipo": "PAGAR",
+            "data_previsao": "2024-01-14",
+        },
+    )
+    client.delete("/contas-a-pagar-e-receber/1")
+
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa"
+        "?data_inicio=2023-12-31&data_fim=2024-01-14&granularidade=semana"
+    )
+
+    assert resposta.status_code == 200
+    assert [
+        (p["inicio"], p["entradas"], p["saidas"], p["saldo_acumulado"])
+        for p in resposta.json()
+    ] == [
+        ("2023-12-25", "0.00", "0.00", "0.00"),
+        ("2024-01-01", "1000.00", "300.10", "699.90"),
+        ("2024-01-08", "50.05", "250.00", "499.95"),
+    ]
+
+
+def test_fluxo_de_caixa_no_limite_do_calendario():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa?data_inicio=9999-12-30&data_fim=9999-12-31"
+    )
+    assert resposta.status_code == 200
+    assert [p["inicio"] for p in resposta.json()] == ["9999-12-30", "9999-12-31"]
+
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa"
+        "?data_inicio=9999-12-30&data_fim=9999-12-31&granularidade=semana"
+    )
+    assert resposta.status_code == 200
+    assert [p["inicio"] for p in resposta.json()] == ["9999-12-27"]
+
+
+def test_fluxo_de_caixa_valida_o_periodo():
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa?data_inicio=2024-02-01&data_fim=2024-01-01"
+    )
+    assert resposta.status_code == 422
+
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa?data_inicio=2000-01-01&data_fim=2024-01-01"
+    )
+    assert resposta.status_code == 422
+
+    resposta = client.get(
+        "/contas-a-pagar-e-receber/fluxo-de-caixa"
+        "?data_inicio=2024-01-01&data_fim=2024-01-01&saldo_inicial=1.001"
+    )
+    assert resposta.status_code == 422
+
+
 def test_relatorio_gastos_previstos_por_mes_sem_registros_no_banco():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
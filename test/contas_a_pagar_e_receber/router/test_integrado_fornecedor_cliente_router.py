@@ -37,7 +37,10 @@ def test_deve_listar_fornecedor_cliente():
 
     response = client.get("/fornecedor-cliente")
     assert response.status_code == 200
-    assert response.json() == [{"id": 1, "nome": "CPFL"}, {"id": 2, "nome": "Sanasa"}]
+    assert response.json() == [
+        {"id": 1, "nome": "CPFL", "versao": 1},
+        {"id": 2, "nome": "Sanasa", "versao": 1},
+    ]
 
 
 def test_deve_pegar_por_id():
@@ -71,6 +74,7 @@ def test_deve_criar_fornecedor_cliente():
 
     novo_fornecedor_cliente_copy = novo_fornecedor_cliente.copy()
     novo_fornecedor_cliente_copy["id"] = 1
+    novo_fornecedor_cliente_copy["versao"] = 1
 
     response = client.post("/fornecedor-cliente", json=novo_fornecedor_cliente)
     assert response.status_code == 201
@@ -141,3 +145,170 @@ def test_deve_retornar_erro_quando_o_nome_nao_estiver_dentro_dos_limites():
     )
     assert response2.status_code == 422
     assert response2.json()["detail"][0]["loc"] == ["body", "nome"]
+
+
+def test_deve_usar_cache_e_invalidar_na_atualizacao(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+    client.get("/fornecedor-cliente/1")
+
+    with conta_queries() as queries:
+        response = client.get("/fornecedor-cliente/1")
+    assert response.json() == {"id": 1, "nome": "CPFL", "versao": 1}
+    assert len(queries) == 0
+
+    client.put("/fornecedor-cliente/1", json={"nome": "Sanasa"})
+    assert client.get("/fornecedor-cliente/1").json() == {"id": 1, "nome": "Sanasa", "versao": 2}
+
+    client.delete("/fornecedor-cliente/1")
+    assert client.get("/fornecedor-cliente/1").status_code == 404
+
+
+def test_deve_recusar_escritas_de_fornecedor_com_versao_desatualizada(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+
+    with conta_queries() as queries:
+        response_put = client.put("/fornecedor-cliente/1?versao=1", json={"nome": "Sanasa"})
+    assert response_put.json() == {"id": 1, "nome": "Sanasa", "versao": 2}
+    # Um único UPDATE ... RETURNING, sem leitura antes nem refresh depois
+    assert [q.split()[0] for q in queries] == ["UPDATE"]
+
+    response_put = client.put("/fornecedor-cliente/1?versao=1", json={"nome": "CPFL"})
+    assert response_put.status_code == 409
+    assert client.delete("/fornecedor-cliente/1?versao=1").status_code == 409
+    assert client.get("/fornecedor-cliente/1").json()["nome"] == "Sanasa"
+
+    assert client.delete("/fornecedor-cliente/1?versao=2").status_code == 204
+
+
+def test_deve_resumir_as_contas_de_cada_fornecedor_em_uma_query(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for nome in ["CPFL", "Sanasa", "Adde Sistemas"]:
+        client.post("/fornecedor-cliente", json={"nome": nome})
+    for valor, tipo, fornecedor_cliente_id in [
+        (100.10, "PAGAR", 1),
+        (200.20, "PAGAR", 1),
+        (50, "RECEBER", 1),
+        (300, "PAGAR", 2),
+        (80, "PAGAR", None),
+    ]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta",
+                "valor": valor,
+                "tipo": tipo,
+                "fornecedor_cliente_id": fornecedor_cliente_id,
+                "data_previsao": "2024-05-09",
+            },
+        )
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+
+    with conta_queries() as queries:
+        response = client.get("/fornecedor-cliente/resumo")
+    assert response.status_code == 200
+    assert len(queries) == 1
+    assert response.json() == [
+        {
+            "id": 3,
+            "nome": "Adde Sistemas",
+            "quantidade_a_pagar_em_aberto": 0,
+            "valor_a_pagar_em_aberto": "0.00",
+            "quantidade_a_pagar_baixadas": 0,
+            "valor_a_pagar_baixado": "0.00",
+            "quantidade_a_receber_em_aberto": 0,
+            "valor_a_receber_em_aberto": "0.00",
+            "quantidade_a_receber_baixadas": 0,
+            "valor_a_receber_baixado": "0.00",
+            "saldo_em_aberto": "0.00",
+        },
+        {
+            "id": 1,
+            "nome": "CPFL",
+            "quantidade_a_pagar_em_aberto": 1,
+            "valor_a_pagar_em_aberto": "200.20",
+            "quantidade_a_pagar_baixadas": 1,
+            "valor_a_pagar_baixado": "100.10",
+            "quantidade_a_receber_em_aberto": 1,
+            "valor_a_receber_em_aberto": "50.00",
+            "quantidade_a_receber_baixadas": 0,
+            "valor_a_receber_baixado": "0.00",
+            "saldo_em_aberto": "-150.20",
+        },
+        {
+            "id": 2,
+            "nome": "Sanasa",
+            "quantidade_a_pagar_em_aberto": 1,
+            "valor_a_pagar_em_aberto": "300.00",
+            "quantidade_a_pagar_baixadas": 0,
+            "valor_a_pagar_baixado": "0.00",
+            "quantidade_a_receber_em_aberto": 0,
+            "valor_a_receber_em_aberto": "0.00",
+            "quantidade_a_receber_baixadas": 0,
+            "valor_a_receber_baixado": "0.00",
+            "saldo_em_aberto": "-300.00",
+        },
+    ]
+
+
+def test_deve_ordenar_e_paginar_o_resumo_dos_fornecedores():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    for nome in ["CPFL", "Sanasa", "Adde Sistemas", "Extra"]:
+        client.post("/fornecedor-cliente", json={"nome": nome})
+    for valor, fornecedor_cliente_id in [(100.10, 1), (200.20, 1), (300.30, 2), (300.30, 4)]:
+        client.post(
+            "/contas-a-pagar-e-receber",
+            json={
+                "descricao": "Conta",
+                "valor": valor,
+                "tipo": "PAGAR",
+                "fornecedor_cliente_id": fornecedor_cliente_id,
+                "data_previsao": "2024-05-09",
+            },
+        )
+
+    ids_por_pagina = []
+    url = "/fornecedor-cliente/resumo?ordenar_por=valor_a_pagar_em_aberto&limit=2"
+    cursor = None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        ids_por_pagina.append([f["id"] for f in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    # Empates no total (300.30 nos dois casos) são desfeitos pelo id
+    assert ids_por_pagina == [[1, 2], [4, 3]]
+
+    response = client.get("/fornecedor-cliente/resumo?ordenar_por=nome&limit=3")
+    assert [f["nome"] for f in response.json()] == ["Adde Sistemas", "CPFL", "Extra"]
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(f"/fornecedor-cliente/resumo?ordenar_por=nome&cursor={cursor}")
+    assert [f["nome"] for f in response.json()] == ["Sanasa"]
+
+
+def test_deve_responder_304_para_lista_de_fornecedores_nao_modificada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={"nome": "CPFL"})
+    etag = client.get("/fornecedor-cliente").headers["ETag"]
+
+    response = client.get("/fornecedor-cliente", headers={"If-None-Match": f'W/{etag}'})
+    assert response.status_code == 304
+
+    client.post("/fornecedor-cliente", json={"nome": "Sanasa"})
+    response = client.get("/fornecedor-cliente", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
@@ -77,4 +77,83 @@ def test_deve_retornar_uma_lista_vazia_de_contas_de_um_fornecedor_cliente():
     response_get_fornecedor = client.get(f"/fornecedor-cliente/1/contas-a-pagar-e-receber")
 
     assert response_get_fornecedor.status_code == 200
-    assert len(response_get_fornecedor.json()) == 0
\ No newline at end of file
+    assert len(response_get_fornecedor.json()) == 0
+
+
+def test_deve_listar_contas_de_um_fornecedor_cliente_sem_n_mais_1(conta_queries):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={'nome': 'Casa da Música'})
+    for i in range(5):
+        client.post("/contas-a-pagar-e-receber", json={
+            'descricao': 'Curso de Guitarra',
+            'valor': 5000,
+            'tipo': 'PAGAR',
+            'fornecedor_cliente_id': 1,
+            "data_previsao": "2022-11-29"
+        })
+
+    with conta_queries() as queries:
+        response = client.get("/fornecedor-cliente/1/contas-a-pagar-e-receber")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    # A mesma query confere o fornecedor e traz as contas já com ele
+    assert len(queries) == 1
+    assert response.json()[0]["fornecedor"]["nome"] == "Casa da Música"
+
+
+def test_deve_paginar_e_filtrar_contas_de_um_fornecedor_cliente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    client.post("/fornecedor-cliente", json={'nome': 'Casa da Música'})
+    client.post("/fornecedor-cliente", json={'nome': 'Adde Treinamentos'})
+    for tipo, fornecedor_cliente_id, data_previsao in [
+        ('PAGAR', 1, "2024-05-10"),
+        ('RECEBER', 1, "2024-05-09"),
+        ('PAGAR', 2, "2024-05-09"),
+        ('PAGAR', 1, "2024-05-09"),
+        ('PAGAR', 1, "2024-06-01"),
+    ]:
+        client.post("/contas-a-pagar-e-receber", json={
+            'descricao': 'Curso de Guitarra',
+            'valor': 5000,
+            'tipo': tipo,
+            'fornecedor_cliente_id': fornecedor_cliente_id,
+            "data_previsao": data_previsao
+        })
+    client.post("/contas-a-pagar-e-receber/5/baixar")
+
+    primeira_pagina = client.get("/fornecedor-cliente/1/contas-a-pagar-e-receber?limit=2")
+    assert [c["id"] for c in primeira_pagina.json()] == [2, 4]
+    cursor = primeira_pagina.headers["X-Next-Cursor"]
+    segunda_pagina = client.get(
+        f"/fornecedor-cliente/1/contas-a-pagar-e-receber?limit=2&cursor={cursor}"
+    )
+    assert [c["id"] for c in segunda_pagina.json()] == [1, 5]
+    assert "X-Next-Cursor" not in segunda_pagina.headers
+
+    response = client.get(
+        "/fornecedor-cliente/1/contas-a-pagar-e-receber",
+        params={"tipo": "PAGAR", "esta_baixada": False, "data_previsao_fim": "2024-05-31"},
+    )
+    assert [c["id"] for c in response.json()] == [4, 1]
+
+    # Fornecedor existente sem contas no filtro é lista vazia, não 422
+    response = client.get(
+        "/fornecedor-cliente/2/contas-a-pagar-e-receber", params={"tipo": "RECEBER"}
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_deve_retornar_erro_para_fornecedor_cliente_inexistente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.get("/fornecedor-cliente/10/contas-a-pagar-e-receber")
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Esse fornecedor não existe no banco de dados"
@@ -0,0 +1,84 @@
+import time
+
+from shared.cache import Cache, CacheEmMemoria, CacheRedis
+
+
+class RedisEmMemoria:
+    """Substituto local do cliente redis-py com o subconjunto usado pelo cache."""
+
+    def __init__(self):
+        self.dados = {}
+
+    def get(self, chave):
+        valor, expira_em = self.dados.get(chave, (None, None))
+        if expira_em is not None and expira_em <= time.monotonic():
+            del self.dados[chave]
+            return None
+        return valor
+
+    def set(self, chave, valor, ex=None):
+        self.dados[chave] = (valor.encode(), time.monotonic() + ex if ex else None)
+
+    def delete(self, chave):
+        self.dados.pop(chave, None)
+
+    def scan_iter(self, match):
+        prefixo = match.rstrip("*")
+        return [chave for chave in list(self.dados) if chave.startswith(prefixo)]
+
+
+def test_deve_carregar_uma_vez_e_contar_acertos_e_falhas():
+    cache = Cache(CacheEmMemoria())
+    chamadas = []
+
+    def carregador():
+        chamadas.append(1)
+        return {"id": 1, "nome": "CPFL"}
+
+    assert cache.obtem_ou_carrega("fornecedor_cliente:1", carregador) == {"id": 1, "nome": "CPFL"}
+    assert cache.obtem_ou_carrega("fornecedor_cliente:1", carregador) == {"id": 1, "nome": "CPFL"}
+
+    assert len(chamadas) == 1
+    assert cache.estatisticas() == {
+        "backend": "CacheEmMemoria",
+        "acertos": 1,
+        "falhas": 1,
+        "taxa_de_acerto": 0.5,
+    }
+
+
+def test_deve_expirar_itens_pelo_ttl():
+    cache = Cache(CacheEmMemoria(), ttl=0)
+
+    cache.define("chave", 1)
+
+    assert cache.obtem("chave") is None
+
+
+def test_deve_remover_o_item_menos_usado_quando_lotado():
+    cache = Cache(CacheEmMemoria(max_itens=2))
+
+    cache.define("a", 1)
+    cache.define("b", 2)
+    cache.obtem("a")
+    cache.define("c", 3)
+
+    assert cache.obtem("a") == 1
+    assert cache.obtem("b") is None
+    assert cache.obtem("c") == 3
+
+
+def test_deve_usar_backend_redis_com_invalidacao():
+    redis = RedisEmMemoria()
+    cache = Cache(CacheRedis(redis))
+
+    cache.define("fornecedor_cliente:1", {"id": 1, "nome": "CPFL"})
+    assert "contas:fornecedor_cliente:1" in redis.dados
+    assert cache.obtem("fornecedor_cliente:1") == {"id": 1, "nome": "CPFL"}
+
+    cache.invalida("fornecedor_cliente:1")
+    assert cache.obtem("fornecedor_cliente:1") is None
+
+    cache.define("fornecedor_cliente:2", {"id": 2, "nome": "Sanasa"})
+    cache.limpa()
+    assert redis.dados == {}
@@ -0,0 +1,49 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine, text
+
+from shared.consultas_lentas import RegistroDeConsultasLentas, redige_parametros
+
+
+def test_deve_guardar_so_as_amostras_mais_recentes():
+    engine = create_engine("sqlite://")
+    registro = RegistroDeConsultasLentas(limite_ms=0, max_amostras=3)
+    registro.escuta(engine)
+
+    with engine.connect() as conexao:
+        for i in range(5):
+            conexao.execute(text(f"SELECT {i}"))
+
+    registro.deixa_de_escutar(engine)
+    with engine.connect() as conexao:
+        conexao.execute(text("SELECT 99"))
+
+    amostras = registro.amostras()
+    assert [amostra["sql"] for amostra in amostras] == ["SELECT 4", "SELECT 3", "SELECT 2"]
+    assert all(amostra["rota"] is None for amostra in amostras)
+    assert all(amostra["plano"] is None for amostra in amostras)
+
+
+def test_deve_ignorar_consultas_abaixo_do_limite():
+    engine = create_engine("sqlite://")
+    registro = RegistroDeConsultasLentas(limite_ms=60_000)
+    registro.escuta(engine)
+
+    with engine.connect() as conexao:
+        conexao.execute(text("SELECT 1"))
+
+    assert registro.amostras() == []
+
+
+def test_deve_omitir_textos_dos_parametros():
+    assert redige_parametros(
+        {"nome": "Maria", "valor": Decimal("10.50"), "id": 3, "data": date(2024, 5, 9)}
+    ) == {"nome": "<str len=5>", "valor": "10.50", "id": 3, "data": "2024-05-09"}
+
+    assert redige_parametros(
+        [("Maria", 1), ("João", 2), ("Ana", 3), ("Rui", 4)], executemany=True
+    ) == {
+        "linhas": 4,
+        "amostra": [["<str len=5>", 1], ["<str len=4>", 2], ["<str len=3>", 3]],
+    }
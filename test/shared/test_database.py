@@ -0,0 +1,26 @@
+import os
+
+from shared import database
+
+
+def test_deve_descartar_no_filho_as_conexoes_herdadas_pelo_fork(banco_temporario):
+    engine = database.obtem_engine()
+    with engine.connect():
+        pass
+    assert engine.pool.checkedin() >= 1
+
+    leitura, escrita = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Processo filho: o pool herdado deve ter sido trocado por um vazio
+        os.close(leitura)
+        os.write(escrita, str(database.obtem_engine().pool.checkedin()).encode())
+        os._exit(0)
+
+    os.close(escrita)
+    conexoes_no_filho = os.read(leitura, 16).decode()
+    os.close(leitura)
+    os.waitpid(pid, 0)
+
+    assert conexoes_no_filho == "0"
+    assert engine.pool.checkedin() >= 1
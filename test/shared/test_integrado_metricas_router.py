@@ -0,0 +1,78 @@
+import re
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test/test.db"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db
+
+
+def valor_da_metrica(texto: str, serie: str) -> float:
+    correspondencia = re.search(rf"^{re.escape(serie)} (\S+)$", texto, re.MULTILINE)
+    return float(correspondencia.group(1)) if correspondencia else 0.0
+
+
+def test_deve_expor_metricas_por_rota_no_formato_do_prometheus():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    rotulos = 'method="GET",route="/fornecedor-cliente/{id_do_fornecedor_cliente}"'
+    antes = client.get("/metrics").text
+
+    client.get("/fornecedor-cliente/999999")
+    client.get("/fornecedor-cliente/999998")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    depois = response.text
+    serie_404 = f'http_requests_total{{{rotulos},status="404"}}'
+    assert valor_da_metrica(depois, serie_404) == valor_da_metrica(antes, serie_404) + 2
+
+    serie_latencia = f"http_request_duration_seconds_count{{{rotulos}}}"
+    assert (
+        valor_da_metrica(depois, serie_latencia)
+        == valor_da_metrica(antes, serie_latencia) + 2
+    )
+    assert f'http_request_duration_seconds_bucket{{{rotulos},le="+Inf"}}' in depois
+
+    # Cada busca por id que não está no cache faz uma query
+    serie_queries = f"http_request_db_queries_sum{{{rotulos}}}"
+    assert (
+        valor_da_metrica(depois, serie_queries)
+        == valor_da_metrica(antes, serie_queries) + 2
+    )
+    assert valor_da_metrica(depois, "http_requests_in_progress") == 1
+
+
+def test_deve_agrupar_caminhos_sem_rota():
+    client.get("/nao-existe/123")
+
+    texto = client.get("/metrics").text
+
+    assert 'http_requests_total{method="GET",route="desconhecida",status="404"}' in texto
+    assert "/nao-existe/123" not in texto
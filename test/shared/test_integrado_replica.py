@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorCliente
+from main import app, cria_app
+from shared import database
+from shared.database import Base
+from shared.dependencies import get_db
+
+
+def cria_banco(url: str, nome_do_fornecedor: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conexao:
+        conexao.execute(insert(FornecedorCliente), [{"nome": nome_do_fornecedor}])
+    engine.dispose()
+
+
+@pytest.fixture
+def configura_replica(monkeypatch, tmp_path):
+    """Primário e réplica em dois arquivos SQLite com conteúdos diferentes."""
+
+    def configura(url_da_replica: str | None = None):
+        url_do_primario = f"sqlite:///{tmp_path}/primario.db"
+        cria_banco(url_do_primario, "Fornecedor do primário")
+        if url_da_replica is None:
+            url_da_replica = f"sqlite:///{tmp_path}/replica.db"
+            cria_banco(url_da_replica, "Fornecedor da réplica")
+
+        # Usa as dependências reais, sem o override dos outros módulos de teste
+        monkeypatch.delitem(app.dependency_overrides, get_db, raising=False)
+        monkeypatch.setattr(database, "SQLALCHEMY_DATABASE_URL", url_do_primario)
+        monkeypatch.setattr(database, "SQLALCHEMY_READ_DATABASE_URL", url_da_replica)
+        asyncio.run(database.descarta_engines())
+        return TestClient(cria_app())
+
+    yield configura
+
+    asyncio.run(database.descarta_engines())
+
+
+def nomes(response) -> list:
+    assert response.status_code == 200
+    return [fornecedor["nome"] for fornecedor in response.json()]
+
+
+def test_deve_ler_da_replica_e_escrever_no_primario(configura_replica):
+    client = configura_replica()
+
+    assert nomes(client.get("/fornecedor-cliente")) == ["Fornecedor da réplica"]
+
+    response = client.post("/fornecedor-cliente", json={"nome": "Novo fornecedor"})
+    assert response.status_code == 201
+    assert "ler_do_primario=1" in response.headers["set-cookie"]
+    assert "Max-Age=5" in response.headers["set-cookie"]
+
+
+def test_deve_ler_do_primario_logo_depois_de_escrever(configura_replica):
+    client = configura_replica()
+    client.post("/fornecedor-cliente", json={"nome": "Novo fornecedor"})
+
+    # O mesmo cliente enxerga a própria escrita
+    assert nomes(client.get("/fornecedor-cliente")) == [
+        "Fornecedor do primário",
+        "Novo fornecedor",
+    ]
+
+    # Outro cliente continua na réplica
+    outro_client = TestClient(client.app)
+    assert nomes(outro_client.get("/fornecedor-cliente")) == ["Fornecedor da réplica"]
+
+
+def test_deve_ler_do_primario_quando_a_replica_estiver_fora(configura_replica):
+    client = configura_replica("sqlite:////diretorio/inexistente/replica.db")
+
+    assert nomes(client.get("/fornecedor-cliente")) == ["Fornecedor do primário"]
+    # Durante o intervalo de nova tentativa a réplica nem é consultada
+    assert database.obtem_sessionmaker_de_leitura() is None
+    assert nomes(client.get("/fornecedor-cliente")) == ["Fornecedor do primário"]